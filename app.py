@@ -6,6 +6,7 @@
 
 import os
 import sys
+import time
 import requests
 import streamlit as st
 
@@ -14,11 +15,25 @@ def show_footer():
     st.markdown("---")
     st.markdown("© 2025 CorAlertMet Intelligence")
 
-def apply_corporate_styles():
-    pass
+# Estilos corporativos (bundle minificado, inyectado una vez por ejecución)
+try:
+    from components.styles import apply_corporate_styles, start_style_run
+except ImportError:
+    def apply_corporate_styles():
+        pass
+
+    def start_style_run():
+        pass
+
+# Iconos SVG desde el registro (plantillas parseadas una vez, render memoizado)
+try:
+    from components.icon_registry import inject_icon_styles, show_icon as show_svg_icon
+except ImportError:
+    def inject_icon_styles():
+        pass
 
-def show_svg_icon(icon_name, width=24, height=24, animation="none", color="#3B82F6"):
-    st.markdown(f'<div style="font-size: {width}px; text-align: center;">❓</div>', unsafe_allow_html=True)
+    def show_svg_icon(icon_name, width=24, height=24, animation="none", color="#3B82F6"):
+        st.markdown(f'<div style="font-size: {width}px; text-align: center;">❓</div>', unsafe_allow_html=True)
 
 # Importar sistema de autenticación y logging
 try:
@@ -27,6 +42,23 @@ def show_svg_icon(icon_name, width=24, height=24, animation="none", color="#3B82
     st.error("Error importando módulo de autenticación")
     st.stop()
 
+from cache.model_history import get_model_history_log, record_model_usage
+from cache.observation_store import get_observation_store, record_observation
+from config.metrics import API_REQUEST_SECONDS, API_REQUESTS_TOTAL, METRICS, timed
+from config.structured_logging import log_event
+from components.downsampling import downsample_frame
+from pages_modules.ml_models.ensemble import WINDY_MODELS
+from pages_modules.ml_models.storm_risk import ALERT_LEVELS, DASHBOARD_STORM_ENGINE
+from pages_modules.page_registry import PageRegistry, show_import_report
+
+# Páginas con carga diferida: cada módulo (plotly, sklearn, darts, folium...) se importa
+# recién la primera vez que se navega a él
+PAGE_REGISTRY = PageRegistry()
+PAGE_REGISTRY.register("Mapa Interactivo", "pages_modules.map_live")
+PAGE_REGISTRY.register("Panel ML", "pages_modules.ml_dashboard")
+PAGE_REGISTRY.register("Referencia", "reference")
+PAGE_REGISTRY.register("Administración de Cache", "cache_admin")
+
 try:
     from config.logging_config import setup_logging, get_logger
 except ImportError:
@@ -48,6 +80,8 @@ def create_responsive_columns(num_columns=4):
 # Configurar logging
 setup_logging()
 logger = get_logger(__name__)
+# Volcado periódico de métricas en formato Prometheus (logs/metrics.prom; idempotente entre reruns)
+METRICS.start_periodic_dump()
 
 # Agregar src al path (comentado - directorio src no existe)
 # sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
@@ -60,9 +94,13 @@ def create_responsive_columns(num_columns=4):
     initial_sidebar_state="expanded"
 )
 
-# Aplicar estilos corporativos
+# Aplicar estilos corporativos (nueva ejecución: reiniciar el registro de estilos inyectados)
+start_style_run()
 apply_corporate_styles()
 
+# Keyframes compartidos de los iconos (una vez por ejecución)
+inject_icon_styles()
+
 
 # Configurar API key desde múltiples fuentes
 def get_api_key():
@@ -161,10 +199,8 @@ def main():
             st.markdown("### Modelo de Pronóstico")
 
             windy_models = [
-                ("HRRR", "Alta resolución para Estados Unidos (3 km) - 18x/día"),
-                ("ICON7", "Modelo alemán para Europa (7 km) - 4x/día"),
-                ("GFS27", "Sistema de pronóstico global de NOAA (27 km) - 4x/día"),
-                ("ECMWF", "Modelo europeo de alta precisión (14 km) - 2x/día")
+                (name, f"{info['description']} ({info['resolution']}) - {info['update_frequency']}")
+                for name, info in WINDY_MODELS.items()
             ]
 
             model_names = [option[0] for option in windy_models]
@@ -178,9 +214,22 @@ def main():
             # Mostrar información del modelo seleccionado
             model_info = next((info for name, info in windy_models if name == selected_model), "")
             st.caption(f"📊 {model_info}")
+
+            # Últimos modelos consultados (historial compartido, persiste entre reinicios)
+            recent_models = get_model_history(5)
+            if recent_models:
+                with st.expander("🕑 Modelos consultados recientemente"):
+                    for entry in reversed(recent_models):
+                        st.caption(f"{entry['timestamp'][:16].replace('T', ' ')} · "
+                                   f"{entry['api']} {entry['model']}")
         else:
             selected_model = None
 
+        # Reporte de tiempos de importación (solo administradores)
+        if st.session_state.get('user_role') == "admin":
+            with st.expander("⏱️ Tiempos de importación"):
+                show_import_report()
+
         # Sección de logout
         show_logout_section()
 
@@ -237,6 +286,9 @@ def show_main_dashboard(selected_api="OpenWeatherMap", selected_model=None):
             except Exception as e:
                 st.error(f"❌ Error: {e}")
 
+    # Tendencias desde el historial de observaciones (lecturas registradas por los fetchers)
+    show_trend_analysis("Córdoba,AR")
+
     # Mostrar comparación de modelos si se selecciona Windy
     if selected_api == "Windy":
         show_model_comparison()
@@ -245,15 +297,29 @@ def show_main_dashboard(selected_api="OpenWeatherMap", selected_model=None):
 def get_weather_data_from_api(selected_api, location="Córdoba,AR", selected_model=None):
     """Obtener datos meteorológicos reales desde la API seleccionada"""
     try:
+        start = time.perf_counter()
         if selected_api == "OpenWeatherMap":
-            return get_openweather_data(location)
+            weather_data = get_openweather_data(location)
         elif selected_api == "Windy":
-            return get_windy_data(location, selected_model)
+            weather_data = get_windy_data(location, selected_model)
+        else:
+            return None
+        # Con st.cache_data, duration_ms separa lecturas cacheadas (µs) de llamadas a la API
+        log_event(logger, "weather.fetch", api=selected_api, location=location,
+                  duration_ms=round((time.perf_counter() - start) * 1000, 2),
+                  ok=weather_data is not None)
+
+        # Registrar en el historial de observaciones (tendencias) solo lecturas reales:
+        # los modelos de Windy son variaciones simuladas sobre la lectura de OpenWeatherMap
+        if selected_api == "OpenWeatherMap":
+            record_observation(location, weather_data)
+        return weather_data
     except Exception as e:
         st.error(f"❌ Error obteniendo datos de {selected_api}: {e}")
         return None
 
 @st.cache_data(ttl=300, show_spinner=False)  # Cache 5 minutos para datos públicos
+@timed(API_REQUEST_SECONDS, api="OpenWeatherMap")  # Solo se mide cuando no hay cache
 def get_openweather_data(location):
     """Obtener datos de OpenWeatherMap"""
     try:
@@ -268,10 +334,12 @@ def get_openweather_data(location):
 
     geo_response = requests.get(geo_url, params=geo_params, timeout=5)
     if geo_response.status_code != 200:
+        API_REQUESTS_TOTAL.inc(api="OpenWeatherMap", outcome=f"http_{geo_response.status_code}")
         return None
 
     geo_data = geo_response.json()
     if not geo_data:
+        API_REQUESTS_TOTAL.inc(api="OpenWeatherMap", outcome="not_found")
         return None
 
     lat, lon = geo_data[0]["lat"], geo_data[0]["lon"]
@@ -288,9 +356,11 @@ def get_openweather_data(location):
 
     weather_response = requests.get(weather_url, params=weather_params, timeout=5)
     if weather_response.status_code != 200:
+        API_REQUESTS_TOTAL.inc(api="OpenWeatherMap", outcome=f"http_{weather_response.status_code}")
         return None
 
     weather_data = weather_response.json()
+    API_REQUESTS_TOTAL.inc(api="OpenWeatherMap", outcome="ok")
 
     return {
         "temperature": weather_data["main"]["temp"],
@@ -327,37 +397,8 @@ def get_windy_data(location, selected_model=None):
     # Simular variaciones típicas de Windy (datos más precisos)
     import random
 
-    # Definir modelos de Windy (ordenado por frecuencia de actualización - más updates = mejor)
-    windy_models = {
-        "HRRR": {
-            "name": "HRRR",
-            "resolution": "3 km",
-            "update_frequency": "18x/día",
-            "description": "Alta resolución para Estados Unidos",
-            "accuracy": 0.94
-        },
-        "ICON7": {
-            "name": "ICON7",
-            "resolution": "7 km",
-            "update_frequency": "4x/día",
-            "description": "Modelo alemán para Europa",
-            "accuracy": 0.90
-        },
-        "GFS27": {
-            "name": "GFS27",
-            "resolution": "27 km",
-            "update_frequency": "4x/día",
-            "description": "Sistema de pronóstico global de NOAA",
-            "accuracy": 0.88
-        },
-        "ECMWF": {
-            "name": "ECMWF",
-            "resolution": "14 km",
-            "update_frequency": "2x/día",
-            "description": "Modelo europeo de alta precisión",
-            "accuracy": 0.92
-        }
-    }
+    # Metadatos de los modelos de Windy (definidos una sola vez en el módulo de ensamble)
+    windy_models = WINDY_MODELS
 
     # Usar modelo seleccionado o aleatorio
     if selected_model and selected_model in windy_models:
@@ -573,27 +614,13 @@ def display_storm_prediction(prediction: dict) -> None:
                 st.write(f"• {factor}: {value}")
 
 
-@st.cache_data(ttl=3600)  # Cache 1 hora para historial
-def get_model_history():
-    """Obtener historial de modelos utilizados"""
-    if 'model_history' not in st.session_state:
-        st.session_state.model_history = []
-    return st.session_state.model_history
+def get_model_history(limit=10):
+    """Obtener historial de modelos utilizados (compartido por todas las sesiones)"""
+    return get_model_history_log().recent_entries(limit)
 
 def add_to_model_history(api, model_name, timestamp, accuracy=None):
-    """Agregar entrada al historial de modelos"""
-    history = get_model_history()
-    entry = {
-        "timestamp": timestamp,
-        "api": api,
-        "model": model_name,
-        "accuracy": accuracy
-    }
-    history.append(entry)
-    # Mantener solo los últimos 10 registros
-    if len(history) > 10:
-        history.pop(0)
-    st.session_state.model_history = history
+    """Agregar entrada al historial de modelos (la escritura a disco es asíncrona)"""
+    return record_model_usage(api, model_name, timestamp, accuracy)
 
 
 def show_meteorological_alert_level(weather_data):
@@ -625,67 +652,23 @@ def show_meteorological_alert_level(weather_data):
     wind_speed = weather_data.get('wind_speed', 10)
     cloud_cover = weather_data.get('cloud_cover', 50)
 
-    # Algoritmo ML simplificado para calcular probabilidad de tormenta
-    storm_probability = 0
-
-    # Factores de riesgo
-    if temp > 30:
-        storm_probability += 0.2  # Alta temperatura
-    if humidity > 80:
-        storm_probability += 0.3  # Alta humedad
-    if pressure < 1000:
-        storm_probability += 0.25  # Baja presión
-    if wind_speed > 20:
-        storm_probability += 0.15  # Viento fuerte
-    if cloud_cover > 70:
-        storm_probability += 0.1  # Mucha nubosidad
-
-    # Normalizar entre 0 y 1
-    storm_probability = min(storm_probability, 1.0)
-    storm_percentage = storm_probability * 100
+    # Motor de riesgo compartido con las páginas ML
+    risk = DASHBOARD_STORM_ENGINE.evaluate({
+        'temperature': temp,
+        'humidity': humidity,
+        'pressure': pressure,
+        'wind_speed': wind_speed,
+        'cloud_cover': cloud_cover
+    })
+    storm_percentage = float(risk["percentage"])
 
     # Determinar nivel de alerta
-    if storm_percentage < 40:
-        alert_level = "BAJO RIESGO"
-        alert_color = "🟢"
-        alert_bg = "#10B981"
-        alert_text = "Condiciones normales - Vuelo seguro"
-        recommendations = [
-            "✅ Condiciones ideales para vuelo",
-            "✅ Monitoreo estándar recomendado",
-            "✅ Sin restricciones especiales"
-        ]
-    elif storm_percentage < 60:
-        alert_level = "RIESGO MODERADO"
-        alert_color = "🟡"
-        alert_bg = "#F59E0B"
-        alert_text = "Monitorear condiciones - Precaución recomendada"
-        recommendations = [
-            "⚠️ Monitorear condiciones meteorológicas",
-            "⚠️ Considerar ruta alternativa",
-        ]
-    elif storm_percentage < 80:
-        alert_level = "ALTO RIESGO"
-        alert_color = "🟠"
-        alert_bg = "#F97316"
-        alert_text = "Precaución recomendada - Evitar vuelo nocturno"
-        recommendations = [
-            "🚨 Evitar vuelo nocturno",
-            "🚨 Planificar ruta de escape",
-            "🚨 Mantener combustible extra",
-            "🚨 Comunicación constante con control"
-        ]
-    else:
-        alert_level = "ALERTA CRÍTICA"
-        alert_color = "🔴"
-        alert_bg = "#EF4444"
-        alert_text = "Tormenta inminente - Evitar vuelo"
-        recommendations = [
-            "🚫 NO VOLAR - Condiciones peligrosas",
-            "🚫 Buscar refugio inmediatamente",
-            "🚫 Mantener aeronave en hangar",
-            "🚫 Contactar autoridades meteorológicas"
-        ]
+    level = ALERT_LEVELS[int(risk["level_index"])]
+    alert_level = level["name"]
+    alert_color = level["emoji"]
+    alert_bg = level["color"]
+    alert_text = level["text"]
+    recommendations = level["recommendations"]
 
     # Mostrar alerta principal
     st.markdown(f"""
@@ -740,8 +723,17 @@ def show_meteorological_alert_level(weather_data):
             st.metric("Nubosidad", f"{cloud_cover}%",
                      delta="Alta" if cloud_cover > 70 else "Moderada" if cloud_cover > 30 else "Baja")
 
-def show_trend_analysis():
-    """Mostrar análisis de tendencias meteorológicas con rango de 30 minutos"""
+# Rangos del análisis de tendencias: días y agregación ("30min" o None para lecturas crudas)
+TREND_RANGES = {
+    "24 h": (1, "30min"),
+    "7 días": (7, None),
+    "30 días": (30, None),
+}
+TREND_MAX_POINTS = 500  # Puntos por serie enviados al navegador (LTTB conserva los picos)
+
+
+def show_trend_analysis(location="Córdoba,AR"):
+    """Mostrar análisis de tendencias meteorológicas (24 h en intervalos de 30 min o lecturas de varios días)"""
     st.markdown("---")
 
     # Header con icono SVG más profesional
@@ -756,40 +748,75 @@ def show_trend_analysis():
     current_date = datetime.now().strftime("%d de %B de %Y")
     st.caption(f"📅 **Fecha**: {current_date}")
 
-    # Simular datos históricos para el análisis (últimas 24 horas con intervalos de 30 min)
     import pandas as pd
     import plotly.graph_objects as go
     from datetime import datetime, timedelta
     import numpy as np
 
-    # Generar datos simulados de las últimas 24 horas con intervalos de 30 minutos
+    range_label = st.radio("Rango", list(TREND_RANGES), horizontal=True, key="trend_range")
+    days, interval = TREND_RANGES[range_label]
+
+    # Historial real: 24 h agregadas en intervalos de 30 minutos o todas las lecturas del rango
     now = datetime.now()
-    # 48 puntos de datos (24 horas * 2 intervalos por hora)
-    time_points = [now - timedelta(minutes=30*i) for i in range(48, 0, -1)]
+    store = get_observation_store()
+    variables = ("temperature", "humidity", "pressure", "wind_speed")
+    if interval is not None:
+        history = store.downsample(location, interval, since=now - timedelta(days=days), until=now,
+                                  variables=variables)
+        n_readings = int(history["count"].sum())
+    else:
+        history = store.query(location, since=now - timedelta(days=days), until=now, variables=variables)
+        n_readings = len(history["timestamp"])
+
+    has_history = len(history["timestamp"]) >= 2
+    if has_history:
+        time_points = [datetime.fromtimestamp(ts) for ts in history["timestamp"]]
+        temp_trend = history["temperature"]
+        humidity_trend = history["humidity"]
+        pressure_trend = history["pressure"]
+        wind_trend = history["wind_speed"]
+        st.caption(f"📈 {n_readings} observaciones registradas para {location}")
+    else:
+        range_label, interval = "24 h", "30min"
+        st.caption("ℹ️ Historial insuficiente: se muestran tendencias simuladas")
+
+        # 48 puntos de datos (24 horas * 2 intervalos por hora)
+        time_points = [now - timedelta(minutes=30*i) for i in range(48, 0, -1)]
 
-    # Simular tendencias realistas con más detalle
-    base_temp = 25
-    temp_trend = [base_temp + 5 * np.sin(i/8) + np.random.normal(0, 0.5) for i in range(48)]
+        # Simular tendencias realistas con más detalle
+        base_temp = 25
+        temp_trend = [base_temp + 5 * np.sin(i/8) + np.random.normal(0, 0.5) for i in range(48)]
 
-    base_humidity = 60
-    humidity_trend = [base_humidity + 10 * np.cos(i/6) + np.random.normal(0, 1) for i in range(48)]
+        base_humidity = 60
+        humidity_trend = [base_humidity + 10 * np.cos(i/6) + np.random.normal(0, 1) for i in range(48)]
 
-    base_pressure = 1013
-    pressure_trend = [base_pressure + 5 * np.sin(
-        i/12) + np.random.normal(0,
-        0.3) for i in range(48)]
+        base_pressure = 1013
+        pressure_trend = [base_pressure + 5 * np.sin(
+            i/12) + np.random.normal(0,
+            0.3) for i in range(48)]
 
-    base_wind = 10
-    wind_trend = [base_wind + 3 * np.sin(i/4) + np.random.normal(0, 0.5) for i in range(48)]
+        base_wind = 10
+        wind_trend = [base_wind + 3 * np.sin(i/4) + np.random.normal(0, 0.5) for i in range(48)]
 
-    # Crear DataFrame con formato de hora:minuto
+    # Crear DataFrame (hora:minuto para 24 h; fecha y hora para rangos de varios días)
     df_trends = pd.DataFrame({
-        'Hora': [h.strftime('%H:%M') for h in time_points],
+        'Hora': [h.strftime('%H:%M') for h in time_points] if interval is not None else time_points,
         'Temperatura': temp_trend,
         'Humedad': humidity_trend,
         'Presión': pressure_trend,
         'Viento': wind_trend
     })
+    # Las lecturas crudas de varios días (miles de puntos) se reducen con LTTB sobre el eje temporal
+    df_trends = downsample_frame(
+        df_trends, ['Temperatura', 'Humedad', 'Presión', 'Viento'],
+        x_column='Hora', threshold=TREND_MAX_POINTS, series_key=("tendencias", location, range_label)
+    )
+    if interval is not None:
+        range_title = f"{range_label} - Intervalos de 30 min"
+    elif len(df_trends) < n_readings:
+        range_title = f"{range_label} - {len(df_trends)} de {n_readings} lecturas"
+    else:
+        range_title = f"{range_label} - {n_readings} lecturas"
 
     # Gráfico de temperatura
     fig_temp = go.Figure()
@@ -802,7 +829,7 @@ def show_trend_analysis():
         marker=dict(size=4)
     ))
     fig_temp.update_layout(
-        title="Tendencia de Temperatura (24h - Intervalos de 30 min)",
+        title=f"Tendencia de Temperatura ({range_title})",
         xaxis_title="Hora",
         yaxis_title="Temperatura (°C)",
         height=300,
@@ -836,7 +863,7 @@ def show_trend_analysis():
     ))
 
     fig_combined.update_layout(
-        title="Tendencia de Humedad y Presión (24h - Intervalos de 30 min)",
+        title=f"Tendencia de Humedad y Presión ({range_title})",
         xaxis_title="Hora",
         yaxis=dict(title="Humedad (%)", side="left"),
         yaxis2=dict(title="Presión (hPa)", side="right", overlaying="y"),
@@ -857,7 +884,7 @@ def show_trend_analysis():
         fill='tonexty'
     ))
     fig_wind.update_layout(
-        title="Tendencia de Velocidad del Viento (24h - Intervalos de 30 min)",
+        title=f"Tendencia de Velocidad del Viento ({range_title})",
         xaxis_title="Hora",
         yaxis_title="Velocidad (km/h)",
         height=300,
@@ -868,28 +895,48 @@ def show_trend_analysis():
     # Análisis de tendencias
     st.markdown("### 📊 Resumen de Cambios (Últimas 24h)")
 
+    # Agregados móviles precalculados por el almacén de observaciones (sin recorrer el
+    # historial); se usan apenas haya dos lecturas en la ventana, aunque caigan en un solo intervalo
+    daily = get_observation_store().rolling(location, "24h")
+    has_aggregates = daily["temperature"]["count"] >= 2
+    if has_aggregates:
+        temp_change = daily["temperature"]["tendency"] or 0.0
+        humidity_change = daily["humidity"]["tendency"] or 0.0
+        pressure_change = daily["pressure"]["tendency"] or 0.0
+        wind_change = daily["wind_speed"]["tendency"] or 0.0
+        st.caption(f"Cambios sobre {daily['temperature']['count']} lecturas de las últimas 24 h")
+    else:
+        temp_change = temp_trend[-1] - temp_trend[0]
+        humidity_change = humidity_trend[-1] - humidity_trend[0]
+        pressure_change = pressure_trend[-1] - pressure_trend[0]
+        wind_change = wind_trend[-1] - wind_trend[0]
+
     col1, col2, col3, col4 = st.columns(4)
 
     with col1:
-        temp_change = temp_trend[-1] - temp_trend[0]
         st.metric("Cambio Temperatura", f"{temp_change:+.1f}°C",
                  delta=f"{temp_change:+.1f}°C" if abs(temp_change) > 0.5 else "Estable")
 
     with col2:
-        humidity_change = humidity_trend[-1] - humidity_trend[0]
         st.metric("Cambio Humedad", f"{humidity_change:+.1f}%",
                  delta=f"{humidity_change:+.1f}%" if abs(humidity_change) > 2 else "Estable")
 
     with col3:
-        pressure_change = pressure_trend[-1] - pressure_trend[0]
         st.metric("Cambio Presión", f"{pressure_change:+.1f} hPa",
                  delta=f"{pressure_change:+.1f} hPa" if abs(pressure_change) > 1 else "Estable")
 
     with col4:
-        wind_change = wind_trend[-1] - wind_trend[0]
         st.metric("Cambio Viento", f"{wind_change:+.1f} km/h",
                  delta=f"{wind_change:+.1f} km/h" if abs(wind_change) > 1 else "Estable")
 
+    if has_aggregates:
+        recent = get_observation_store().rolling(location, "3h")["pressure"]
+        if recent["count"] >= 2:
+            st.caption(
+                f"🧭 Tendencia de presión (3h): {recent['tendency']:+.1f} hPa · "
+                f"rango {recent['min']:.1f}–{recent['max']:.1f} hPa · σ {recent['std']:.2f}"
+            )
+
 def show_model_comparison():
     """Mostrar comparación simplificada de modelos de Windy"""
     st.markdown("---")
@@ -1011,8 +1058,8 @@ def show_ml_dashboard(selected_api="OpenWeatherMap", selected_model=None):
         import os
         sys.path.append(os.path.join(os.path.dirname(__file__), 'pages_modules'))
 
-        # Importar la función main del ML dashboard
-        from pages_modules.ml_dashboard import main as ml_dashboard_main
+        # Importar la función main del ML dashboard (diferido, solo la primera vez)
+        ml_dashboard_main = PAGE_REGISTRY.load("Panel ML")
         ml_dashboard_main(selected_api, selected_model)
 
     except ImportError as e:
@@ -1030,8 +1077,8 @@ def show_reference():
         import os
         sys.path.append(os.path.join(os.path.dirname(__file__), 'pages_modules'))
 
-        # Importar la función main de reference
-        from reference import main as reference_main
+        # Importar la función main de reference (diferido, solo la primera vez)
+        reference_main = PAGE_REGISTRY.load("Referencia")
         reference_main()
 
     except ImportError as e:
@@ -1049,8 +1096,8 @@ def show_map_page(selected_api="OpenWeatherMap", selected_model=None):
         import os
         sys.path.append(os.path.join(os.path.dirname(__file__), 'pages_modules'))
 
-        # Importar la función main del mapa
-        from pages_modules.map_live import main as map_main
+        # Importar la función main del mapa (diferido, solo la primera vez)
+        map_main = PAGE_REGISTRY.load("Mapa Interactivo")
         map_main(selected_api, selected_model)
 
     except ImportError as e:
@@ -1068,8 +1115,8 @@ def show_cache_admin():
         import os
         sys.path.append(os.path.join(os.path.dirname(__file__), 'pages_modules'))
 
-        # Importar la función main del admin de cache
-        from cache_admin import main as cache_admin_main
+        # Importar la función main del admin de cache (diferido, solo la primera vez)
+        cache_admin_main = PAGE_REGISTRY.load("Administración de Cache")
         cache_admin_main()
 
     except ImportError as e:
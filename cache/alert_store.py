@@ -0,0 +1,211 @@
+"""
+Almacén de alertas para CorAlertMet Intelligence
+Historial acotado en memoria (ring buffer) con log persistente en SQLite
+"""
+import json
+import logging
+import sqlite3
+import threading
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from cache.time_utils import TimeValue, to_epoch
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+
+class AlertStore:
+    """
+    Historial de alertas con cota de memoria e índices por tiempo, severidad y estación
+
+    - En memoria: deque con tamaño máximo (las alertas más recientes)
+    - En disco: log append-only en SQLite, indexado para consultas rápidas
+    """
+
+    def __init__(self, db_path: Optional[str] = "cache/alerts/alert_history.db",
+                 max_memory_alerts: int = 1000):
+        """
+        Inicializar el almacén de alertas
+
+        Args:
+            db_path: Ruta de la base SQLite; None para usar solo memoria
+            max_memory_alerts: Cantidad máxima de alertas retenidas en memoria
+        """
+        self.recent = deque(maxlen=max_memory_alerts)
+        self.db_path = Path(db_path) if db_path else None
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if self.db_path is not None:
+            self._open_database()
+
+    def _open_database(self):
+        """Abrir la base SQLite y crear tabla e índices si no existen"""
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS alerts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ts REAL NOT NULL,
+                    station TEXT,
+                    severity TEXT,
+                    type TEXT,
+                    payload TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_alerts_ts ON alerts (ts);
+                CREATE INDEX IF NOT EXISTS idx_alerts_severity_ts ON alerts (severity, ts);
+                CREATE INDEX IF NOT EXISTS idx_alerts_station_ts ON alerts (station, ts);
+                CREATE INDEX IF NOT EXISTS idx_alerts_station_severity_ts
+                    ON alerts (station, severity, ts);
+            """)
+            self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Error abriendo almacén de alertas {self.db_path}: {e}")
+            self._conn = None
+
+    @staticmethod
+    def _alert_epoch(alert: Dict[str, Any]) -> Optional[float]:
+        """Timestamp de una alerta en segundos epoch (None si falta o es inválido)"""
+        try:
+            return to_epoch(alert.get("timestamp"))
+        except (AttributeError, TypeError, ValueError):
+            return None
+
+    @classmethod
+    def _row_values(cls, alert: Dict[str, Any]) -> tuple:
+        """Preparar valores de una alerta para insertar en SQLite (timestamp inválido → ahora)"""
+        ts = cls._alert_epoch(alert)
+        if ts is None and alert.get("timestamp") is not None:
+            logger.warning(f"Timestamp de alerta inválido: {alert.get('timestamp')!r}")
+        return (
+            datetime.now().timestamp() if ts is None else ts,
+            alert.get("station"),
+            alert.get("severity"),
+            alert.get("type"),
+            json.dumps(alert, default=str, ensure_ascii=False)
+        )
+
+    def append(self, alert: Dict[str, Any]) -> None:
+        """Agregar una alerta al historial"""
+        self.extend([alert])
+
+    def extend(self, alerts: Iterable[Dict[str, Any]]) -> None:
+        """Agregar varias alertas en una sola transacción"""
+        alerts = list(alerts)
+        if not alerts:
+            return
+
+        # Convertir antes de tocar la memoria: así memoria y disco reciben las mismas alertas
+        rows = [self._row_values(alert) for alert in alerts] if self._conn is not None else None
+
+        with self._lock:
+            self.recent.extend(alerts)
+
+            if self._conn is None or rows is None:
+                return
+
+            try:
+                self._conn.executemany(
+                    "INSERT INTO alerts (ts, station, severity, type, payload) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    rows
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Error guardando alertas: {e}")
+
+    def query(self, station: Optional[str] = None, severity: Optional[str] = None,
+              since: Optional[TimeValue] = None, until: Optional[TimeValue] = None,
+              limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Consultar alertas por estación, severidad y rango temporal (más recientes primero)
+
+        Ej: query(station="SACO", severity="CRITICAL", since=datetime.now() - timedelta(hours=6))
+
+        Returns:
+            Lista de alertas (dicts); usa la memoria si no hay base persistente
+        """
+        since_ts, until_ts = to_epoch(since), to_epoch(until)
+
+        if self._conn is None:
+            return self._query_memory(station, severity, since_ts, until_ts, limit)
+
+        clauses, params = [], []
+        if station is not None:
+            clauses.append("station = ?")
+            params.append(station)
+        if severity is not None:
+            clauses.append("severity = ?")
+            params.append(severity)
+        if since_ts is not None:
+            clauses.append("ts >= ?")
+            params.append(since_ts)
+        if until_ts is not None:
+            clauses.append("ts <= ?")
+            params.append(until_ts)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT payload FROM alerts {where} ORDER BY ts DESC LIMIT ?"  # nosec B608
+        params.append(int(limit))
+
+        try:
+            with self._lock:
+                rows = self._conn.execute(sql, params).fetchall()
+            return [json.loads(row[0]) for row in rows]
+        except sqlite3.Error as e:
+            logger.error(f"Error consultando alertas: {e}")
+            return []
+
+    def _query_memory(self, station, severity, since_ts, until_ts, limit):
+        """Consulta sobre el ring buffer en memoria"""
+        results = []
+        for alert in reversed(self.recent):
+            if station is not None and alert.get("station") != station:
+                continue
+            if severity is not None and alert.get("severity") != severity:
+                continue
+            alert_ts = self._alert_epoch(alert)
+            if since_ts is not None and (alert_ts is None or alert_ts < since_ts):
+                continue
+            if until_ts is not None and (alert_ts is None or alert_ts > until_ts):
+                continue
+            results.append(alert)
+            if len(results) >= limit:
+                break
+        return results
+
+    def count(self, severity: Optional[str] = None) -> int:
+        """Contar alertas persistidas (o en memoria si no hay base)"""
+        if self._conn is None:
+            return sum(1 for a in self.recent if severity is None or a.get("severity") == severity)
+
+        try:
+            with self._lock:
+                if severity is None:
+                    row = self._conn.execute("SELECT COUNT(*) FROM alerts").fetchone()
+                else:
+                    row = self._conn.execute(
+                        "SELECT COUNT(*) FROM alerts WHERE severity = ?", (severity,)
+                    ).fetchone()
+            return int(row[0])
+        except sqlite3.Error as e:
+            logger.error(f"Error contando alertas: {e}")
+            return 0
+
+    def recent_alerts(self, n: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Obtener las alertas más recientes retenidas en memoria (orden cronológico)"""
+        alerts = list(self.recent)
+        return alerts if n is None else alerts[-n:]
+
+    def close(self) -> None:
+        """Cerrar la conexión a la base"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -7,12 +7,16 @@
 import joblib
 import hashlib
 import logging
+import time
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, Optional, Union
 import pandas as pd
 import numpy as np
 
+from config.metrics import CACHE_OPERATION_SECONDS, CACHE_REQUESTS_TOTAL
+from config.structured_logging import log_event
+
 # Configurar logging
 logger = logging.getLogger(__name__)
 
@@ -106,7 +110,9 @@ def save_model(self, model: Any, model_name: str, metadata: Optional[Dict] = Non
             meta_file = self.models_dir / f"{model_name}_meta.json"
             
             # Guardar modelo con joblib
+            start = time.perf_counter()
             joblib.dump(model, model_file, compress=self.config["compression_level"])
+            CACHE_OPERATION_SECONDS.observe(time.perf_counter() - start, op="save", kind="model")
             
             # Guardar metadatos
             if metadata is None:
@@ -122,7 +128,9 @@ def save_model(self, model: Any, model_name: str, metadata: Optional[Dict] = Non
             with open(meta_file, 'w', encoding='utf-8') as f:
                 json.dump(metadata, f, indent=2)
             
-            logger.info(f"Modelo {model_name} guardado exitosamente")
+            log_event(logger, "cache.save", kind="model", name=model_name,
+                      duration_ms=round((time.perf_counter() - start) * 1000, 2),
+                      size_bytes=metadata["file_size"])
             return True
             
         except Exception as e:
@@ -140,27 +148,35 @@ def load_model(self, model_name: str) -> Optional[Any]:
             Modelo cargado o None si no existe/expiró
         """
         try:
-            model_file = self.models_dir / f"{model_name}.joblib"
-            
-            if not model_file.exists():
-                logger.warning(f"Modelo {model_name} no encontrado")
-                return None
-            
-            # Verificar expiración
-            if self._is_expired(model_file, self.config["model_ttl_hours"]):
-                logger.info(f"Modelo {model_name} ha expirado")
-                model_file.unlink(missing_ok=True)
-                return None
-            
-            # Cargar modelo con joblib
-            model = joblib.load(model_file)
-            logger.info(f"Modelo {model_name} cargado exitosamente")
-            return model
-            
+            return self._load_file("model", model_name, self.models_dir / f"{model_name}.joblib",
+                                   self.config["model_ttl_hours"])
         except Exception as e:
+            CACHE_REQUESTS_TOTAL.inc(kind="model", outcome="error")
             logger.error(f"Error cargando modelo {model_name}: {e}")
             return None
-    
+
+    def get_model_metadata(self, model_name: str) -> Optional[Dict]:
+        """
+        Obtener metadatos de un modelo guardado sin cargarlo
+
+        Args:
+            model_name: Nombre del modelo
+
+        Returns:
+            Dict con metadatos o None si no existen
+        """
+        meta_file = self.models_dir / f"{model_name}_meta.json"
+        model_file = self.models_dir / f"{model_name}.joblib"
+        if not meta_file.exists() or not model_file.exists():
+            return None
+
+        try:
+            with open(meta_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.warning(f"Error leyendo metadatos de {model_name}: {e}")
+            return None
+
     def save_data(self, data: Any, data_name: str, metadata: Optional[Dict] = None) -> bool:
         """
         Guardar datos usando joblib
@@ -183,7 +199,9 @@ def save_data(self, data: Any, data_name: str, metadata: Optional[Dict] = None)
             meta_file = self.data_dir / f"{data_name}_meta.json"
             
             # Guardar datos con joblib
+            start = time.perf_counter()
             joblib.dump(data, data_file, compress=self.config["compression_level"])
+            CACHE_OPERATION_SECONDS.observe(time.perf_counter() - start, op="save", kind="data")
             
             # Guardar metadatos
             if metadata is None:
@@ -199,7 +217,9 @@ def save_data(self, data: Any, data_name: str, metadata: Optional[Dict] = None)
             with open(meta_file, 'w', encoding='utf-8') as f:
                 json.dump(metadata, f, indent=2)
             
-            logger.info(f"Datos {data_name} guardados exitosamente")
+            log_event(logger, "cache.save", kind="data", name=data_name,
+                      duration_ms=round((time.perf_counter() - start) * 1000, 2),
+                      size_bytes=metadata["file_size"])
             return True
             
         except Exception as e:
@@ -217,26 +237,42 @@ def load_data(self, data_name: str) -> Optional[Any]:
             Datos cargados o None si no existen/expiraron
         """
         try:
-            data_file = self.data_dir / f"{data_name}.joblib"
-            
-            if not data_file.exists():
-                logger.warning(f"Datos {data_name} no encontrados")
-                return None
-            
-            # Verificar expiración
-            if self._is_expired(data_file, self.config["data_ttl_hours"]):
-                logger.info(f"Datos {data_name} han expirado")
-                data_file.unlink(missing_ok=True)
-                return None
-            
-            # Cargar datos con joblib
-            data = joblib.load(data_file)
-            logger.info(f"Datos {data_name} cargados exitosamente")
-            return data
-            
+            return self._load_file("data", data_name, self.data_dir / f"{data_name}.joblib",
+                                   self.config["data_ttl_hours"])
         except Exception as e:
+            CACHE_REQUESTS_TOTAL.inc(kind="data", outcome="error")
             logger.error(f"Error cargando datos {data_name}: {e}")
             return None
+
+    def _load_file(self, kind: str, name: str, path: Path, ttl_hours: float) -> Optional[Any]:
+        """
+        Cargar un archivo joblib registrando el evento "cache.load"
+
+        Los aciertos se muestrean (ver config.structured_logging); faltantes y
+        vencidos se registran siempre.
+        """
+        start = time.perf_counter()
+        if not path.exists():
+            CACHE_REQUESTS_TOTAL.inc(kind=kind, outcome="miss")
+            log_event(logger, "cache.load", sample_rate=1.0, kind=kind, name=name, outcome="miss")
+            return None
+
+        # Verificar expiración
+        if self._is_expired(path, ttl_hours):
+            CACHE_REQUESTS_TOTAL.inc(kind=kind, outcome="expired")
+            log_event(logger, "cache.load", sample_rate=1.0, kind=kind, name=name, outcome="expired")
+            path.unlink(missing_ok=True)
+            return None
+
+        # Cargar con joblib
+        value = joblib.load(path)
+        elapsed = time.perf_counter() - start
+        CACHE_OPERATION_SECONDS.observe(elapsed, op="load", kind=kind)
+        CACHE_REQUESTS_TOTAL.inc(kind=kind, outcome="hit")
+        log_event(logger, "cache.load", kind=kind, name=name, outcome="hit",
+                  duration_ms=round(elapsed * 1000, 2),
+                  size_bytes=path.stat().st_size)
+        return value
     
     def cleanup_expired(self) -> Dict[str, int]:
         """
@@ -0,0 +1,345 @@
+"""
+Historial de uso de modelos para CorAlertMet Intelligence
+Log append-only compartido por todo el proceso: memoria acotada para el render,
+SQLite indexado por API, modelo y tiempo, escrito por un hilo en segundo plano
+"""
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from cache.time_utils import TimeValue, to_epoch
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+HISTORY_RETENTION_DAYS = 30     # Antigüedad máxima de las entradas persistidas
+HISTORY_MAX_ROWS = 100_000      # Cota de filas en disco (se descartan las más viejas)
+PRUNE_INTERVAL_SECONDS = 600    # Frecuencia de la depuración por retención
+
+
+class ModelHistoryLog:
+    """
+    Historial de modelos utilizados (API, modelo, precisión) compartido entre sesiones
+
+    - record() no toca el disco: agrega a un deque en memoria y encola la entrada
+    - Un hilo escritor vacía la cola en lotes (una transacción por lote)
+    - La retención se aplica periódicamente por antigüedad y por cantidad de filas
+    """
+
+    def __init__(self, db_path: Optional[str] = "cache/history/model_history.db",
+                 max_memory_entries: int = 500, retention_days: float = HISTORY_RETENTION_DAYS,
+                 max_rows: int = HISTORY_MAX_ROWS, batch_size: int = 256,
+                 flush_interval: float = 1.0, max_queue_size: int = 10_000):
+        """
+        Args:
+            db_path: Ruta de la base SQLite; None para usar solo memoria
+            max_memory_entries: Entradas recientes retenidas en memoria
+            retention_days: Días que se conservan las entradas en disco
+            max_rows: Cantidad máxima de filas en disco
+            batch_size: Entradas máximas por transacción del escritor
+            flush_interval: Espera máxima (segundos) antes de escribir un lote incompleto
+            max_queue_size: Tamaño de la cola de escritura (si se llena, se descartan entradas)
+        """
+        self.recent = deque(maxlen=max_memory_entries)
+        self.db_path = Path(db_path) if db_path else None
+        self.retention_seconds = float(retention_days) * 86400
+        self.max_rows = int(max_rows)
+        self.batch_size = int(batch_size)
+        self.flush_interval = float(flush_interval)
+        self.dropped_count = 0
+
+        self._lock = threading.Lock()
+        self._queue = queue.Queue(max_queue_size)
+        self._conn = None
+        self._writer = None
+        self._last_prune = 0.0
+
+        if self.db_path is not None:
+            self._open_database()
+        if self._conn is not None:
+            self._writer = threading.Thread(target=self._writer_loop, name="model-history-writer",
+                                            daemon=True)
+            self._writer.start()
+
+    def _open_database(self):
+        """Abrir la base SQLite y crear tabla e índices si no existen"""
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS model_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ts REAL NOT NULL,
+                    api TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    accuracy REAL
+                );
+                CREATE INDEX IF NOT EXISTS idx_model_history_ts ON model_history (ts);
+                CREATE INDEX IF NOT EXISTS idx_model_history_api_ts ON model_history (api, ts);
+                CREATE INDEX IF NOT EXISTS idx_model_history_model_ts ON model_history (model, ts);
+            """)
+            self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Error abriendo historial de modelos {self.db_path}: {e}")
+            self._conn = None
+            return
+        self._warm_recent()
+
+    def _warm_recent(self):
+        """Cargar en memoria las últimas entradas persistidas (el historial sobrevive a reinicios)"""
+        try:
+            rows = self._conn.execute(
+                "SELECT ts, api, model, accuracy FROM model_history ORDER BY ts DESC LIMIT ?",
+                (self.recent.maxlen,)
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"Error cargando historial de modelos: {e}")
+            return
+        self.recent.extend(
+            {"timestamp": datetime.fromtimestamp(ts).isoformat(), "api": api,
+             "model": model, "accuracy": accuracy}
+            for ts, api, model, accuracy in reversed(rows)
+        )
+
+    def record(self, api: str, model_name: str, timestamp: Optional[TimeValue] = None,
+               accuracy: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Registrar el uso de un modelo (no bloquea: la escritura en disco es asíncrona)
+
+        Returns:
+            La entrada registrada
+        """
+        ts = to_epoch(timestamp)
+        ts = datetime.now().timestamp() if ts is None else ts
+        entry = {
+            "timestamp": datetime.fromtimestamp(ts).isoformat(),
+            "api": api,
+            "model": model_name,
+            "accuracy": accuracy
+        }
+        with self._lock:
+            self.recent.append(entry)
+
+        if self._writer is not None:
+            try:
+                self._queue.put_nowait((ts, api, model_name, accuracy))
+            except queue.Full:
+                self.dropped_count += 1
+                logger.warning("Cola del historial de modelos llena; entrada descartada")
+        return entry
+
+    def _writer_loop(self):
+        """Hilo escritor: vaciar la cola en lotes y aplicar la retención"""
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._prune()
+                continue
+
+            batch, stop = [], item is None
+            if not stop:
+                batch.append(item)
+            # Juntar lo que ya esté encolado sin esperar más
+            while not stop and len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                else:
+                    batch.append(item)
+
+            self._write(batch)
+            for _ in range(len(batch) + (1 if stop else 0)):
+                self._queue.task_done()
+            self._prune()
+            if stop:
+                return
+
+    def _write(self, batch):
+        """Insertar un lote de entradas en una sola transacción"""
+        if not batch:
+            return
+        try:
+            with self._lock:
+                self._conn.executemany(
+                    "INSERT INTO model_history (ts, api, model, accuracy) VALUES (?, ?, ?, ?)",
+                    batch
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Error guardando historial de modelos: {e}")
+
+    def _prune(self, force: bool = False):
+        """Descartar entradas vencidas o que exceden la cota de filas"""
+        now = time.time()
+        if self._conn is None or (not force and now - self._last_prune < PRUNE_INTERVAL_SECONDS):
+            return
+        self._last_prune = now
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM model_history WHERE ts < ?",
+                                   (now - self.retention_seconds,))
+                self._conn.execute(
+                    "DELETE FROM model_history WHERE id <= "
+                    "(SELECT id FROM model_history ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                    (self.max_rows,)
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Error depurando historial de modelos: {e}")
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Esperar a que el escritor persista lo encolado (para pruebas o al cerrar)"""
+        if self._writer is None:
+            return True
+        deadline = None if timeout is None else time.time() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.time() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def query(self, api: Optional[str] = None, model: Optional[str] = None,
+              since: Optional[TimeValue] = None, until: Optional[TimeValue] = None,
+              limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Consultar el historial por API, modelo y rango temporal (más recientes primero)
+
+        Las entradas aún en la cola de escritura pueden no aparecer hasta el próximo lote.
+
+        Returns:
+            Lista de entradas (dicts); usa la memoria si no hay base persistente
+        """
+        since_ts, until_ts = to_epoch(since), to_epoch(until)
+
+        if self._conn is None:
+            return self._query_memory(api, model, since_ts, until_ts, limit)
+
+        clauses, params = [], []
+        for name, value in (("api", api), ("model", model)):
+            if value is not None:
+                clauses.append(f"{name} = ?")
+                params.append(value)
+        if since_ts is not None:
+            clauses.append("ts >= ?")
+            params.append(since_ts)
+        if until_ts is not None:
+            clauses.append("ts <= ?")
+            params.append(until_ts)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sql = f"SELECT ts, api, model, accuracy FROM model_history {where} ORDER BY ts DESC LIMIT ?"  # nosec B608
+        params.append(int(limit))
+
+        try:
+            with self._lock:
+                rows = self._conn.execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"Error consultando historial de modelos: {e}")
+            return []
+        return [
+            {"timestamp": datetime.fromtimestamp(ts).isoformat(), "api": row_api,
+             "model": row_model, "accuracy": accuracy}
+            for ts, row_api, row_model, accuracy in rows
+        ]
+
+    def _query_memory(self, api, model, since_ts, until_ts, limit):
+        """Consulta sobre las entradas retenidas en memoria"""
+        results = []
+        with self._lock:
+            entries = list(self.recent)
+        for entry in reversed(entries):
+            if api is not None and entry["api"] != api:
+                continue
+            if model is not None and entry["model"] != model:
+                continue
+            entry_ts = to_epoch(entry["timestamp"])
+            if since_ts is not None and entry_ts < since_ts:
+                continue
+            if until_ts is not None and entry_ts > until_ts:
+                continue
+            results.append(entry)
+            if len(results) >= limit:
+                break
+        return results
+
+    def usage_summary(self, since: Optional[TimeValue] = None) -> List[Dict[str, Any]]:
+        """Usos, precisión media y último uso por (API, modelo)"""
+        since_ts = to_epoch(since)
+        if self._conn is None:
+            summary = {}
+            for entry in self._query_memory(None, None, since_ts, None, len(self.recent)):
+                item = summary.setdefault((entry["api"], entry["model"]), {
+                    "api": entry["api"], "model": entry["model"], "uses": 0,
+                    "accuracies": [], "last_used": entry["timestamp"]})
+                item["uses"] += 1
+                if entry["accuracy"] is not None:
+                    item["accuracies"].append(entry["accuracy"])
+            for item in summary.values():
+                accuracies = item.pop("accuracies")
+                item["mean_accuracy"] = sum(accuracies) / len(accuracies) if accuracies else None
+            return list(summary.values())
+
+        where, params = ("WHERE ts >= ?", [since_ts]) if since_ts is not None else ("", [])
+        sql = (
+            "SELECT api, model, COUNT(*), AVG(accuracy), MAX(ts) FROM model_history "  # nosec B608
+            f"{where} GROUP BY api, model ORDER BY COUNT(*) DESC"
+        )
+        try:
+            with self._lock:
+                rows = self._conn.execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            logger.error(f"Error resumiendo historial de modelos: {e}")
+            return []
+        return [
+            {"api": api, "model": model, "uses": int(uses), "mean_accuracy": mean_accuracy,
+             "last_used": datetime.fromtimestamp(last_ts).isoformat()}
+            for api, model, uses, mean_accuracy, last_ts in rows
+        ]
+
+    def recent_entries(self, n: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Entradas más recientes retenidas en memoria (orden cronológico)"""
+        with self._lock:
+            entries = list(self.recent)
+        return entries if n is None else entries[-n:]
+
+    def close(self) -> None:
+        """Persistir lo pendiente, detener el escritor y cerrar la base"""
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_default_log = None
+_default_log_lock = threading.Lock()
+
+
+def get_model_history_log() -> ModelHistoryLog:
+    """Obtener el historial de modelos compartido por todo el proceso"""
+    global _default_log
+    with _default_log_lock:
+        if _default_log is None:
+            _default_log = ModelHistoryLog()
+        return _default_log
+
+
+def record_model_usage(api: str, model_name: str, timestamp: Optional[TimeValue] = None,
+                       accuracy: Optional[float] = None) -> Dict[str, Any]:
+    """Función de conveniencia para registrar el uso de un modelo desde los fetchers"""
+    return get_model_history_log().record(api, model_name, timestamp, accuracy)
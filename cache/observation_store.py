@@ -0,0 +1,478 @@
+"""
+Almacén de observaciones para CorAlertMet Intelligence
+Series temporales por estación en particiones diarias columnares (NumPy + .npz)
+"""
+import atexit
+import json
+import logging
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Sequence, Union
+
+import numpy as np
+
+from cache.rolling_aggregates import RollingAggregateEngine
+from cache.time_utils import TimeValue, to_epoch
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Variables numéricas almacenadas (una columna float64 por variable)
+OBSERVATION_VARIABLES = (
+    "temperature",
+    "humidity",
+    "pressure",
+    "wind_speed",
+    "wind_direction",
+    "visibility",
+    "cloudiness",
+    "precipitation",
+)
+
+# Intervalos de agregación disponibles (segundos)
+DOWNSAMPLE_INTERVALS = {
+    "30min": 1800,
+    "1h": 3600,
+    "1d": 86400,
+}
+
+PARTITION_SECONDS = 86400  # Una partición por estación y día (UTC)
+FLUSH_INTERVAL_SECONDS = 60  # Frecuencia con que se persisten las particiones modificadas
+
+
+def _station_slug(station: str) -> str:
+    """Nombre de directorio seguro para una estación"""
+    return re.sub(r"[^0-9A-Za-z_-]+", "_", str(station)).strip("_") or "station"
+
+
+class _Partition:
+    """Partición diaria de una estación: timestamps y matriz de valores con crecimiento amortizado"""
+
+    def __init__(self, n_variables: int, capacity: int = 64):
+        self.ts = np.empty(capacity, dtype=np.float64)
+        self.values = np.empty((capacity, n_variables), dtype=np.float64)
+        self.size = 0
+        self.sorted = True
+        self.version = 0          # Se incrementa con cada lectura agregada
+        self.saved_version = 0    # Última versión escrita en disco
+
+    @property
+    def dirty(self) -> bool:
+        return self.version != self.saved_version
+
+    @classmethod
+    def from_arrays(cls, ts: np.ndarray, values: np.ndarray) -> "_Partition":
+        partition = cls(values.shape[1], capacity=max(64, len(ts)))
+        partition.ts[:len(ts)] = ts
+        partition.values[:len(ts)] = values
+        partition.size = len(ts)
+        return partition
+
+    def append(self, ts: float, row: np.ndarray) -> None:
+        if self.size == len(self.ts):
+            capacity = len(self.ts) * 2
+            self.ts = np.resize(self.ts, capacity)
+            self.values = np.resize(self.values, (capacity, self.values.shape[1]))
+        if self.size and ts < self.ts[self.size - 1]:
+            self.sorted = False
+        self.ts[self.size] = ts
+        self.values[self.size] = row
+        self.size += 1
+        self.version += 1
+
+    def arrays(self):
+        """Vistas ordenadas por tiempo (ordena una sola vez si llegaron lecturas atrasadas)"""
+        if not self.sorted:
+            order = np.argsort(self.ts[:self.size], kind="stable")
+            self.ts[:self.size] = self.ts[:self.size][order]
+            self.values[:self.size] = self.values[:self.size][order]
+            self.sorted = True
+        return self.ts[:self.size], self.values[:self.size]
+
+
+class ObservationStore:
+    """
+    Historial de observaciones por estación para gráficos de tendencia
+
+    - En memoria: particiones diarias (LRU acotado) con arrays columnares
+    - En disco: un .npz comprimido por estación y día, cargado bajo demanda; las
+      particiones modificadas se escriben en flush() (periódico, al desalojar y al salir),
+      nunca al registrar una lectura
+    """
+
+    def __init__(self, data_dir: Optional[str] = "cache/observations",
+                 variables: Sequence[str] = OBSERVATION_VARIABLES,
+                 max_partitions: int = 256,
+                 aggregates: Optional[RollingAggregateEngine] = None,
+                 flush_interval: Optional[float] = FLUSH_INTERVAL_SECONDS):
+        """
+        Inicializar el almacén de observaciones
+
+        Args:
+            data_dir: Directorio de las particiones; None para usar solo memoria
+            variables: Variables numéricas a almacenar
+            max_partitions: Particiones retenidas en memoria
+            aggregates: Motor de agregados móviles actualizado con cada lectura
+            flush_interval: Segundos entre escrituras en segundo plano (None = solo flush() manual)
+        """
+        self.data_dir = Path(data_dir) if data_dir else None
+        self.variables = tuple(variables)
+        self._column = {name: i for i, name in enumerate(self.variables)}
+        self.max_partitions = max_partitions
+        self._partitions = OrderedDict()
+        self._last_rows = {}
+        self._lock = threading.RLock()
+        self._io_lock = threading.Lock()   # Ordena las escrituras de flush() y del desalojo
+        self.aggregates = aggregates
+        self._stations = set()
+
+        if self.data_dir is not None:
+            try:
+                self.data_dir.mkdir(parents=True, exist_ok=True)
+            except OSError as e:
+                logger.error(f"Error creando directorio de observaciones {self.data_dir}: {e}")
+                self.data_dir = None
+        self._load_station_index()
+
+        self._flush_stop = threading.Event()
+        self._flush_thread = None
+        if self.data_dir is not None and flush_interval:
+            self._flush_thread = threading.Thread(target=self._flush_loop, args=(flush_interval,),
+                                                  name="observation-store-flush", daemon=True)
+            self._flush_thread.start()
+            atexit.register(self.close)
+
+    def _flush_loop(self, interval: float) -> None:
+        while not self._flush_stop.wait(interval):
+            self.flush()
+
+    def _station_index_path(self) -> Optional[Path]:
+        return self.data_dir / "stations.json" if self.data_dir is not None else None
+
+    def _load_station_index(self) -> None:
+        """Leer el índice de estaciones con historial"""
+        path = self._station_index_path()
+        if path is None or not path.exists():
+            return
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                self._stations.update(json.load(f))
+        except Exception as e:
+            logger.warning(f"Error leyendo índice de estaciones: {e}")
+
+    def _register_station(self, station: str) -> None:
+        """Agregar una estación nueva al índice persistido"""
+        if station in self._stations:
+            return
+        self._stations.add(station)
+        path = self._station_index_path()
+        if path is None:
+            return
+        try:
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(sorted(self._stations), f, ensure_ascii=False)
+        except Exception as e:
+            logger.error(f"Error guardando índice de estaciones: {e}")
+
+    def stations(self) -> list:
+        """Estaciones con observaciones registradas"""
+        with self._lock:
+            return sorted(self._stations)
+
+    def _partition_path(self, station: str, day: int) -> Optional[Path]:
+        if self.data_dir is None:
+            return None
+        date = datetime.fromtimestamp(day * PARTITION_SECONDS, tz=timezone.utc)
+        return self.data_dir / _station_slug(station) / f"{date:%Y%m%d}.npz"
+
+    def _load_partition(self, station: str, day: int) -> Optional[_Partition]:
+        """Leer una partición desde disco (columnas faltantes quedan en NaN)"""
+        path = self._partition_path(station, day)
+        if path is None or not path.exists():
+            return None
+
+        try:
+            with np.load(path, allow_pickle=False) as stored:
+                ts = stored["ts"]
+                columns = [str(c) for c in stored["variables"]]
+                raw = stored["values"]
+            values = np.full((len(ts), len(self.variables)), np.nan)
+            for i, name in enumerate(columns):
+                if name in self._column:
+                    values[:, self._column[name]] = raw[:, i]
+            return _Partition.from_arrays(ts, values)
+        except Exception as e:
+            logger.error(f"Error leyendo partición {path}: {e}")
+            return None
+
+    def _write_arrays(self, station: str, day: int, ts: np.ndarray, values: np.ndarray) -> bool:
+        """Escribir una partición en disco (reemplazo atómico)"""
+        path = self._partition_path(station, day)
+        if path is None:
+            return True
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp.npz")
+            np.savez_compressed(tmp_path, ts=ts, values=values, variables=np.array(self.variables))
+            tmp_path.replace(path)
+            return True
+        except Exception as e:
+            logger.error(f"Error guardando partición {path}: {e}")
+            return False
+
+    def _write_partition(self, station: str, day: int, partition: _Partition) -> None:
+        ts, values = partition.arrays()
+        with self._io_lock:
+            if self._write_arrays(station, day, ts, values):
+                partition.saved_version = partition.version
+
+    def _get_partition(self, station: str, day: int, create: bool = False) -> Optional[_Partition]:
+        """Obtener partición (memoria → disco → nueva) respetando el límite LRU"""
+        key = (station, day)
+        partition = self._partitions.get(key)
+        if partition is not None:
+            self._partitions.move_to_end(key)
+            return partition
+
+        partition = self._load_partition(station, day)
+        if partition is None:
+            if not create:
+                return None
+            partition = _Partition(len(self.variables))
+
+        self._partitions[key] = partition
+        self._evict()
+        return partition
+
+    def _evict(self) -> None:
+        """Persistir y descartar las particiones menos usadas cuando se supera el límite"""
+        excess = len(self._partitions) - self.max_partitions
+        if excess <= 0:
+            return
+        for key in list(self._partitions):
+            if excess <= 0:
+                break
+            partition = self._partitions[key]
+            if partition.dirty:
+                self._write_partition(key[0], key[1], partition)
+            del self._partitions[key]
+            excess -= 1
+
+    def _row(self, observation: Dict[str, Any]) -> np.ndarray:
+        row = np.full(len(self.variables), np.nan)
+        for name, i in self._column.items():
+            value = observation.get(name)
+            if isinstance(value, (int, float, np.integer, np.floating)):
+                row[i] = value
+        return row
+
+    def append(self, station: str, observation: Dict[str, Any],
+               timestamp: Optional[TimeValue] = None) -> bool:
+        """Agregar una observación de una estación"""
+        return self.extend(station, [observation], [timestamp]) > 0
+
+    def extend(self, station: str, observations: Iterable[Dict[str, Any]],
+               timestamps: Optional[Iterable[Optional[TimeValue]]] = None) -> int:
+        """
+        Agregar varias observaciones de una estación (solo en memoria; ver flush())
+
+        Las lecturas idénticas a la última registrada sin timestamp propio (datos
+        cacheados re-leídos en cada rerun) se descartan.
+
+        Returns:
+            Cantidad de observaciones almacenadas
+        """
+        observations = list(observations)
+        timestamps = list(timestamps) if timestamps is not None else [None] * len(observations)
+        now = datetime.now().timestamp()
+        stored = 0
+
+        with self._lock:
+            self._ensure_aggregates(station)
+            for observation, timestamp in zip(observations, timestamps):
+                row = self._row(observation)
+                ts = to_epoch(timestamp if timestamp is not None
+                               else observation.get("timestamp"))
+                last_ts, last_row = self._last_rows.get(station, (None, None))
+                if (last_row is not None and np.array_equal(last_row, row, equal_nan=True)
+                        and (ts is None or ts == last_ts)):
+                    continue
+
+                ts = now if ts is None else ts
+                day = int(ts // PARTITION_SECONDS)
+                self._get_partition(station, day, create=True).append(ts, row)
+                self._last_rows[station] = (ts, row)
+                if self.aggregates is not None:
+                    self.aggregates.update(station, ts, observation)
+                stored += 1
+
+            if stored:
+                self._register_station(station)
+
+        return stored
+
+    def _ensure_aggregates(self, station: str) -> None:
+        """Reconstruir los agregados de una estación desde disco la primera vez que se usa"""
+        if self.aggregates is None or self.aggregates.has_station(station):
+            return
+        until = datetime.now().timestamp()
+        since = until - max(self.aggregates.windows.values())
+        self.aggregates.warm(station, self.query(station, since, until, self.aggregates.variables))
+
+    def rolling(self, station: str, window: str = "3h") -> Dict[str, Dict[str, Optional[float]]]:
+        """
+        Agregados móviles precalculados de una estación (sin recorrer el historial)
+
+        Returns:
+            Dict variable -> {count, last, mean, min, max, variance, std, tendency}
+        """
+        if self.aggregates is None:
+            return {}
+        with self._lock:
+            self._ensure_aggregates(station)
+        return self.aggregates.snapshot(station, window, now=datetime.now().timestamp())
+
+    def query(self, station: str, since: Optional[TimeValue] = None,
+              until: Optional[TimeValue] = None,
+              variables: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Consultar observaciones de una estación en un rango temporal
+
+        Returns:
+            Dict con "timestamp" (epoch) y un array por variable, en orden cronológico
+        """
+        variables = tuple(variables) if variables else self.variables
+        columns = [self._column[name] for name in variables]
+        until_ts = to_epoch(until) if until is not None else datetime.now().timestamp()
+        since_ts = to_epoch(since) if since is not None else until_ts - PARTITION_SECONDS
+
+        ts_parts, value_parts = [], []
+        with self._lock:
+            for day in range(int(since_ts // PARTITION_SECONDS), int(until_ts // PARTITION_SECONDS) + 1):
+                partition = self._get_partition(station, day)
+                if partition is None:
+                    continue
+                ts, values = partition.arrays()
+                start = np.searchsorted(ts, since_ts, side="left")
+                end = np.searchsorted(ts, until_ts, side="right")
+                ts_parts.append(ts[start:end].copy())
+                value_parts.append(values[start:end, columns])
+
+        if ts_parts:
+            ts = np.concatenate(ts_parts)
+            values = np.concatenate(value_parts)
+        else:
+            ts = np.empty(0)
+            values = np.empty((0, len(columns)))
+
+        result = {"timestamp": ts}
+        for i, name in enumerate(variables):
+            result[name] = values[:, i]
+        return result
+
+    def downsample(self, station: str, interval: Union[str, int] = "30min",
+                   since: Optional[TimeValue] = None, until: Optional[TimeValue] = None,
+                   variables: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Agregar observaciones en intervalos fijos (media, mínimo y máximo por intervalo)
+
+        Args:
+            interval: "30min", "1h", "1d" o segundos
+
+        Returns:
+            Dict con "timestamp" (inicio de cada intervalo), "count" y, por variable,
+            las claves <var>, <var>_min y <var>_max
+        """
+        if isinstance(interval, str):
+            if interval not in DOWNSAMPLE_INTERVALS:
+                raise ValueError(f"Intervalo desconocido {interval!r}; "
+                                 f"use {', '.join(DOWNSAMPLE_INTERVALS)} o segundos")
+            seconds = DOWNSAMPLE_INTERVALS[interval]
+        elif isinstance(interval, (int, np.integer)) and not isinstance(interval, bool) and interval > 0:
+            seconds = int(interval)
+        else:
+            raise ValueError(f"Intervalo inválido {interval!r}; use {', '.join(DOWNSAMPLE_INTERVALS)} "
+                             f"o segundos (entero positivo)")
+        raw = self.query(station, since, until, variables)
+        ts = raw.pop("timestamp")
+
+        bins = np.floor(ts / seconds).astype(np.int64)
+        edges, starts, counts = np.unique(bins, return_index=True, return_counts=True)
+        result = {"timestamp": edges.astype(np.float64) * seconds, "count": counts}
+        if len(ts) == 0:
+            for name in raw:
+                result[name] = result[f"{name}_min"] = result[f"{name}_max"] = np.empty(0)
+            return result
+
+        for name, values in raw.items():
+            valid = ~np.isnan(values)
+            sums = np.add.reduceat(np.where(valid, values, 0.0), starts)
+            n_valid = np.add.reduceat(valid.astype(np.int64), starts)
+            with np.errstate(invalid="ignore", divide="ignore"):
+                result[name] = np.where(n_valid > 0, sums / n_valid, np.nan)
+            result[f"{name}_min"] = np.where(
+                n_valid > 0, np.minimum.reduceat(np.where(valid, values, np.inf), starts), np.nan)
+            result[f"{name}_max"] = np.where(
+                n_valid > 0, np.maximum.reduceat(np.where(valid, values, -np.inf), starts), np.nan)
+        return result
+
+    def flush(self) -> int:
+        """
+        Persistir las particiones modificadas
+
+        Copia los arrays bajo el lock y escribe fuera de él, así los fetchers no
+        esperan a la compresión ni al disco.
+
+        Returns:
+            Cantidad de particiones escritas
+        """
+        with self._lock:
+            pending = []
+            for (station, day), partition in self._partitions.items():
+                if partition.dirty:
+                    ts, values = partition.arrays()
+                    pending.append((station, day, partition, partition.version, ts.copy(), values.copy()))
+
+        written = 0
+        for station, day, partition, version, ts, values in pending:
+            with self._io_lock:
+                # El desalojo pudo haber escrito ya una versión más nueva
+                if partition.saved_version >= version:
+                    continue
+                if self._write_arrays(station, day, ts, values):
+                    partition.saved_version = max(partition.saved_version, version)
+                    written += 1
+        return written
+
+    def close(self) -> None:
+        """Detener las escrituras periódicas y persistir lo pendiente"""
+        self._flush_stop.set()
+        if self._flush_thread is not None:
+            self._flush_thread.join()
+            self._flush_thread = None
+        self.flush()
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_observation_store() -> ObservationStore:
+    """Obtener el almacén de observaciones compartido por todo el proceso"""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = ObservationStore(aggregates=RollingAggregateEngine())
+        return _default_store
+
+
+def record_observation(station: str, observation: Optional[Dict[str, Any]],
+                       timestamp: Optional[TimeValue] = None) -> bool:
+    """Función de conveniencia para registrar una lectura de los fetchers"""
+    if not observation:
+        return False
+    return get_observation_store().append(station, observation, timestamp)
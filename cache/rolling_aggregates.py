@@ -0,0 +1,178 @@
+"""
+Agregados móviles incrementales para CorAlertMet Intelligence
+Media, varianza, mínimo/máximo y tendencia por estación y variable en O(1) por lectura
+"""
+import logging
+import math
+import threading
+from collections import deque
+from typing import Dict, Optional, Sequence
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Ventanas por defecto: tendencia de 3 horas (ej. presión) y resumen de 24 horas
+DEFAULT_WINDOWS = {
+    "3h": 3 * 3600,
+    "24h": 24 * 3600,
+}
+
+AGGREGATE_VARIABLES = ("temperature", "humidity", "pressure", "wind_speed")
+
+
+class RollingWindow:
+    """
+    Ventana temporal deslizante de una variable
+
+    Media y varianza con Welford (alta y baja), mínimo y máximo con colas
+    monótonas; cada lectura cuesta O(1) amortizado.
+    """
+
+    def __init__(self, window_seconds: float):
+        self.window_seconds = float(window_seconds)
+        self.samples = deque()      # (ts, valor) dentro de la ventana
+        self._min = deque()         # Candidatos a mínimo (valores crecientes)
+        self._max = deque()         # Candidatos a máximo (valores decrecientes)
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def update(self, ts: float, value: float) -> bool:
+        """Agregar una lectura (se ignoran las anteriores a la última registrada)"""
+        if value is None or math.isnan(value):
+            return False
+        if self.samples and ts < self.samples[-1][0]:
+            return False
+
+        self.samples.append((ts, value))
+        n = len(self.samples)
+        delta = value - self.mean
+        self.mean += delta / n
+        self._m2 += delta * (value - self.mean)
+
+        while self._min and self._min[-1][1] > value:
+            self._min.pop()
+        self._min.append((ts, value))
+        while self._max and self._max[-1][1] < value:
+            self._max.pop()
+        self._max.append((ts, value))
+
+        self._expire(ts - self.window_seconds)
+        return True
+
+    def _expire(self, cutoff: float) -> None:
+        """Retirar las lecturas que quedaron fuera de la ventana"""
+        while self.samples and self.samples[0][0] < cutoff:
+            _, value = self.samples.popleft()
+            n = len(self.samples)
+            if n == 0:
+                self.mean, self._m2 = 0.0, 0.0
+            else:
+                delta = value - self.mean
+                self.mean -= delta / n
+                self._m2 = max(self._m2 - delta * (value - self.mean), 0.0)
+
+        while self._min and self._min[0][0] < cutoff:
+            self._min.popleft()
+        while self._max and self._max[0][0] < cutoff:
+            self._max.popleft()
+
+    @property
+    def count(self) -> int:
+        return len(self.samples)
+
+    def snapshot(self, now: Optional[float] = None) -> Dict[str, Optional[float]]:
+        """Agregados actuales de la ventana (vencida respecto de `now` si se indica)"""
+        if now is not None:
+            self._expire(now - self.window_seconds)
+        n = len(self.samples)
+        if n == 0:
+            return {"count": 0, "last": None, "mean": None, "min": None, "max": None,
+                    "variance": None, "std": None, "tendency": None}
+
+        variance = self._m2 / (n - 1) if n > 1 else 0.0
+        return {
+            "count": n,
+            "last": self.samples[-1][1],
+            "mean": self.mean,
+            "min": self._min[0][1],
+            "max": self._max[0][1],
+            "variance": variance,
+            "std": math.sqrt(variance),
+            # Cambio entre la lectura más antigua de la ventana y la más reciente
+            "tendency": self.samples[-1][1] - self.samples[0][1],
+        }
+
+
+class RollingAggregateEngine:
+    """Agregados móviles por estación, variable y ventana, actualizados a medida que llegan lecturas"""
+
+    def __init__(self, windows: Optional[Dict[str, float]] = None,
+                 variables: Sequence[str] = AGGREGATE_VARIABLES):
+        """
+        Args:
+            windows: Nombre de ventana -> duración en segundos
+            variables: Variables a agregar
+        """
+        self.windows = dict(windows or DEFAULT_WINDOWS)
+        self.variables = tuple(variables)
+        self._stations = {}
+        self._lock = threading.Lock()
+
+    def _station_windows(self, station: str) -> Dict[str, Dict[str, RollingWindow]]:
+        windows = self._stations.get(station)
+        if windows is None:
+            windows = {
+                name: {variable: RollingWindow(seconds) for variable in self.variables}
+                for name, seconds in self.windows.items()
+            }
+            self._stations[station] = windows
+        return windows
+
+    def update(self, station: str, ts: float, observation: Dict[str, float]) -> None:
+        """Incorporar una lectura de una estación"""
+        with self._lock:
+            for by_variable in self._station_windows(station).values():
+                for variable, window in by_variable.items():
+                    value = observation.get(variable)
+                    if isinstance(value, (int, float)):
+                        window.update(ts, float(value))
+
+    def snapshot(self, station: str, window: str = "3h",
+                 now: Optional[float] = None) -> Dict[str, Dict[str, Optional[float]]]:
+        """
+        Obtener los agregados de una estación para una ventana
+
+        Args:
+            now: Instante de referencia (epoch) para vencer lecturas viejas
+
+        Returns:
+            Dict variable -> {count, last, mean, min, max, variance, std, tendency}
+        """
+        with self._lock:
+            by_variable = self._stations.get(station, {}).get(window)
+            if by_variable is None:
+                return {variable: RollingWindow(0).snapshot() for variable in self.variables}
+            return {variable: w.snapshot(now) for variable, w in by_variable.items()}
+
+    def warm(self, station: str, history: Dict[str, Sequence[float]]) -> None:
+        """
+        Inicializar una estación reproduciendo su historial reciente
+
+        Args:
+            history: Dict con "timestamp" y un array por variable (formato de ObservationStore.query)
+        """
+        with self._lock:
+            windows = self._station_windows(station)
+            for i, ts in enumerate(history["timestamp"]):
+                for by_variable in windows.values():
+                    for variable, window in by_variable.items():
+                        if variable in history:
+                            window.update(float(ts), float(history[variable][i]))
+
+    def has_station(self, station: str) -> bool:
+        return station in self._stations
+
+    def reset(self, station: str) -> None:
+        """Descartar los agregados de una estación"""
+        with self._lock:
+            self._stations.pop(station, None)
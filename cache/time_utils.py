@@ -0,0 +1,29 @@
+"""
+Utilidades de tiempo para los almacenes de CorAlertMet Intelligence
+Conversión de timestamps (datetime, pd.Timestamp, ISO, epoch) a segundos epoch
+"""
+import numbers
+from datetime import datetime
+from typing import Optional, Union
+
+TimeValue = Union[datetime, str, int, float]
+
+
+def to_epoch(value: Optional[TimeValue]) -> Optional[float]:
+    """
+    Convertir un timestamp a segundos epoch
+
+    Acepta datetime, pd.Timestamp, texto ISO 8601 y números (incluidos escalares de NumPy).
+
+    Raises:
+        ValueError: Si el texto no es ISO 8601
+        AttributeError: Si el valor no es un tipo de tiempo reconocido
+    """
+    if value is None:
+        return None
+    if isinstance(value, numbers.Real):
+        return float(value)
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).timestamp()
+    # datetime y pd.Timestamp exponen timestamp()
+    return value.timestamp()
@@ -0,0 +1,127 @@
+"""
+Escalas de color vectorizadas para CorAlertMet Intelligence
+Bordes de clase precalculados + np.searchsorted: colorea escalares, estaciones o grillas en una llamada
+"""
+from typing import Sequence
+
+import numpy as np
+
+# Colores CSS con nombre usados por las escalas (para convertir a RGBA)
+NAMED_COLORS = {
+    "blue": "#0000FF",
+    "lightblue": "#ADD8E6",
+    "green": "#008000",
+    "lightgreen": "#90EE90",
+    "yellow": "#FFFF00",
+    "orange": "#FFA500",
+    "red": "#FF0000"
+}
+
+
+def color_to_rgb(color: str) -> tuple:
+    """Convertir un color hex (#RRGGBB) o con nombre CSS a (r, g, b)"""
+    hex_color = NAMED_COLORS.get(color, color).lstrip("#")
+    return tuple(int(hex_color[i:i + 2], 16) for i in (0, 2, 4))
+
+
+class ColorScale:
+    """
+    Escala de color por clases: value < edges[0] -> colors[0], ..., value >= edges[-1] -> colors[-1]
+
+    Equivale a una cadena if/elif de comparaciones "<" (NaN cae en la última clase)
+    """
+
+    def __init__(self, edges: Sequence[float], colors: Sequence[str], name: str = ""):
+        if len(colors) != len(edges) + 1:
+            raise ValueError("Se necesita un color más que la cantidad de bordes")
+        self.name = name
+        self.edges = np.asarray(edges, dtype=float)
+        self.colors = np.array(colors, dtype=object)
+        self._rgb_lut = np.array([color_to_rgb(c) for c in colors], dtype=np.uint8)
+
+    def indices(self, values) -> np.ndarray:
+        """Índice de clase para cada valor"""
+        return np.searchsorted(self.edges, np.asarray(values, dtype=float), side="right")
+
+    def __call__(self, values):
+        """Color (str) para un escalar, o array de colores para un array"""
+        return self.colors[self.indices(values)]
+
+    def rgba(self, values, alpha: int = 255) -> np.ndarray:
+        """
+        Colores RGBA uint8 con forma values.shape + (4,), para rasters/heatmaps
+
+        Los valores NaN quedan transparentes
+        """
+        values = np.asarray(values, dtype=float)
+        image = np.empty(values.shape + (4,), dtype=np.uint8)
+        image[..., :3] = self._rgb_lut[self.indices(values)]
+        image[..., 3] = np.where(np.isnan(values), 0, alpha)
+        return image
+
+
+class CombinedColorScale:
+    """
+    Escala bidimensional (ej. temperatura x viento) con una tabla de colores por par de clases
+    """
+
+    def __init__(self, row_edges: Sequence[float], col_edges: Sequence[float],
+                 table: Sequence[Sequence[str]], name: str = ""):
+        self.name = name
+        self.row_edges = np.asarray(row_edges, dtype=float)
+        self.col_edges = np.asarray(col_edges, dtype=float)
+        self.table = np.array(table, dtype=object)
+        if self.table.shape != (len(row_edges) + 1, len(col_edges) + 1):
+            raise ValueError("La tabla de colores no coincide con los bordes")
+
+    def __call__(self, row_values, col_values):
+        """Color para cada par (fila, columna); admite escalares o arrays con broadcasting"""
+        rows = np.searchsorted(self.row_edges, np.asarray(row_values, dtype=float), side="right")
+        cols = np.searchsorted(self.col_edges, np.asarray(col_values, dtype=float), side="right")
+        return self.table[rows, cols]
+
+
+# Escalas del mapa en vivo
+TEMPERATURE_SCALE = ColorScale(
+    [10, 20, 25, 30],
+    ["blue", "lightblue", "green", "orange", "red"],  # Muy frío ... Muy caliente
+    name="temperature"
+)
+
+WIND_SCALE = ColorScale(
+    [10, 20, 30],
+    ["green", "yellow", "orange", "red"],  # Suave ... Muy fuerte
+    name="wind_speed"
+)
+
+PRESSURE_SCALE = ColorScale(
+    [1000, 1010, 1020, 1030],
+    ["red", "orange", "yellow", "lightgreen", "blue"],  # Baja (tormenta) ... Alta (anticiclón)
+    name="pressure"
+)
+
+HUMIDITY_SCALE = ColorScale(
+    [30, 50, 70, 85],
+    ["blue", "lightblue", "green", "orange", "red"],  # Muy seco ... Muy húmedo (niebla)
+    name="humidity"
+)
+
+VISIBILITY_SCALE = ColorScale(
+    [1, 3, 5, 10],
+    ["red", "orange", "yellow", "lightgreen", "green"],  # Niebla densa ... Excelente
+    name="visibility"
+)
+
+# Temperatura (frío, fresco, normal, cálido, caliente) x viento (calmado, moderado, fuerte)
+COMBINED_TEMP_WIND_SCALE = CombinedColorScale(
+    [10, 20, 25, 30],
+    [10, 20],
+    [
+        ["#60A5FA", "#3B82F6", "#1E40AF"],  # Frío: azul claro, azul, azul oscuro
+        ["#67E8F9", "#06B6D4", "#0891B2"],  # Fresco: cian muy claro, cian claro, cian
+        ["#22C55E", "#10B981", "#059669"],  # Normal: verde claro, verde, verde oscuro
+        ["#F59E0B", "#F97316", "#EA580C"],  # Cálido: amarillo, naranja claro, naranja
+        ["#F59E0B", "#EF4444", "#DC2626"]   # Caliente: amarillo, rojo, rojo intenso
+    ],
+    name="temperature_wind"
+)
@@ -0,0 +1,196 @@
+"""
+Reducción de series para gráficos de CorAlertMet Intelligence
+Largest-Triangle-Three-Buckets (LTTB) y min/max por bucket, con cache por serie, rango y resolución
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Puntos por serie enviados al navegador por defecto
+DEFAULT_MAX_POINTS = 1000
+
+DOWNSAMPLING_METHODS = ("lttb", "minmax")
+
+
+def _numeric_x(x, n):
+    """Eje x numérico para el cálculo de áreas (fechas → epoch, categorías → posición)"""
+    if x is None:
+        return np.arange(n, dtype=np.float64)
+    values = np.asarray(x)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype("datetime64[ns]").astype(np.int64).astype(np.float64)
+    if np.issubdtype(values.dtype, np.number):
+        return values.astype(np.float64)
+    return np.arange(n, dtype=np.float64)
+
+
+def lttb_indices(x, y, threshold):
+    """
+    Índices seleccionados por Largest-Triangle-Three-Buckets
+
+    Conserva el primer y el último punto y, en cada bucket intermedio, el punto que
+    forma el triángulo de mayor área con el elegido antes y el promedio del siguiente
+    bucket; los picos sobreviven a la reducción.
+
+    Args:
+        x: Eje x (numérico, datetime o None para usar la posición)
+        y: Valores de la serie
+        threshold: Cantidad de puntos de salida
+
+    Returns:
+        np.ndarray de índices crecientes
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = _numeric_x(x, n)
+    # Bordes de los threshold - 2 buckets intermedios (sin primer ni último punto)
+    edges = np.floor(np.linspace(1, n - 1, threshold - 1)).astype(np.int64)
+    bucket_sum_x = np.add.reduceat(x[:-1], edges[:-1]) if n > 2 else np.empty(0)
+    bucket_sum_y = np.add.reduceat(y[:-1], edges[:-1]) if n > 2 else np.empty(0)
+    bucket_len = np.diff(edges)
+    avg_x = np.append(bucket_sum_x / bucket_len, x[-1])
+    avg_y = np.append(bucket_sum_y / bucket_len, y[-1])
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # Área (x2) del triángulo punto elegido / candidato / promedio del bucket siguiente
+        area = np.abs(
+            (x[a] - avg_x[i + 1]) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y[i + 1] - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(y, threshold):
+    """
+    Índices del mínimo y el máximo de cada bucket (totalmente vectorizado)
+
+    Returns:
+        np.ndarray de índices crecientes (como máximo `threshold`)
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    n_buckets = (threshold - 2) // 2  # Se reservan el primer y el último punto
+    if threshold >= n or n_buckets < 1:
+        return np.arange(n)
+
+    bucket_size = int(np.ceil(n / n_buckets))
+    padded = np.full(n_buckets * bucket_size, np.nan)
+    padded[:n] = y
+    buckets = padded.reshape(n_buckets, bucket_size)
+    valid = ~np.isnan(buckets).all(axis=1)
+    offsets = np.arange(n_buckets)[valid] * bucket_size
+    filled = buckets[valid]
+    low = offsets + np.argmin(np.where(np.isnan(filled), np.inf, filled), axis=1)
+    high = offsets + np.argmax(np.where(np.isnan(filled), -np.inf, filled), axis=1)
+    return np.unique(np.concatenate([[0, n - 1], low, high]))
+
+
+def downsample_indices(x, y, threshold=DEFAULT_MAX_POINTS, method="lttb"):
+    """Índices a graficar según el método ("lttb" o "minmax")"""
+    if method == "minmax":
+        return minmax_indices(y, threshold)
+    return lttb_indices(x, y, threshold)
+
+
+class DownsamplingCache:
+    """Cache LRU de índices reducidos por (serie, rango, resolución, método)"""
+
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def indices(self, series_key, x, y, threshold, method="lttb"):
+        n = len(y)
+        x_range = (str(x[0]), str(x[-1])) if x is not None and n else None
+        # La suma de la serie distingue datos nuevos con igual largo y rango
+        key = (series_key, x_range, n, float(np.nansum(y)), threshold, method)
+
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return cached
+
+        selected = downsample_indices(x, y, threshold, method)
+
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = selected
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return selected
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Cache compartido por todo el proceso
+DOWNSAMPLING_CACHE = DownsamplingCache()
+
+
+def downsample_series(x, y, threshold=DEFAULT_MAX_POINTS, method="lttb", series_key=None):
+    """
+    Reducir una serie para graficarla
+
+    Args:
+        series_key: Identificador de la serie; si se indica, los índices se cachean
+                    por (serie, rango de x, largo, resolución, método)
+
+    Returns:
+        Tupla (x reducido, y reducido); con x None se devuelven las posiciones elegidas
+    """
+    y_values = np.asarray(y)
+    if len(y_values) <= threshold:
+        return x, y
+
+    if series_key is None:
+        selected = downsample_indices(x, y_values, threshold, method)
+    else:
+        selected = DOWNSAMPLING_CACHE.indices(series_key, x, y_values, threshold, method)
+    x_values = np.asarray(x)[selected] if x is not None else selected
+    return x_values, y_values[selected]
+
+
+def downsample_frame(frame, y_columns, x_column=None, threshold=DEFAULT_MAX_POINTS,
+                     method="lttb", series_key=None):
+    """
+    Reducir un DataFrame para graficar varias columnas sobre el mismo eje x
+
+    Se conserva la unión de los puntos elegidos para cada columna, así que los picos
+    de todas las series quedan en el resultado.
+
+    Returns:
+        DataFrame con las filas seleccionadas (sin copia si no hace falta reducir)
+    """
+    if len(frame) <= threshold:
+        return frame
+
+    x = frame[x_column].to_numpy() if x_column is not None else None
+    selected = [
+        DOWNSAMPLING_CACHE.indices((series_key, column), x, frame[column].to_numpy(dtype=float),
+                                   threshold, method)
+        if series_key is not None
+        else downsample_indices(x, frame[column].to_numpy(dtype=float), threshold, method)
+        for column in y_columns
+    ]
+    return frame.iloc[np.unique(np.concatenate(selected))]
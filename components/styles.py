@@ -1,210 +1,274 @@
 """
 Componente de estilos CSS centralizado para CorAlertMet Intelligence
+Gestor de estilos: bundles CSS minificados, con hash de contenido e inyectados una vez por ejecución
 """
+import hashlib
+import re
+from functools import lru_cache
+
 import streamlit as st
 
-def apply_corporate_styles():
-    """
-    Aplicar estilos corporativos responsivos para CorAlertIntel
-    Siguiendo las mejores prácticas de Streamlit CSS
-    """
-    st.markdown("""
-    <style>
-    /* ===== OCULTAR ELEMENTOS NATIVOS DE STREAMLIT ===== */
-    /* Ocultar menú hamburguesa */
-    #MainMenu {visibility: hidden;}
-
-    /* Ocultar footer nativo */
-    footer {visibility: hidden;}
-
-    /* Ocultar botón de deploy */
-    .stDeployButton {display: none;}
-
-    /* Ocultar toolbar de Streamlit */
-    div[data-testid="stToolbar"] {
-        visibility: hidden;
-        height: 0;
-        position: absolute;
-    }
+# Clave de session_state con los hashes de bundles ya inyectados en la ejecución actual
+_INJECTED_STYLES_KEY = "_injected_style_bundles"
 
-    /* Ocultar decoración de Streamlit */
-    div[data-testid="stDecoration"] {display: none;}
-
-    /* ===== RESPONSIVIDAD MÓVIL (≤ 768px) ===== */
-    @media (max-width: 768px) {
-        /* Sidebar responsivo - usar clases estándar de Streamlit */
-        .css-1d391kg {
-            width: 100% !important;
-            min-width: 100% !important;
-        }
-
-        /* Columnas responsivas - 4 columnas → 2 columnas */
-        .element-container .stColumn {
-            flex: 0 0 50% !important;
-            max-width: 50% !important;
-        }
-
-        /* Iconos SVG responsivos */
-        .smooth-icon {
-            width: 20px !important;
-            height: 20px !important;
-        }
-
-        /* Botones responsivos */
-        .stButton > button {
-            width: 100% !important;
-            font-size: 14px !important;
-        }
-
-        /* Métricas responsivas */
-        .metric-container {
-            padding: 8px !important;
-        }
-
-        /* Texto responsivo - usar selectores específicos de Streamlit */
-        .stMarkdown h1 {
-            font-size: 1.5rem !important;
-        }
-        .stMarkdown h2 {
-            font-size: 1.3rem !important;
-        }
-        .stMarkdown h3 {
-            font-size: 1.1rem !important;
-        }
-
-        /* Gráficos Plotly responsivos */
-        .js-plotly-plot {
-            width: 100% !important;
-            height: auto !important;
-        }
-
-        /* Mapa Folium responsivo */
-        .folium-container {
-            width: 100% !important;
-            height: 300px !important;
-        }
-    }
+CORPORATE_CSS = """
+/* ===== OCULTAR ELEMENTOS NATIVOS DE STREAMLIT ===== */
+/* Ocultar menú hamburguesa */
+#MainMenu {visibility: hidden;}
 
-    /* ===== MÓVIL PEQUEÑO (≤ 480px) ===== */
-    @media (max-width: 480px) {
-        /* Una columna en pantallas muy pequeñas */
-        .element-container .stColumn {
-            flex: 0 0 100% !important;
-            max-width: 100% !important;
-        }
-
-        /* Sidebar colapsado en móvil */
-        .css-1d391kg {
-            transform: translateX(-100%);
-            transition: transform 0.3s ease;
-        }
-
-        /* Iconos más pequeños */
-        .smooth-icon {
-            width: 16px !important;
-            height: 16px !important;
-        }
-
-        /* Padding reducido en móvil */
-        .main .block-container {
-            padding: 1rem !important;
-        }
-    }
+/* Ocultar footer nativo */
+footer {visibility: hidden;}
 
-    /* ===== TABLET (769px - 1024px) ===== */
-    @media (min-width: 769px) and (max-width: 1024px) {
-        .element-container .stColumn {
-            flex: 0 0 33.333% !important;
-            max-width: 33.333% !important;
-        }
-    }
+/* Ocultar botón de deploy */
+.stDeployButton {display: none;}
 
-    /* ===== MEJORAS GENERALES DE RESPONSIVIDAD ===== */
-    /* Selectbox responsivo */
-    .stSelectbox > div > div {
-        min-width: 0 !important;
-    }
+/* Ocultar toolbar de Streamlit */
+div[data-testid="stToolbar"] {
+    visibility: hidden;
+    height: 0;
+    position: absolute;
+}
 
-    /* Radio buttons responsivos */
-    .stRadio > div {
-        flex-wrap: wrap !important;
-    }
+/* Ocultar decoración de Streamlit */
+div[data-testid="stDecoration"] {display: none;}
 
-    .stRadio > div > label {
-        flex: 1 1 auto !important;
-        min-width: 0 !important;
+/* ===== RESPONSIVIDAD MÓVIL (≤ 768px) ===== */
+@media (max-width: 768px) {
+    /* Sidebar responsivo - usar clases estándar de Streamlit */
+    .css-1d391kg {
+        width: 100% !important;
+        min-width: 100% !important;
     }
 
-    /* Tablas responsivas con scroll horizontal */
-    .stDataFrame {
-        overflow-x: auto !important;
+    /* Columnas responsivas - 4 columnas → 2 columnas */
+    .element-container .stColumn {
+        flex: 0 0 50% !important;
+        max-width: 50% !important;
     }
 
-    /* Footer responsivo */
-    .footer-container {
-        flex-direction: column !important;
-        text-align: center !important;
+    /* Iconos SVG responsivos */
+    .smooth-icon {
+        width: 20px !important;
+        height: 20px !important;
     }
 
-    .footer-container > div {
-        margin-bottom: 10px !important;
+    /* Botones responsivos */
+    .stButton > button {
+        width: 100% !important;
+        font-size: 14px !important;
     }
 
-    /* ===== MEJORAS ESPECÍFICAS DE STREAMLIT ===== */
-    /* Mejorar contenedores de métricas */
+    /* Métricas responsivas */
     .metric-container {
-        padding: 1rem;
-        border-radius: 0.5rem;
-        background-color: rgba(255, 255, 255, 0.05);
+        padding: 8px !important;
     }
 
-    /* Mejorar botones */
-    .stButton > button {
-        border-radius: 0.5rem;
-        transition: all 0.3s ease;
+    /* Texto responsivo - usar selectores específicos de Streamlit */
+    .stMarkdown h1 {
+        font-size: 1.5rem !important;
     }
-
-    .stButton > button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 4px 8px rgba(0, 0, 0, 0.2);
+    .stMarkdown h2 {
+        font-size: 1.3rem !important;
+    }
+    .stMarkdown h3 {
+        font-size: 1.1rem !important;
     }
 
-    /* Mejorar sidebar */
-    .css-1d391kg {
-        background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
+    /* Gráficos Plotly responsivos */
+    .js-plotly-plot {
+        width: 100% !important;
+        height: auto !important;
     }
 
-    /* Mejorar contenedores principales */
-    .main .block-container {
-        padding: 2rem 1rem 60px 1rem; /* Espacio extra para footer fijo */
-        max-width: 1200px;
+    /* Mapa Folium responsivo */
+    .folium-container {
+        width: 100% !important;
+        height: 300px !important;
+    }
+}
+
+/* ===== MÓVIL PEQUEÑO (≤ 480px) ===== */
+@media (max-width: 480px) {
+    /* Una columna en pantallas muy pequeñas */
+    .element-container .stColumn {
+        flex: 0 0 100% !important;
+        max-width: 100% !important;
     }
 
-    /* Footer fijo - asegurar que esté siempre visible */
-    .footer-fixed {
-        position: fixed !important;
-        bottom: 0 !important;
-        left: 0 !important;
-        right: 0 !important;
-        z-index: 1000 !important;
+    /* Sidebar colapsado en móvil */
+    .css-1d391kg {
+        transform: translateX(-100%);
+        transition: transform 0.3s ease;
     }
 
-    /* ===== ANIMACIONES SUAVES ===== */
-    /* Transiciones suaves para elementos interactivos */
-    .stButton > button,
-    .stSelectbox > div,
-    .stRadio > div > label {
-        transition: all 0.3s ease;
+    /* Iconos más pequeños */
+    .smooth-icon {
+        width: 16px !important;
+        height: 16px !important;
     }
 
-    /* Animación de carga suave */
-    .stSpinner {
-        animation: spin 1s linear infinite;
+    /* Padding reducido en móvil */
+    .main .block-container {
+        padding: 1rem !important;
     }
+}
 
-    @keyframes spin {
-        0% { transform: rotate(0deg); }
-        100% { transform: rotate(360deg); }
+/* ===== TABLET (769px - 1024px) ===== */
+@media (min-width: 769px) and (max-width: 1024px) {
+    .element-container .stColumn {
+        flex: 0 0 33.333% !important;
+        max-width: 33.333% !important;
     }
-    </style>
-    """, unsafe_allow_html=True)
+}
+
+/* ===== MEJORAS GENERALES DE RESPONSIVIDAD ===== */
+/* Selectbox responsivo */
+.stSelectbox > div > div {
+    min-width: 0 !important;
+}
+
+/* Radio buttons responsivos */
+.stRadio > div {
+    flex-wrap: wrap !important;
+}
+
+.stRadio > div > label {
+    flex: 1 1 auto !important;
+    min-width: 0 !important;
+}
+
+/* Tablas responsivas con scroll horizontal */
+.stDataFrame {
+    overflow-x: auto !important;
+}
+
+/* Footer responsivo */
+.footer-container {
+    flex-direction: column !important;
+    text-align: center !important;
+}
+
+.footer-container > div {
+    margin-bottom: 10px !important;
+}
+
+/* ===== MEJORAS ESPECÍFICAS DE STREAMLIT ===== */
+/* Mejorar contenedores de métricas */
+.metric-container {
+    padding: 1rem;
+    border-radius: 0.5rem;
+    background-color: rgba(255, 255, 255, 0.05);
+}
+
+/* Mejorar botones */
+.stButton > button {
+    border-radius: 0.5rem;
+    transition: all 0.3s ease;
+}
+
+.stButton > button:hover {
+    transform: translateY(-2px);
+    box-shadow: 0 4px 8px rgba(0, 0, 0, 0.2);
+}
+
+/* Mejorar sidebar */
+.css-1d391kg {
+    background: linear-gradient(135deg, #1e3c72 0%, #2a5298 100%);
+}
+
+/* Mejorar contenedores principales */
+.main .block-container {
+    padding: 2rem 1rem 60px 1rem; /* Espacio extra para footer fijo */
+    max-width: 1200px;
+}
+
+/* Footer fijo - asegurar que esté siempre visible */
+.footer-fixed {
+    position: fixed !important;
+    bottom: 0 !important;
+    left: 0 !important;
+    right: 0 !important;
+    z-index: 1000 !important;
+}
+
+/* ===== ANIMACIONES SUAVES ===== */
+/* Transiciones suaves para elementos interactivos */
+.stButton > button,
+.stSelectbox > div,
+.stRadio > div > label {
+    transition: all 0.3s ease;
+}
+
+/* Animación de carga suave */
+.stSpinner {
+    animation: spin 1s linear infinite;
+}
+
+@keyframes spin {
+    0% { transform: rotate(0deg); }
+    100% { transform: rotate(360deg); }
+}
+"""
+
+
+def minify_css(css: str) -> str:
+    """Minificar CSS: quitar comentarios y espacios redundantes"""
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r":\s+", ":", css)
+    return css.replace(";}", "}").strip()
+
+
+@lru_cache(maxsize=32)
+def build_style_bundle(css: str) -> tuple:
+    """
+    Construir un bundle minificado (una vez por proceso y contenido)
+
+    Returns:
+        Tupla (css minificado, hash de contenido)
+    """
+    bundle = minify_css(css)
+    digest = hashlib.sha1(bundle.encode("utf-8")).hexdigest()[:12]
+    return bundle, digest
+
+
+def start_style_run():
+    """
+    Marcar el inicio de una ejecución de la página
+
+    Debe llamarse al comienzo del script principal: los estilos inyectados con
+    st.markdown solo viven durante una ejecución, así que se vuelven a emitir
+    una vez en cada rerun
+    """
+    st.session_state[_INJECTED_STYLES_KEY] = set()
+
+
+def inject_style_bundle(name: str, css: str) -> bool:
+    """
+    Inyectar un bundle CSS si no fue inyectado ya en esta ejecución
+
+    Args:
+        name: Nombre del bundle (se usa como atributo del tag <style>)
+        css: CSS sin minificar
+
+    Returns:
+        True si se inyectó, False si ya estaba presente
+    """
+    bundle, digest = build_style_bundle(css)
+
+    injected = st.session_state.setdefault(_INJECTED_STYLES_KEY, set())
+    if digest in injected:
+        return False
+    injected.add(digest)
+
+    st.markdown(f'<style data-bundle="{name}-{digest}">{bundle}</style>', unsafe_allow_html=True)
+    return True
+
+
+def apply_corporate_styles():
+    """
+    Aplicar estilos corporativos responsivos para CorAlertIntel
+    Siguiendo las mejores prácticas de Streamlit CSS
+    """
+    inject_style_bundle("corporate", CORPORATE_CSS)
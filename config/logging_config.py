@@ -1,15 +1,146 @@
 """
 Configuración de logging para CorAlertIntel
-Sistema simple y robusto de logging siguiendo mejores prácticas
+Los loggers solo encolan registros (QueueHandler); un único hilo (QueueListener)
+los escribe en lotes en consola y archivos rotativos, fuera del camino de la request
 """
+import atexit
 import logging
+import os
+import queue
+import threading
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from config.structured_logging import JsonFormatter
+
+# Formato por defecto de los logs
+DEFAULT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Nivel y formato por subsistema (prefijo del nombre del logger)
+# Los niveles se pueden sobreescribir con CORALERT_LOG_LEVELS="cache=WARNING,pages_modules=DEBUG"
+LOG_SUBSYSTEMS = {
+    'auth': {'level': logging.INFO},
+    'cache': {'level': logging.INFO},   # Eventos de cache (muestreados) para análisis de latencia
+}
+
+# "text" (por defecto) o "json" (una línea JSON por registro también en consola y archivos)
+LOG_OUTPUT_FORMAT = os.environ.get('CORALERT_LOG_FORMAT', 'text').lower()
+
+
+class BatchedRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler que no vacía el archivo por registro: flush() vacía y rota una vez por lote"""
+
+    def emit(self, record):
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        self.acquire()
+        try:
+            super().flush()
+            if self.stream is not None and self.maxBytes > 0 and self.stream.tell() >= self.maxBytes:
+                self.doRollover()
+        finally:
+            self.release()
+
+
+class BatchQueueListener(QueueListener):
+    """QueueListener que despacha los registros en lotes y vacía los handlers una vez por lote"""
+
+    def __init__(self, log_queue, *handlers, batch_size=256):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+
+    def _monitor(self):
+        while True:
+            record = self.dequeue(True)
+            stop = record is self._sentinel
+            batch = [] if stop else [record]
+            # Juntar lo que ya esté encolado sin esperar más
+            while not stop and len(batch) < self.batch_size:
+                try:
+                    record = self.dequeue(False)
+                except queue.Empty:
+                    break
+                if record is self._sentinel:
+                    stop = True
+                else:
+                    batch.append(record)
+
+            for record in batch:
+                self.handle(record)
+            for handler in self.handlers:
+                handler.flush()
+            for _ in range(len(batch) + (1 if stop else 0)):
+                self.queue.task_done()
+            if stop:
+                return
+
+
+class SubsystemFormatter(logging.Formatter):
+    """Formatter que elige el formato según el subsistema (prefijo más largo del nombre del logger)"""
+
+    def __init__(self, default):
+        super().__init__()
+        self.default = default
+        self.formatters = {}
+
+    def set_format(self, prefix, fmt):
+        self.formatters[prefix] = logging.Formatter(fmt, datefmt=DATE_FORMAT)
+
+    def _formatter_for(self, name):
+        for prefix in sorted(self.formatters, key=len, reverse=True):
+            if name == prefix or name.startswith(prefix + '.'):
+                return self.formatters[prefix]
+        return self.default
+
+    def format(self, record):
+        return self._formatter_for(record.name).format(record)
+
+
+class EventQueueHandler(QueueHandler):
+    """QueueHandler que no formatea los eventos estructurados en el hilo que los emite"""
+
+    def prepare(self, record):
+        # Los campos de un evento son valores simples: el formateo se difiere al hilo escritor
+        if getattr(record, 'event', None) is not None:
+            return record
+        return super().prepare(record)
+
+
+class _EventFilter(logging.Filter):
+    """Aceptar (o excluir) los eventos estructurados"""
+
+    def __init__(self, exclude=False):
+        super().__init__()
+        self.exclude = exclude
+
+    def filter(self, record):
+        return (getattr(record, 'event', None) is not None) != self.exclude
+
+
+class _SubsystemFilter(logging.Filter):
+    """Aceptar (o excluir) los registros de un subsistema"""
+
+    def __init__(self, prefix, exclude=False):
+        super().__init__()
+        self.prefix = prefix
+        self.exclude = exclude
+
+    def filter(self, record):
+        matches = record.name == self.prefix or record.name.startswith(self.prefix + '.')
+        return matches != self.exclude
+
 
 class LoggingConfig:
     """Configuración centralizada de logging"""
 
-    def __init__(self):
+    def __init__(self, subsystems=None, batch_size=256):
         # Directorio de logs
         self.logs_dir = Path("logs")
         self.logs_dir.mkdir(exist_ok=True)
@@ -18,7 +149,8 @@ def __init__(self):
         self.log_files = {
             'app': self.logs_dir / 'coralert.log',
             'auth': self.logs_dir / 'auth.log',
-            'error': self.logs_dir / 'error.log'
+            'error': self.logs_dir / 'error.log',
+            'events': self.logs_dir / 'events.jsonl'
         }
 
         # Configuración de rotación
@@ -28,72 +160,129 @@ def __init__(self):
         }
 
         # Formato de logs
-        self.log_format = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
+        self.log_format = logging.Formatter(DEFAULT_FORMAT, datefmt=DATE_FORMAT)
+        self.formatter = SubsystemFormatter(self.log_format)
+        self.json_formatter = JsonFormatter()
+        self.output_format = LOG_OUTPUT_FORMAT
 
-    def setup_logger(self, name: str, level: int = logging.INFO) -> logging.Logger:
-        """Configura un logger específico"""
-        logger = logging.getLogger(name)
-        logger.setLevel(level)
+        self.batch_size = batch_size
+        self.subsystems = {}
+        self.queue = queue.Queue(-1)
+        self.listener = None
+        self._lock = threading.Lock()
+
+        for name, options in {**LOG_SUBSYSTEMS, **(subsystems or {})}.items():
+            self.configure_subsystem(name, **options)
+        self._load_env_levels()
+
+    def _load_env_levels(self):
+        """Niveles por subsistema desde CORALERT_LOG_LEVELS ("cache=WARNING,auth=INFO")"""
+        for item in os.environ.get('CORALERT_LOG_LEVELS', '').split(','):
+            name, _, level = item.partition('=')
+            if name.strip() and level.strip():
+                self.configure_subsystem(name.strip(), level=level.strip().upper())
+
+    def configure_subsystem(self, name: str, level=None, format: str = None):
+        """
+        Configurar nivel y/o formato de un subsistema
+
+        Args:
+            name: Nombre (o prefijo) del logger, ej. "cache" o "pages_modules.ml_models"
+            level: Nivel (int o nombre, ej. "WARNING")
+            format: Formato de logging.Formatter para los registros del subsistema
+        """
+        options = self.subsystems.setdefault(name, {})
+        if level is not None:
+            options['level'] = level
+            logging.getLogger(name).setLevel(level)
+        if format is not None:
+            options['format'] = format
+            self.formatter.set_format(name, format)
 
-        # Evitar duplicar handlers
-        if logger.handlers:
-            return logger
+    def _output_formatter(self):
+        return self.json_formatter if self.output_format == 'json' else self.formatter
 
+    def _rotating_handler(self, path, level, formatter=None):
+        handler = BatchedRotatingFileHandler(
+            path,
+            maxBytes=self.rotation_config['max_bytes'],
+            backupCount=self.rotation_config['backup_count'],
+            encoding='utf-8',
+            delay=True
+        )
+        handler.setLevel(level)
+        handler.setFormatter(formatter or self._output_formatter())
+        return handler
+
+    def _build_handlers(self):
+        """Handlers reales (solo los usa el hilo escritor)"""
         # Handler para consola (solo errores en producción)
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.ERROR)
-        console_handler.setFormatter(self.log_format)
+        console_handler.setFormatter(self._output_formatter())
         # Configurar encoding para Windows
         console_handler.stream.reconfigure(encoding='utf-8')
-        logger.addHandler(console_handler)
 
-        # Handler para archivo principal
-        file_handler = RotatingFileHandler(
-            self.log_files['app'],
-            maxBytes=self.rotation_config['max_bytes'],
-            backupCount=self.rotation_config['backup_count'],
-            encoding='utf-8'
-        )
-        file_handler.setLevel(logging.DEBUG)
-        file_handler.setFormatter(self.log_format)
-        logger.addHandler(file_handler)
+        # Archivo principal y de errores (sin autenticación) y archivo de auth
+        app_handler = self._rotating_handler(self.log_files['app'], logging.DEBUG)
+        error_handler = self._rotating_handler(self.log_files['error'], logging.ERROR)
+        auth_handler = self._rotating_handler(self.log_files['auth'], logging.INFO)
+        app_handler.addFilter(_SubsystemFilter('auth', exclude=True))
+        error_handler.addFilter(_SubsystemFilter('auth', exclude=True))
+        auth_handler.addFilter(_SubsystemFilter('auth'))
 
-        # Handler específico para errores
-        error_handler = RotatingFileHandler(
-            self.log_files['error'],
-            maxBytes=self.rotation_config['max_bytes'],
-            backupCount=self.rotation_config['backup_count'],
-            encoding='utf-8'
-        )
-        error_handler.setLevel(logging.ERROR)
-        error_handler.setFormatter(self.log_format)
-        logger.addHandler(error_handler)
+        # Eventos estructurados (tiempos, hit/miss, tamaños) en líneas JSON, fuera del log de texto
+        events_handler = self._rotating_handler(self.log_files['events'], logging.DEBUG,
+                                                self.json_formatter)
+        events_handler.addFilter(_EventFilter())
+        app_handler.addFilter(_EventFilter(exclude=True))
+
+        return console_handler, app_handler, error_handler, auth_handler, events_handler
 
+    def start(self):
+        """Instalar el QueueHandler en el logger raíz y arrancar el hilo escritor (idempotente)"""
+        with self._lock:
+            if self.listener is not None:
+                return
+            self.listener = BatchQueueListener(self.queue, *self._build_handlers(),
+                                               batch_size=self.batch_size)
+            self.listener.start()
+            logging.getLogger().addHandler(EventQueueHandler(self.queue))
+            atexit.register(self.shutdown)
+
+    def shutdown(self):
+        """Escribir lo pendiente y detener el hilo escritor"""
+        with self._lock:
+            if self.listener is None:
+                return
+            root = logging.getLogger()
+            for handler in list(root.handlers):
+                if isinstance(handler, QueueHandler) and handler.queue is self.queue:
+                    root.removeHandler(handler)
+            self.listener.stop()
+            for handler in self.listener.handlers:
+                handler.close()
+            self.listener = None
+
+    def setup_logger(self, name: str, level: int = logging.INFO) -> logging.Logger:
+        """Configura un logger específico (los registros llegan a los archivos por el logger raíz)"""
+        self.start()
+        logger = logging.getLogger(name)
+        if logger.level == logging.NOTSET:
+            logger.setLevel(self._subsystem_level(name, level))
         return logger
 
+    def _subsystem_level(self, name, default):
+        """Nivel del subsistema más específico que contiene al logger"""
+        for prefix in sorted(self.subsystems, key=len, reverse=True):
+            if (name == prefix or name.startswith(prefix + '.')) and 'level' in self.subsystems[prefix]:
+                return self.subsystems[prefix]['level']
+        return default
+
     def setup_auth_logger(self) -> logging.Logger:
         """Configura logger específico para autenticación"""
-        logger = logging.getLogger('auth')
-        logger.setLevel(logging.INFO)
-
-        if logger.handlers:
-            return logger
+        return self.setup_logger('auth')
 
-        # Handler para archivo de auth
-        auth_handler = RotatingFileHandler(
-            self.log_files['auth'],
-            maxBytes=self.rotation_config['max_bytes'],
-            backupCount=self.rotation_config['backup_count'],
-            encoding='utf-8'
-        )
-        auth_handler.setLevel(logging.INFO)
-        auth_handler.setFormatter(self.log_format)
-        logger.addHandler(auth_handler)
-
-        return logger
 
 # Instancia global de configuración
 _logging_config = LoggingConfig()
@@ -113,4 +302,5 @@ def setup_logging():
     logging.getLogger('urllib3').setLevel(logging.WARNING)
     logging.getLogger('requests').setLevel(logging.WARNING)
 
+    _logging_config.start()
     return _logging_config
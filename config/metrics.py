@@ -0,0 +1,300 @@
+"""
+Métricas de rendimiento para CorAlertIntel
+Contadores, gauges e histogramas de latencia en memoria, con volcado en formato
+de texto de Prometheus y resumen para el panel de administración de cache
+"""
+import atexit
+import bisect
+import functools
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Límites de los buckets de latencia (segundos)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRICS_DUMP_PATH = "logs/metrics.prom"
+METRICS_DUMP_INTERVAL = 60     # Segundos entre volcados periódicos
+
+
+def _label_key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+               for _, value in pairs)
+    return "{" + ",".join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + "}"
+
+
+class _Metric:
+    type_name = "untyped"
+
+    def __init__(self, name, help_text=""):
+        self.name = name
+        self.help = help_text
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def series(self):
+        """Copia de los valores por combinación de etiquetas"""
+        with self._lock:
+            return dict(self._values)
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    """Contador monótono por etiquetas"""
+    type_name = "counter"
+
+    def inc(self, amount=1.0, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(_label_key(labels), 0.0)
+
+    def render(self):
+        return [f"{self.name}{_format_labels(key)} {value}" for key, value in self.series().items()]
+
+
+class Gauge(_Metric):
+    """Valor instantáneo por etiquetas"""
+    type_name = "gauge"
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[_label_key(labels)] = float(value)
+
+    def inc(self, amount=1.0, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels):
+        with self._lock:
+            return self._values.get(_label_key(labels), 0.0)
+
+    def render(self):
+        return [f"{self.name}{_format_labels(key)} {value}" for key, value in self.series().items()]
+
+
+class Histogram(_Metric):
+    """Histograma de buckets fijos (conteos por bucket, suma y cantidad) por etiquetas"""
+    type_name = "histogram"
+
+    def __init__(self, name, help_text="", buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"counts": [0] * (len(self.buckets) + 1),
+                                             "sum": 0.0, "count": 0}
+            state["counts"][index] += 1
+            state["sum"] += value
+            state["count"] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Medir la duración de un bloque: with histogram.time(api="Windy"): ..."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def series(self):
+        with self._lock:
+            return {key: {"counts": list(state["counts"]), "sum": state["sum"], "count": state["count"]}
+                    for key, state in self._values.items()}
+
+    def quantile(self, q, state):
+        """Cuantil estimado interpolando dentro del bucket (como histogram_quantile)"""
+        if state["count"] == 0:
+            return None
+        rank = q * state["count"]
+        cumulative = 0
+        for i, count in enumerate(state["counts"]):
+            if cumulative + count >= rank and count > 0:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-1]
+
+    def render(self):
+        lines = []
+        for key, state in self.series().items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), state["counts"]):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(key, [('le', le)])} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {state['sum']}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {state['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    """Registro de métricas del proceso"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self._dump_thread = None
+        self._dump_stop = threading.Event()
+
+    def _get_or_create(self, cls, name, help_text, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"La métrica {name} ya existe como {metric.type_name}")
+            return metric
+
+    def counter(self, name, help_text=""):
+        return self._get_or_create(Counter, name, help_text)
+
+    def gauge(self, name, help_text=""):
+        return self._get_or_create(Gauge, name, help_text)
+
+    def histogram(self, name, help_text="", buckets=DEFAULT_BUCKETS):
+        return self._get_or_create(Histogram, name, help_text, buckets=buckets)
+
+    def metrics(self):
+        with self._lock:
+            return list(self._metrics.values())
+
+    def render_prometheus(self):
+        """Todas las métricas en formato de texto de Prometheus"""
+        lines = []
+        for metric in self.metrics():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path=METRICS_DUMP_PATH):
+        """Escribir las métricas en un archivo (reemplazo atómico, apto para node_exporter textfile)"""
+        try:
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(path.name + ".tmp")
+            tmp_path.write_text(self.render_prometheus(), encoding="utf-8")
+            os.replace(tmp_path, path)
+            return True
+        except OSError as e:
+            logger.error(f"Error volcando métricas en {path}: {e}")
+            return False
+
+    def start_periodic_dump(self, path=METRICS_DUMP_PATH, interval=METRICS_DUMP_INTERVAL):
+        """Volcar las métricas cada `interval` segundos desde un hilo en segundo plano (idempotente)"""
+        with self._lock:
+            if self._dump_thread is not None:
+                return
+
+            def run():
+                while not self._dump_stop.wait(interval):
+                    self.dump(path)
+
+            self._dump_thread = threading.Thread(target=run, name="metrics-dump", daemon=True)
+            self._dump_thread.start()
+        atexit.register(self.dump, path)
+
+    def summary(self):
+        """
+        Resumen tabular de todas las series
+
+        Returns:
+            Lista de dicts con metric, type, labels y count/value, mean, p50, p95 (histogramas en ms)
+        """
+        rows = []
+        for metric in self.metrics():
+            for key, state in metric.series().items():
+                row = {"metric": metric.name, "type": metric.type_name,
+                       "labels": ", ".join(f"{name}={value}" for name, value in key)}
+                if isinstance(metric, Histogram):
+                    row.update({
+                        "count": state["count"],
+                        "mean_ms": 1000 * state["sum"] / state["count"] if state["count"] else None,
+                        "p50_ms": _to_ms(metric.quantile(0.5, state)),
+                        "p95_ms": _to_ms(metric.quantile(0.95, state)),
+                    })
+                else:
+                    row["value"] = state
+                rows.append(row)
+        return rows
+
+    def reset(self):
+        for metric in self.metrics():
+            metric.reset()
+
+
+def _to_ms(seconds):
+    return None if seconds is None else 1000 * seconds
+
+
+# Registro compartido por todo el proceso
+METRICS = MetricsRegistry()
+
+# Métricas instrumentadas en la aplicación
+API_REQUEST_SECONDS = METRICS.histogram(
+    "coralert_api_request_seconds", "Latencia de las llamadas a APIs meteorológicas")
+API_REQUESTS_TOTAL = METRICS.counter(
+    "coralert_api_requests_total", "Llamadas a APIs meteorológicas por resultado")
+CACHE_OPERATION_SECONDS = METRICS.histogram(
+    "coralert_cache_operation_seconds", "Latencia de joblib.load/dump en CacheManager")
+CACHE_REQUESTS_TOTAL = METRICS.counter(
+    "coralert_cache_requests_total", "Lecturas de CacheManager por resultado (hit, miss, expired, error)")
+PREDICTION_SECONDS = METRICS.histogram(
+    "coralert_prediction_seconds", "Duración de preparación, entrenamiento e inferencia de predicciones")
+ALERT_EVALUATION_SECONDS = METRICS.histogram(
+    "coralert_alert_evaluation_seconds", "Duración de detección de anomalías y generación de alertas")
+ALERTS_TOTAL = METRICS.counter(
+    "coralert_alerts_total", "Alertas generadas por severidad")
+MAP_RENDER_SECONDS = METRICS.histogram(
+    "coralert_map_render_seconds", "Duración del render del mapa interactivo")
+
+
+def timed(histogram, **labels):
+    """Decorador que registra la duración de cada llamada en un histograma"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with histogram.time(**labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def cache_hit_rates():
+    """Tasa de aciertos de CacheManager por tipo (model/data)"""
+    totals = {}
+    for key, count in CACHE_REQUESTS_TOTAL.series().items():
+        labels = dict(key)
+        kind = totals.setdefault(labels.get("kind", ""), {"hits": 0.0, "total": 0.0})
+        kind["total"] += count
+        if labels.get("outcome") == "hit":
+            kind["hits"] += count
+    return {kind: (v["hits"] / v["total"] if v["total"] else None) for kind, v in totals.items()}
@@ -0,0 +1,132 @@
+"""
+Logging estructurado para CorAlertIntel
+Eventos en líneas JSON (tiempos, hit/miss de cache, tamaños) con muestreo por evento;
+el mensaje se serializa recién en el hilo escritor del logging
+"""
+import itertools
+import json
+import logging
+import os
+from datetime import datetime
+
+# Fracción de eventos registrados por tipo (1.0 = todos); los WARNING o superiores nunca se muestrean
+# Se puede sobreescribir con CORALERT_LOG_SAMPLING="cache.load=0.01,weather.fetch=1"
+EVENT_SAMPLE_RATES = {
+    'cache.load': 0.1,
+    'weather.fetch': 0.2,
+}
+
+# Atributos estándar de LogRecord (no se copian al JSON como campos)
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class EventSampler:
+    """Muestreo determinista 1 de cada N por evento"""
+
+    def __init__(self, rates=None):
+        self.rates = dict(EVENT_SAMPLE_RATES if rates is None else rates)
+        self._counters = {}
+        self._load_env_rates()
+
+    def _load_env_rates(self):
+        for item in os.environ.get('CORALERT_LOG_SAMPLING', '').split(','):
+            event, _, rate = item.partition('=')
+            try:
+                if event.strip():
+                    self.rates[event.strip()] = float(rate)
+            except ValueError:
+                continue
+
+    def set_rate(self, event, rate):
+        self.rates[event] = float(rate)
+
+    def rate(self, event):
+        return self.rates.get(event, 1.0)
+
+    def should_log(self, event, rate=None):
+        """True para el primer evento y luego uno de cada round(1/rate)"""
+        rate = self.rate(event) if rate is None else rate
+        if rate >= 1.0:
+            return True
+        if rate <= 0.0:
+            return False
+        counter = self._counters.get(event)
+        if counter is None:
+            counter = self._counters.setdefault(event, itertools.count())
+        # next() sobre itertools.count es atómico bajo el GIL
+        return next(counter) % max(int(round(1.0 / rate)), 1) == 0
+
+
+class _EventMessage:
+    """Mensaje de texto de un evento, armado solo si un handler de texto lo necesita"""
+
+    __slots__ = ('event', 'fields')
+
+    def __init__(self, event, fields):
+        self.event = event
+        self.fields = fields
+
+    def __str__(self):
+        fields = ' '.join(f'{key}={value}' for key, value in self.fields.items())
+        return f'{self.event} {fields}'.rstrip()
+
+
+_sampler = EventSampler()
+
+
+def get_event_sampler():
+    """Obtener el muestreador de eventos compartido por todo el proceso"""
+    return _sampler
+
+
+def log_event(logger, event, level=logging.INFO, sample_rate=None, **fields):
+    """
+    Registrar un evento estructurado
+
+    Si el nivel no está habilitado o el evento queda fuera de la muestra no se
+    construye ningún registro; los campos se serializan recién al escribir.
+
+    Args:
+        logger: Logger de origen
+        event: Nombre del evento, ej. "cache.load"
+        level: Nivel de logging
+        sample_rate: Fracción a registrar (None = la configurada para el evento)
+        **fields: Campos del evento (valores simples: str, números, bool, None)
+
+    Returns:
+        True si el evento se registró
+    """
+    if not logger.isEnabledFor(level):
+        return False
+    rate = 1.0 if level >= logging.WARNING else (_sampler.rate(event) if sample_rate is None else sample_rate)
+    if not _sampler.should_log(event, rate):
+        return False
+    logger.log(level, '%s', _EventMessage(event, fields),
+               extra={'event': event, 'fields': fields, 'sample_rate': rate})
+    return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Una línea JSON por registro: ts, level, logger y el evento con sus campos (o el mensaje)"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+        }
+        event = getattr(record, 'event', None)
+        if event is not None:
+            entry['event'] = event
+            entry.update(record.fields)
+            if record.sample_rate < 1.0:
+                entry['sample_rate'] = record.sample_rate
+        else:
+            entry['message'] = record.getMessage()
+            entry.update({key: value for key, value in vars(record).items()
+                          if key not in _RECORD_ATTRIBUTES})
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
@@ -0,0 +1,4 @@
+"""
+Paquete geoespacial para CorAlertMet Intelligence
+Índices espaciales, clustering y utilidades de mapa
+"""
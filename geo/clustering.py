@@ -0,0 +1,146 @@
+"""
+Clustering de estaciones en servidor para CorAlertMet Intelligence
+Agrupa por grilla en píxeles Web Mercator y recorta al viewport visible
+"""
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+TILE_SIZE = 256          # Píxeles por tile en Web Mercator
+DEFAULT_CELL_SIZE = 60   # Tamaño de celda de agrupamiento en píxeles de pantalla
+MAX_MERCATOR_LAT = 85.05112878
+
+# (sur, oeste, norte, este) en grados
+Bounds = Tuple[float, float, float, float]
+
+
+def project_to_pixels(lat, lon, zoom: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Proyectar lat/lon a coordenadas de píxel Web Mercator para un nivel de zoom
+
+    Returns:
+        Tupla (x, y) de arrays en píxeles absolutos del mundo
+    """
+    lat = np.clip(np.asarray(lat, dtype=float), -MAX_MERCATOR_LAT, MAX_MERCATOR_LAT)
+    lon = np.asarray(lon, dtype=float)
+    scale = TILE_SIZE * 2.0 ** zoom
+
+    sin_lat = np.sin(np.radians(lat))
+    x = (lon + 180.0) / 360.0 * scale
+    y = (0.5 - np.log((1 + sin_lat) / (1 - sin_lat)) / (4 * np.pi)) * scale
+    return x, y
+
+
+def parse_leaflet_bounds(bounds: Optional[Dict]) -> Optional[Bounds]:
+    """
+    Convertir los bounds devueltos por st_folium ({"_southWest": ..., "_northEast": ...})
+    """
+    try:
+        south_west, north_east = bounds["_southWest"], bounds["_northEast"]
+        return (float(south_west["lat"]), float(south_west["lng"]),
+                float(north_east["lat"]), float(north_east["lng"]))
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+class GridClusterIndex:
+    """
+    Índice de estaciones para consultas por viewport y clustering por grilla
+
+    Las estaciones se ordenan por longitud una sola vez; cada consulta de viewport
+    usa búsqueda binaria sobre ese eje y filtra latitud solo sobre los candidatos
+    """
+
+    def __init__(self, lats: Sequence[float], lons: Sequence[float]):
+        """
+        Args:
+            lats: Latitudes de las estaciones
+            lons: Longitudes de las estaciones (mismo orden que lats)
+        """
+        self.lats = np.asarray(lats, dtype=float)
+        self.lons = np.asarray(lons, dtype=float)
+        self._order = np.argsort(self.lons, kind="stable")
+        self._sorted_lons = self.lons[self._order]
+
+    def __len__(self) -> int:
+        return len(self.lats)
+
+    def query_viewport(self, bounds: Optional[Bounds] = None, padding: float = 0.1) -> np.ndarray:
+        """
+        Índices de las estaciones dentro del viewport (con margen relativo)
+
+        Args:
+            bounds: (sur, oeste, norte, este); None devuelve todas las estaciones
+            padding: Margen agregado a cada lado como fracción del alto/ancho
+
+        Returns:
+            Array de índices en el orden original
+        """
+        if bounds is None:
+            return np.arange(len(self))
+
+        south, west, north, east = bounds
+        lat_pad = (north - south) * padding
+        lon_pad = (east - west) * padding
+
+        lo = np.searchsorted(self._sorted_lons, west - lon_pad, side="left")
+        hi = np.searchsorted(self._sorted_lons, east + lon_pad, side="right")
+        candidates = self._order[lo:hi]
+
+        candidate_lats = self.lats[candidates]
+        inside = (candidate_lats >= south - lat_pad) & (candidate_lats <= north + lat_pad)
+        return np.sort(candidates[inside])
+
+    def cluster(self, zoom: float, bounds: Optional[Bounds] = None,
+                cell_size: int = DEFAULT_CELL_SIZE,
+                min_cluster_size: int = 2) -> Tuple[np.ndarray, List[Dict]]:
+        """
+        Agrupar las estaciones visibles en celdas de cell_size píxeles al zoom dado
+
+        La cantidad de salidas queda acotada por el tamaño de pantalla / cell_size,
+        no por el tamaño de la red
+
+        Returns:
+            Tupla (índices de estaciones sueltas, lista de clusters con
+            lat, lon, count e indices)
+        """
+        visible = self.query_viewport(bounds)
+        if len(visible) == 0:
+            return visible, []
+
+        x, y = project_to_pixels(self.lats[visible], self.lons[visible], zoom)
+        cells = np.stack([np.floor(x / cell_size), np.floor(y / cell_size)], axis=1).astype(np.int64)
+        _, cell_ids, counts = np.unique(cells, axis=0, return_inverse=True, return_counts=True)
+        cell_ids = cell_ids.ravel()
+
+        point_counts = counts[cell_ids]
+        singles = visible[point_counts < min_cluster_size]
+
+        clustered = point_counts >= min_cluster_size
+        if not clustered.any():
+            return singles, []
+
+        # Centroides por celda con bincount (sin bucles por estación)
+        lat_sums = np.bincount(cell_ids, weights=self.lats[visible], minlength=len(counts))
+        lon_sums = np.bincount(cell_ids, weights=self.lons[visible], minlength=len(counts))
+
+        order = np.argsort(cell_ids[clustered], kind="stable")
+        members = visible[clustered][order]
+        member_cells = cell_ids[clustered][order]
+        boundaries = np.flatnonzero(np.diff(member_cells)) + 1
+
+        clusters = []
+        for start, group in zip(np.r_[0, boundaries], np.split(members, boundaries)):
+            cell = member_cells[start]
+            clusters.append({
+                "lat": float(lat_sums[cell] / counts[cell]),
+                "lon": float(lon_sums[cell] / counts[cell]),
+                "count": int(counts[cell]),
+                "indices": group
+            })
+
+        return singles, clusters
@@ -0,0 +1,129 @@
+"""
+Interpolación espacial para CorAlertMet Intelligence
+Inverse Distance Weighting (IDW) vectorizado sobre grilla regular con vecinos por KDTree
+"""
+import base64
+import io
+import logging
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+from sklearn.neighbors import KDTree
+
+# Pillow (dependencia de Streamlit) codifica PNG más rápido que el encoder de folium
+try:
+    from PIL import Image
+    PIL_AVAILABLE = True
+except ImportError:
+    PIL_AVAILABLE = False
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Extensión aproximada de la provincia de Córdoba: (sur, oeste, norte, este)
+CORDOBA_BOUNDS = (-35.0, -65.8, -29.5, -61.8)
+
+DEFAULT_GRID_SIZE = 512
+DEFAULT_NEIGHBORS = 8
+DEFAULT_POWER = 2.0
+
+
+class IDWInterpolator:
+    """
+    Interpolador IDW con geometría precalculada
+
+    Los vecinos y pesos de cada celda dependen solo de la posición de las estaciones
+    y de la grilla, así que se calculan una vez; cada interpolación posterior es un
+    gather + suma ponderada sobre arrays (grid_size x grid_size x k)
+    """
+
+    def __init__(self, lats: Sequence[float], lons: Sequence[float],
+                 bounds: Tuple[float, float, float, float] = CORDOBA_BOUNDS,
+                 grid_size: int = DEFAULT_GRID_SIZE,
+                 neighbors: int = DEFAULT_NEIGHBORS,
+                 power: float = DEFAULT_POWER):
+        """
+        Args:
+            lats, lons: Posición de las estaciones
+            bounds: Extensión de la grilla (sur, oeste, norte, este)
+            grid_size: Celdas por lado (la grilla es grid_size x grid_size)
+            neighbors: Cantidad de estaciones más cercanas por celda
+            power: Exponente de la distancia en los pesos (1 / d^power)
+        """
+        self.bounds = bounds
+        self.grid_size = grid_size
+        self.n_stations = len(lats)
+        if self.n_stations == 0:
+            raise ValueError("Se necesita al menos una estación para interpolar")
+
+        south, west, north, east = bounds
+        # Distancias equirectangulares: la longitud se escala por cos(latitud media)
+        self._lon_scale = np.cos(np.radians((south + north) / 2))
+
+        station_points = np.column_stack([
+            np.asarray(lats, dtype=float),
+            np.asarray(lons, dtype=float) * self._lon_scale
+        ])
+
+        # Fila 0 = norte (origen "upper" de la imagen)
+        grid_lats = np.linspace(north, south, grid_size)
+        grid_lons = np.linspace(west, east, grid_size)
+        lon_mesh, lat_mesh = np.meshgrid(grid_lons * self._lon_scale, grid_lats)
+        grid_points = np.column_stack([lat_mesh.ravel(), lon_mesh.ravel()])
+
+        k = min(neighbors, self.n_stations)
+        distances, self._indices = KDTree(station_points).query(grid_points, k=k)
+
+        # Evitar división por cero en celdas que coinciden con una estación
+        weights = 1.0 / np.maximum(distances, 1e-12) ** power
+        self._weights = weights / weights.sum(axis=1, keepdims=True)
+
+    def interpolate(self, values: Sequence[float]) -> np.ndarray:
+        """
+        Interpolar valores de estaciones sobre la grilla
+
+        Args:
+            values: Un valor por estación (mismo orden que lats/lons); NaN se ignora
+
+        Returns:
+            Array (grid_size, grid_size), fila 0 = norte
+        """
+        values = np.asarray(values, dtype=float)
+        if values.shape != (self.n_stations,):
+            raise ValueError("Se necesita un valor por estación")
+
+        neighbor_values = values[self._indices]
+        valid = ~np.isnan(neighbor_values)
+        weights = np.where(valid, self._weights, 0.0)
+        total = weights.sum(axis=1)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            grid = (np.where(valid, neighbor_values, 0.0) * weights).sum(axis=1) / total
+        grid[total == 0] = np.nan
+        return grid.reshape(self.grid_size, self.grid_size)
+
+    def leaflet_bounds(self) -> list:
+        """Extensión de la grilla en formato [[sur, oeste], [norte, este]] para ImageOverlay"""
+        south, west, north, east = self.bounds
+        return [[south, west], [north, east]]
+
+
+def render_png_data_url(rgba: np.ndarray, compress_level: int = 6) -> Optional[str]:
+    """
+    Codificar una imagen RGBA uint8 como PNG comprimido en data URL
+
+    Returns:
+        Data URL "data:image/png;base64,..." o None si falla la codificación
+    """
+    try:
+        if PIL_AVAILABLE:
+            buffer = io.BytesIO()
+            Image.fromarray(rgba, "RGBA").save(buffer, format="PNG", compress_level=compress_level)
+            png_bytes = buffer.getvalue()
+        else:
+            from folium.utilities import write_png
+            png_bytes = write_png(rgba)
+        return "data:image/png;base64," + base64.b64encode(png_bytes).decode("ascii")
+    except Exception as e:
+        logger.error(f"Error codificando imagen PNG: {e}")
+        return None
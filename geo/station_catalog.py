@@ -0,0 +1,154 @@
+"""
+Catálogo de estaciones aeronáuticas para CorAlertMet Intelligence
+Índices por código ICAO/IATA, por nombre (búsqueda por prefijo) y espacial (BallTree haversine)
+"""
+import csv
+import logging
+import unicodedata
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sklearn.neighbors import BallTree
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATIONS_FILE = Path(__file__).resolve().parent.parent / "data" / "stations.csv"
+EARTH_RADIUS_KM = 6371.0088
+
+
+def normalize_name(name: str) -> str:
+    """Normalizar nombre para búsqueda (minúsculas y sin acentos)"""
+    decomposed = unicodedata.normalize("NFKD", name or "")
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).lower().strip()
+
+
+class StationCatalog:
+    """
+    Catálogo de estaciones con índices por código, nombre y posición
+
+    - Código: dict ICAO/IATA -> estación (O(1))
+    - Nombre: lista ordenada de nombres normalizados (prefijo por búsqueda binaria)
+    - Espacial: BallTree con métrica haversine (vecino más cercano y radio en O(log n))
+    """
+
+    def __init__(self, stations: List[Dict[str, Any]]):
+        """
+        Args:
+            stations: Lista de dicts con icao, iata, display_name, name, lat, lon y type
+        """
+        self.stations = list(stations)
+        self.lats = np.array([s["lat"] for s in self.stations], dtype=float)
+        self.lons = np.array([s["lon"] for s in self.stations], dtype=float)
+
+        self._by_code: Dict[str, int] = {}
+        names = []
+        for i, station in enumerate(self.stations):
+            for code in (station.get("icao"), station.get("iata")):
+                if code:
+                    self._by_code.setdefault(code.upper(), i)
+            for name in {station.get("display_name"), station.get("name")}:
+                if name:
+                    names.append((normalize_name(name), i))
+
+        names.sort()
+        self._names = [name for name, _ in names]
+        self._name_ids = [i for _, i in names]
+
+        self._tree = None
+        if self.stations:
+            self._tree = BallTree(np.radians(np.column_stack([self.lats, self.lons])),
+                                  metric="haversine")
+
+    def __len__(self) -> int:
+        return len(self.stations)
+
+    @classmethod
+    def from_csv(cls, path=DEFAULT_STATIONS_FILE) -> "StationCatalog":
+        """Cargar el catálogo desde un CSV (icao, iata, display_name, name, lat, lon, type)"""
+        stations = []
+        try:
+            with open(path, "r", encoding="utf-8", newline="") as f:
+                for row in csv.DictReader(f):
+                    try:
+                        stations.append({
+                            "icao": row.get("icao") or None,
+                            "iata": row.get("iata") or None,
+                            "display_name": row.get("display_name") or row.get("name"),
+                            "name": row.get("name") or row.get("display_name"),
+                            "lat": float(row["lat"]),
+                            "lon": float(row["lon"]),
+                            "type": row.get("type") or "estacion"
+                        })
+                    except (KeyError, TypeError, ValueError) as e:
+                        logger.warning(f"Fila de estación inválida en {path}: {e}")
+        except OSError as e:
+            logger.error(f"Error cargando catálogo de estaciones {path}: {e}")
+
+        logger.info(f"Catálogo de estaciones cargado: {len(stations)} estaciones")
+        return cls(stations)
+
+    def get(self, code: str) -> Optional[Dict[str, Any]]:
+        """Buscar estación por código ICAO o IATA"""
+        if not code:
+            return None
+        index = self._by_code.get(code.upper())
+        return None if index is None else self.stations[index]
+
+    def find(self, query: str) -> Optional[Dict[str, Any]]:
+        """Buscar estación por código o por nombre exacto (sin distinguir acentos)"""
+        station = self.get(query)
+        if station is not None:
+            return station
+
+        key = normalize_name(query)
+        pos = bisect_left(self._names, key)
+        if pos < len(self._names) and self._names[pos] == key:
+            return self.stations[self._name_ids[pos]]
+        return None
+
+    def search_prefix(self, prefix: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Estaciones cuyo nombre comienza con el prefijo (búsqueda binaria)"""
+        key = normalize_name(prefix)
+        results, seen = [], set()
+        pos = bisect_left(self._names, key)
+        while pos < len(self._names) and self._names[pos].startswith(key) and len(results) < limit:
+            index = self._name_ids[pos]
+            if index not in seen:
+                seen.add(index)
+                results.append(self.stations[index])
+            pos += 1
+        return results
+
+    def nearest(self, lat: float, lon: float, k: int = 1) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Estaciones más cercanas a un punto
+
+        Returns:
+            Lista de tuplas (estación, distancia en km) ordenada por distancia
+        """
+        if self._tree is None:
+            return []
+        distances, indices = self._tree.query(np.radians([[lat, lon]]), k=min(k, len(self)))
+        return [(self.stations[i], float(d * EARTH_RADIUS_KM))
+                for d, i in zip(distances[0], indices[0])]
+
+    def within_radius(self, lat: float, lon: float,
+                      radius_km: float) -> List[Tuple[Dict[str, Any], float]]:
+        """Estaciones dentro de un radio (km), ordenadas por distancia"""
+        if self._tree is None:
+            return []
+        indices, distances = self._tree.query_radius(
+            np.radians([[lat, lon]]), r=radius_km / EARTH_RADIUS_KM,
+            return_distance=True, sort_results=True
+        )
+        return [(self.stations[i], float(d * EARTH_RADIUS_KM))
+                for d, i in zip(distances[0], indices[0])]
+
+    def center(self) -> Optional[Tuple[float, float]]:
+        """Centro (promedio) de las estaciones del catálogo"""
+        if not self.stations:
+            return None
+        return float(self.lats.mean()), float(self.lons.mean())
@@ -5,13 +5,15 @@
 
 import streamlit as st
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta
 import sys
 import os
 
 # Agregar el directorio raíz al path
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from cache.cache_manager import get_cache_stats, cleanup_cache, clear_all_cache
+from config.metrics import METRICS, METRICS_DUMP_PATH, cache_hit_rates
+from cache.model_history import get_model_history_log
 
 @st.cache_data(ttl=300, show_spinner=False)  # Cache 5 minutos para estadísticas de caché
 def show_cache_admin():
@@ -276,9 +278,117 @@ def show_maintenance_tab():
         - 💾 Hacer backup periódico
         """)
 
+def show_metrics_summary():
+    """Mostrar resumen de métricas de rendimiento (fuera del cache: siempre actualizado)"""
+    st.markdown("---")
+    st.subheader("📈 Métricas de Rendimiento")
+
+    summary = METRICS.summary()
+    if not summary:
+        st.info("Todavía no hay métricas registradas en este proceso")
+        return
+
+    # Tasa de aciertos de CacheManager por tipo
+    hit_rates = cache_hit_rates()
+    if hit_rates:
+        columns = st.columns(len(hit_rates))
+        for column, (kind, rate) in zip(columns, sorted(hit_rates.items())):
+            with column:
+                st.metric(
+                    label=f"🎯 Aciertos de cache ({kind})",
+                    value=f"{rate:.1%}" if rate is not None else "N/A",
+                    help="Lecturas de load_model/load_data servidas desde disco"
+                )
+
+    metrics_df = pd.DataFrame(summary)
+    latency = metrics_df[metrics_df["type"] == "histogram"]
+    if not latency.empty:
+        st.markdown("**Latencias (ms)**")
+        st.dataframe(
+            latency[["metric", "labels", "count", "mean_ms", "p50_ms", "p95_ms"]].rename(columns={
+                "metric": "Métrica",
+                "labels": "Etiquetas",
+                "count": "Muestras",
+                "mean_ms": "Media",
+                "p50_ms": "p50",
+                "p95_ms": "p95"
+            }).round(2),
+            use_container_width=True
+        )
+
+    counters = metrics_df[metrics_df["type"] != "histogram"]
+    if not counters.empty:
+        st.markdown("**Contadores**")
+        st.dataframe(
+            counters[["metric", "labels", "value"]].rename(columns={
+                "metric": "Métrica",
+                "labels": "Etiquetas",
+                "value": "Valor"
+            }),
+            use_container_width=True
+        )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button(
+            "⬇️ Descargar métricas (Prometheus)",
+            data=METRICS.render_prometheus(),
+            file_name="metrics.prom",
+            mime="text/plain"
+        )
+    with col2:
+        if st.button("💾 Volcar métricas a disco"):
+            if METRICS.dump():
+                st.success(f"Métricas guardadas en `{METRICS_DUMP_PATH}`")
+            else:
+                st.error("Error al guardar las métricas")
+
+def show_model_history():
+    """Mostrar uso de modelos por API desde el historial persistido"""
+    st.markdown("---")
+    st.subheader("🕑 Historial de Modelos")
+
+    history_log = get_model_history_log()
+    days = st.selectbox("Período:", [1, 7, 30], index=1, format_func=lambda d: f"Últimos {d} días",
+                        key="model_history_days")
+    since = datetime.now() - timedelta(days=days)
+
+    usage = history_log.usage_summary(since=since)
+    if not usage:
+        st.info("No hay modelos registrados en el período")
+        return
+
+    usage_df = pd.DataFrame(usage)
+    st.dataframe(
+        usage_df.rename(columns={
+            "api": "API",
+            "model": "Modelo",
+            "uses": "Usos",
+            "mean_accuracy": "Precisión media",
+            "last_used": "Último uso"
+        }).round(3),
+        use_container_width=True
+    )
+
+    api = st.selectbox("Consultas recientes de:", ["Todas"] + sorted(usage_df["api"].unique()),
+                       key="model_history_api")
+    entries = history_log.query(api=None if api == "Todas" else api, since=since, limit=50)
+    if entries:
+        st.dataframe(
+            pd.DataFrame(entries).rename(columns={
+                "timestamp": "Fecha",
+                "api": "API",
+                "model": "Modelo",
+                "accuracy": "Precisión"
+            }),
+            use_container_width=True
+        )
+
 def main():
     """Función principal"""
     show_cache_admin()
+    show_metrics_summary()
+    show_model_history()
 
 if __name__ == "__main__":
     main()
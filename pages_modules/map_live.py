@@ -3,6 +3,13 @@
 Mapa con 4 ubicaciones estratégicas para análisis meteorológico
 """
 
+import copy
+import hashlib
+import json
+import math
+from functools import lru_cache
+
+import numpy as np
 import streamlit as st
 import folium
 import requests
@@ -14,6 +21,20 @@
 # Importar componentes
 # from components.footer import show_footer
 from components.styles import apply_corporate_styles
+from cache.observation_store import get_observation_store
+from config.metrics import MAP_RENDER_SECONDS, timed
+from components.color_scales import (
+    COMBINED_TEMP_WIND_SCALE,
+    HUMIDITY_SCALE,
+    PRESSURE_SCALE,
+    TEMPERATURE_SCALE,
+    VISIBILITY_SCALE,
+    WIND_SCALE
+)
+from pages_modules.ml_models.storm_risk import DASHBOARD_STORM_ENGINE
+from geo.clustering import GridClusterIndex, parse_leaflet_bounds
+from geo.station_catalog import StationCatalog
+from geo.interpolation import IDWInterpolator, render_png_data_url
 
 # Configuración de la página
 st.set_page_config(
@@ -25,76 +46,62 @@
 # Aplicar estilos corporativos
 apply_corporate_styles()
 
+# A partir de esta cantidad de estaciones se usa por defecto la capa GeoJSON compacta
+GEOJSON_STATION_THRESHOLD = 200
+
+# A partir de esta cantidad de estaciones se agrupan y recortan al viewport por defecto
+CLUSTER_STATION_THRESHOLD = 100
+
+DEFAULT_MAP_ZOOM = 8
+
+# Capas interpoladas disponibles: nombre -> (variable, escala de color)
+INTERPOLATION_LAYERS = {
+    "Temperatura": ("temperature", TEMPERATURE_SCALE),
+    "Viento": ("wind_speed", WIND_SCALE),
+    "Presión": ("pressure", PRESSURE_SCALE)
+}
+
+# Paso de cuantización de la dirección del viento (grados) para reutilizar SVG memoizados
+DIRECTION_STEP = 5
+
+@st.cache_resource(show_spinner=False)
+def get_station_catalog() -> StationCatalog:
+    """
+    Catálogo de estaciones aeronáuticas (ICAO/IATA) indexado, cargado una vez por proceso
+    """
+    return StationCatalog.from_csv()
+
 def get_aeronautical_coordinates(location_name):
     """
     Obtiene coordenadas usando códigos aeronáuticos ICAO/IATA
-    Basado en datos oficiales del SMN y OACI
-    """
-    # Base de datos de aeropuertos de Córdoba con códigos oficiales
-    aeronautical_db = {
-        "Córdoba Centro": {
-            "icao": None,
-            "iata": None,
-            "lat": -31.4201,
-            "lon": -64.1888,
-            "name": "Plaza San Martín, Córdoba",
-            "type": "ciudad"
-        },
-        "Aeropuerto SACO/COR": {
-            "icao": "SACO",
-            "iata": "COR",
-            "lat": -31.3236,
-            "lon": -64.2079,
-            "name": "Aeropuerto Internacional Ingeniero Ambrosio L.V. Taravella",
-            "type": "aeropuerto"
-        },
-        "Río Cuarto": {
-            "icao": "SAOC",
-            "iata": "RCU",
-            "lat": -33.1303,
-            "lon": -64.3499,
-            "name": "Aeropuerto Río Cuarto",
-            "type": "aeropuerto"
-        },
-        "Altagracia": {
-            "icao": "SAGR",
-            "iata": None,
-            "lat": -31.6500,
-            "lon": -64.3500,
-            "name": "Altagracia",
-            "type": "localidad"
-        },
-        "Villa María": {
-            "icao": "SACV",
-            "iata": "VME",
-            "lat": -32.3206,
-            "lon": -63.2264,
-            "name": "Aeropuerto Villa María",
-            "type": "aeropuerto"
-        },
-        "San Francisco": {
-            "icao": "SANS",
-            "iata": "SFN",
-            "lat": -31.4278,
-            "lon": -62.0831,
-            "name": "Aeropuerto San Francisco",
-            "type": "aeropuerto"
-        }
+    Basado en datos oficiales del SMN y OACI (catálogo data/stations.csv)
+    """
+    station = get_station_catalog().find(location_name)
+    if station is None:
+        return None
+
+    return {
+        "lat": station["lat"],
+        "lon": station["lon"],
+        "source": "SMN/OACI",
+        "icao": station.get("icao"),
+        "iata": station.get("iata"),
+        "name": station["name"],
+        "type": station["type"]
     }
 
-    if location_name in aeronautical_db:
-        location_data = aeronautical_db[location_name]
-        return {
-            "lat": location_data["lat"],
-            "lon": location_data["lon"],
-            "source": "SMN/OACI",
-            "icao": location_data.get("icao"),
-            "iata": location_data.get("iata"),
-            "name": location_data["name"],
-            "type": location_data["type"]
-        }
+def get_nearest_aerodrome(lat: float, lon: float) -> tuple:
+    """
+    Aeródromo más cercano a un punto (búsqueda espacial, sin API de geocoding)
 
-    return None
+    Returns:
+        Tupla (estación, distancia en km) o (None, None) si no hay aeródromos
+    """
+    catalog = get_station_catalog()
+    for station, distance in catalog.nearest(lat, lon, k=min(len(catalog), 10)):
+        if station.get("icao"):
+            return station, distance
+    return None, None
 
 @st.cache_data(ttl=900, show_spinner=False)  # Cache 15 minutos para datos meteorológicos
 def get_weather_data_windy(lat, lon):
@@ -126,16 +133,7 @@ def get_temp_color(temp: float) -> str:
     """
     Obtiene color según temperatura
     """
-    if temp < 10:
-        return "blue"      # Muy frío
-    elif temp < 20:
-        return "lightblue" # Frío
-    elif temp < 25:
-        return "green"     # Templado
-    elif temp < 30:
-        return "orange"    # Caliente
-    else:
-        return "red"       # Muy caliente
+    return TEMPERATURE_SCALE(temp)
 
 def get_combined_temp_wind_color(temp: float, wind_speed: float) -> str:
     """
@@ -145,71 +143,16 @@ def get_combined_temp_wind_color(temp: float, wind_speed: float) -> str:
     Azul = Baja temperatura + Viento suave
     Amarillo = Temperatura alta + Viento suave
     Naranja = Temperatura normal + Viento intenso
-    """
-    # Clasificar temperatura
-    if temp < 10:
-        temp_level = "cold"  # Frío
-    elif temp < 20:
-        temp_level = "cool"  # Fresco
-    elif temp < 25:
-        temp_level = "normal"  # Normal
-    elif temp < 30:
-        temp_level = "warm"  # Cálido
-    else:
-        temp_level = "hot"  # Caliente
 
-    # Clasificar viento
-    if wind_speed < 10:
-        wind_level = "calm"  # Calmado
-    elif wind_speed < 20:
-        wind_level = "moderate"  # Moderado
-    else:
-        wind_level = "strong"  # Fuerte
-
-    # Combinar colores según temperatura y viento
-    if temp_level == "hot" and wind_level == "strong":
-        return "#DC2626"  # Rojo intenso - Alta temp + Viento fuerte
-    elif temp_level == "hot" and wind_level == "moderate":
-        return "#EF4444"  # Rojo - Alta temp + Viento moderado
-    elif temp_level == "hot" and wind_level == "calm":
-        return "#F59E0B"  # Amarillo - Alta temp + Viento calmado
-    elif temp_level == "warm" and wind_level == "strong":
-        return "#EA580C"  # Naranja - Temp cálida + Viento fuerte
-    elif temp_level == "warm" and wind_level == "moderate":
-        return "#F97316"  # Naranja claro - Temp cálida + Viento moderado
-    elif temp_level == "warm" and wind_level == "calm":
-        return "#F59E0B"  # Amarillo - Temp cálida + Viento calmado
-    elif temp_level == "normal" and wind_level == "strong":
-        return "#059669"  # Verde oscuro - Temp normal + Viento fuerte
-    elif temp_level == "normal" and wind_level == "moderate":
-        return "#10B981"  # Verde - Temp normal + Viento moderado
-    elif temp_level == "normal" and wind_level == "calm":
-        return "#22C55E"  # Verde claro - Temp normal + Viento calmado
-    elif temp_level == "cool" and wind_level == "strong":
-        return "#0891B2"  # Cian - Temp fresca + Viento fuerte
-    elif temp_level == "cool" and wind_level == "moderate":
-        return "#06B6D4"  # Cian claro - Temp fresca + Viento moderado
-    elif temp_level == "cool" and wind_level == "calm":
-        return "#67E8F9"  # Cian muy claro - Temp fresca + Viento calmado
-    elif temp_level == "cold" and wind_level == "strong":
-        return "#1E40AF"  # Azul oscuro - Temp fría + Viento fuerte
-    elif temp_level == "cold" and wind_level == "moderate":
-        return "#3B82F6"  # Azul - Temp fría + Viento moderado
-    else:  # cold + calm
-        return "#60A5FA"  # Azul claro - Temp fría + Viento calmado
+    Acepta escalares o arrays (tabla 5x3 indexada con np.searchsorted)
+    """
+    return COMBINED_TEMP_WIND_SCALE(temp, wind_speed)
 
 def get_wind_color(speed: float) -> str:
     """
     Obtiene color según velocidad del viento
     """
-    if speed < 10:
-        return "green"     # Viento suave
-    elif speed < 20:
-        return "yellow"    # Viento moderado
-    elif speed < 30:
-        return "orange"    # Viento fuerte
-    else:
-        return "red"       # Viento muy fuerte
+    return WIND_SCALE(speed)
 
 def get_wind_direction_arrow(direction: int) -> str:
     """
@@ -236,47 +179,21 @@ def get_pressure_color(pressure: float) -> str:
     """
     Obtiene color según presión atmosférica
     """
-    if pressure < 1000:
-        return "red"       # Baja presión (tormenta)
-    elif pressure < 1010:
-        return "orange"    # Presión moderadamente baja
-    elif pressure < 1020:
-        return "yellow"    # Presión normal
-    elif pressure < 1030:
-        return "lightgreen" # Presión moderadamente alta
-    else:
-        return "blue"      # Alta presión (anticiclón)
+    return PRESSURE_SCALE(pressure)
 
 def get_humidity_color(humidity: float) -> str:
     """
     Obtiene color según humedad relativa
     """
-    if humidity < 30:
-        return "blue"      # Muy seco (azul)
-    elif humidity < 50:
-        return "lightblue" # Seco (azul claro)
-    elif humidity < 70:
-        return "green"     # Normal (verde)
-    elif humidity < 85:
-        return "orange"    # Húmedo (naranja)
-    else:
-        return "red"       # Muy húmedo (rojo - niebla)
+    return HUMIDITY_SCALE(humidity)
 
 def get_visibility_color(visibility: float) -> str:
     """
     Obtiene color según visibilidad
     """
-    if visibility < 1:
-        return "red"       # Niebla densa
-    elif visibility < 3:
-        return "orange"    # Niebla moderada
-    elif visibility < 5:
-        return "yellow"    # Niebla ligera
-    elif visibility < 10:
-        return "lightgreen" # Visibilidad reducida
-    else:
-        return "green"     # Visibilidad excelente
+    return VISIBILITY_SCALE(visibility)
 
+@lru_cache(maxsize=128)
 def get_location_icon_svg(
     icon_type: str = "location",
     size: int = 16,
@@ -324,14 +241,16 @@ def get_location_icon_svg(
     }
     return icons.get(icon_type, icons["location"])
 
+def quantize_direction(direction: float) -> int:
+    """
+    Redondea la dirección del viento al múltiplo de DIRECTION_STEP más cercano (0-355)
+    """
+    return int(round(direction / DIRECTION_STEP) * DIRECTION_STEP) % 360
+
 def create_wind_arrow_svg(wind_direction: int, wind_speed: float, size: int = 24) -> str:
     """
     Crea una flecha SVG que indica la dirección del viento
     """
-    # Calcular el ángulo de rotación (wind_direction ya viene en grados)
-    # El viento sopla HACIA la dirección indicada
-    rotation_angle = wind_direction
-
     # Determinar color según intensidad del viento
     if wind_speed < 10:
         arrow_color = "#10B981"  # Verde - viento suave
@@ -342,6 +261,14 @@ def create_wind_arrow_svg(wind_direction: int, wind_speed: float, size: int = 24
     else:
         arrow_color = "#7C2D12"  # Marrón - viento muy fuerte
 
+    # El viento sopla HACIA la dirección indicada (cuantizada para reutilizar el SVG)
+    return _wind_arrow_svg(quantize_direction(wind_direction), arrow_color, size)
+
+@lru_cache(maxsize=512)
+def _wind_arrow_svg(rotation_angle: int, arrow_color: str, size: int) -> str:
+    """
+    SVG de flecha de viento memoizado por (dirección cuantizada, color, tamaño)
+    """
     # Crear SVG de flecha
     arrow_svg = f"""
 <svg width = (
@@ -379,6 +306,14 @@ def create_wind_barb_enhanced(wind_speed: float, wind_direction: int) -> str:
     full_plumes = int(wind_knots // 10)
     half_plume = int((wind_knots % 10) >= 5)
 
+    # El SVG solo depende de (plumas, media pluma, color)
+    return _wind_barb_enhanced_svg(full_plumes, half_plume, color)
+
+@lru_cache(maxsize=256)
+def _wind_barb_enhanced_svg(full_plumes: int, half_plume: int, color: str) -> str:
+    """
+    SVG de wind barb mejorado memoizado por clase de intensidad
+    """
     # Crear wind barb SVG
     barb_svg = f"""
     <svg width="40" height="20" viewBox="0 0 40 20" fill="none" xmlns="http://www.w3.org/2000/svg">
@@ -464,6 +399,13 @@ def create_simple_wind_barb(wind_speed: float, wind_direction: int) -> str:
     full_barbs = int(wind_knots // 10)
     half_barb = int((wind_knots % 10) // 5)
 
+    return _simple_wind_barb_svg(full_barbs, half_barb, quantize_direction(wind_direction), color)
+
+@lru_cache(maxsize=1024)
+def _simple_wind_barb_svg(full_barbs: int, half_barb: int, wind_direction: int, color: str) -> str:
+    """
+    SVG de wind barb simple memoizado por (plumas, dirección cuantizada, color)
+    """
     # Crear SVG simple
     barb_svg = f"""
     <svg width="40" height="40" viewBox="0 0 40 40" xmlns="http://www.w3.org/2000/svg">
@@ -482,6 +424,7 @@ def create_simple_wind_barb(wind_speed: float, wind_direction: int) -> str:
 
     return barb_svg
 
+@lru_cache(maxsize=1024)
 def create_barb_lines(full_barbs: int, half_barb: int, direction: int, color: str) -> str:
     """
     Crea las líneas de las plumas del wind barb
@@ -561,6 +504,379 @@ def get_coordinates_from_api(
         st.error(f"❌ Error obteniendo coordenadas para {location_name}: {e}")
         return None
 
+def feed_map_observations(locations: dict) -> list:
+    """
+    Enviar las observaciones de las estaciones como micro-lote al detector en streaming
+    """
+    observations = [
+        {**data["weather"], "station": name}
+        for name, data in locations.items()
+        if data.get("weather")
+    ]
+    if not observations:
+        return []
+
+    try:
+        from ml_models.intelligent_alerts import feed_streaming_observations
+    except ImportError:
+        return []
+
+    return feed_streaming_observations(observations)
+
+def record_map_observations(locations: dict) -> int:
+    """
+    Registrar las lecturas de las estaciones en el historial de observaciones
+    """
+    store = get_observation_store()
+    return sum(
+        store.append(name, data["weather"])
+        for name, data in locations.items()
+        if data.get("weather")
+    )
+
+def show_storm_risk_ranking(locations: dict) -> None:
+    """
+    Mostrar estaciones ordenadas por probabilidad de tormenta (motor vectorizado)
+    """
+    observations = [
+        {**data["weather"], "station": name}
+        for name, data in locations.items()
+        if data.get("weather")
+    ]
+    if not observations:
+        st.info("Sin datos meteorológicos para calcular el riesgo")
+        return
+
+    import pandas as pd
+
+    ranking = DASHBOARD_STORM_ENGINE.rank(pd.DataFrame(observations), id_column="station")
+    st.dataframe(
+        ranking.rename(columns={
+            "station": "Ubicación",
+            "probability": "Probabilidad (%)",
+            "level": "Nivel de Alerta"
+        }),
+        use_container_width=True
+    )
+
+def build_weather_popup(name: str, weather: dict, icon_type: str) -> str:
+    """
+    Construye el popup HTML con todos los datos meteorológicos de una ubicación
+    """
+    temp = weather["temperature"]
+    wind_speed = weather["wind_speed"]
+    wind_direction = weather["wind_direction"]
+    pressure = weather["pressure"]
+    humidity = weather["humidity"]
+    visibility = weather["visibility"]
+
+    wind_arrow = get_wind_direction_arrow(wind_direction)
+    icon_svg = get_location_icon_svg(icon_type, 16, "#3B82F6")
+
+    # Popup completo con todos los datos meteorológicos
+    popup_content = f"""
+            <div style="font-family: Arial, sans-serif; min-width: 200px;">
+                <h3 style="margin: 0 0 10px 0; color: #2E86AB;">{icon_svg} {name}</h3>
+                <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 8px; font-size: 12px;">
+                    <div style="background: #E3F2FD; padding: 5px; border-radius: 3px;">
+<strong><svg width = (
+                            '14' height='14' viewBox='0 0 24 24' fill='none' xmlns='http://www.w3.org/2000/svg' style='display: inline; vertical-align: middle; margin-right: 4px;'><path d='M14 4v10.54a4 4 0 1 1-4 0V4a2 2 0 0 1 4 0z' stroke='#EF4444' stroke-width='2' stroke-linecap='round' stroke-linejoin='round'/></svg>Temp:</strong><br>{temp}°C
+                        )
+                    </div>
+                    <div style="background: #E8F5E8; padding: 5px; border-radius: 3px;">
+<strong><svg width = (
+                            '14' height='14' viewBox='0 0 24 24' fill='none' xmlns='http://www.w3.org/2000/svg' style='display: inline; vertical-align: middle; margin-right: 4px;'><path d='M3 12h18m-9-9l9 9-9 9' stroke='#10B981' stroke-width='2' stroke-linecap='round' stroke-linejoin='round'/></svg>Viento:</strong><br>{wind_speed} km/h {wind_arrow}
+                        )
+                    </div>
+                    <div style="background: #FFF3E0; padding: 5px; border-radius: 3px;">
+<strong><svg width = (
+                            '14' height='14' viewBox='0 0 24 24' fill='none' xmlns='http://www.w3.org/2000/svg' style='display: inline; vertical-align: middle; margin-right: 4px;'><path d='M3 7v10a2 2 0 002 2h14a2 2 0 002-2V9a2 2 0 00-2-2H5a2 2 0 00-2-2z' stroke='#F59E0B' stroke-width='2' stroke-linecap='round' stroke-linejoin='round'/></svg>Presión:</strong><br>{pressure} hPa
+                        )
+                    </div>
+                    <div style="background: #F3E5F5; padding: 5px; border-radius: 3px;">
+<strong><svg width = (
+                            '14' height='14' viewBox='0 0 24 24' fill='none' xmlns='http://www.w3.org/2000/svg' style='display: inline; vertical-align: middle; margin-right: 4px;'><path d='M12 2l3.09 6.26L22 9.27l-5 4.87 1.18 6.88L12 17.77l-6.18 3.25L7 14.14 2 9.27l6.91-1.01L12 2z' stroke='#8B5CF6' stroke-width='2' stroke-linecap='round' stroke-linejoin='round'/></svg>Humedad:</strong><br>{humidity}%
+                        )
+                    </div>
+                    <div style="background: #E0F2F1; padding: 5px; border-radius: 3px; grid-column: 1 / -1;">
+<strong><svg width = (
+                            '14' height='14' viewBox='0 0 24 24' fill='none' xmlns='http://www.w3.org/2000/svg' style='display: inline; vertical-align: middle; margin-right: 4px;'><path d='M1 12s4-8 11-8 11 8 11 8-4 8-11 8-11-8-11-8z' stroke='#06B6D4' stroke-width='2' stroke-linecap='round' stroke-linejoin='round'/><circle cx='12' cy='12' r='3' stroke='#06B6D4' stroke-width='2' stroke-linecap='round' stroke-linejoin='round'/></svg>Visibilidad:</strong><br>{visibility} km
+                        )
+                    </div>
+                </div>
+            </div>
+            """
+    return popup_content
+
+def get_station_key(locations: dict) -> tuple:
+    """
+    Clave estable del conjunto de estaciones (solo la parte estática del mapa)
+    """
+    return tuple(
+        (name, data["lat"], data["lon"], data["color"], data["icon_type"])
+        for name, data in locations.items()
+    )
+
+def get_data_version(locations: dict) -> str:
+    """
+    Versión de los datos meteorológicos: cambia solo cuando cambian las observaciones
+    """
+    payload = json.dumps(
+        [(name, data["lat"], data["lon"], data.get("weather")) for name, data in locations.items()],
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.md5(payload.encode()).hexdigest()
+
+def session_copy(element):
+    """
+    Copia privada de un mapa o capa cacheados para pasarla a st_folium
+
+    st_folium agrega las capas al mapa (add_to) y les reasigna el id: sobre los objetos
+    de st.cache_resource, compartidos por todas las sesiones, las capas de cada rerun
+    quedarían acumuladas en el mapa cacheado.
+    """
+    if isinstance(element, folium.Map) or element._parent is None:
+        return copy.deepcopy(element)
+    # Una capa ya agregada a otro mapa se copia sin ese mapa
+    return copy.deepcopy(element, {id(element._parent): None})
+
+@st.cache_resource(show_spinner=False)
+def get_base_map(station_key: tuple, with_station_markers: bool = True) -> folium.Map:
+    """
+    Mapa base estático (tiles + marcadores de estación con iconos), construido una sola vez
+    por conjunto de estaciones
+
+    Args:
+        station_key: Clave de estaciones generada por get_station_key
+        with_station_markers: False en modo GeoJSON (las estaciones viajan en la capa)
+    """
+    coordinates = np.array([(lat, lon) for _, lat, lon, _, _ in station_key], dtype=float)
+    center_lat, center_lon = coordinates.mean(axis=0)
+
+    m = folium.Map(
+        location=[center_lat, center_lon],
+        zoom_start=DEFAULT_MAP_ZOOM,
+        tiles='OpenStreetMap'
+    )
+
+    if not with_station_markers:
+        return m
+
+    stations = folium.FeatureGroup(name="Estaciones")
+    for name, lat, lon, color, icon_type in station_key:
+        icon_svg = get_location_icon_svg(icon_type, 16, "#3B82F6")
+        folium.Marker(
+            [lat, lon],
+            popup=f"<b>{icon_svg} {name}</b>",
+            tooltip=f"{name}",
+            icon=folium.Icon(color=color, icon="info-sign")
+        ).add_to(stations)
+    stations.add_to(m)
+
+    return m
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def get_weather_overlay(data_version: str, _locations: dict) -> folium.FeatureGroup:
+    """
+    Capa meteorológica (marcadores de color combinado, flechas de viento y popups)
+
+    Se regenera solo cuando cambia data_version; _locations no forma parte de la clave
+    """
+    overlay = folium.FeatureGroup(name="Datos meteorológicos")
+
+    for name, data in _locations.items():
+        weather = data.get("weather")
+        if not weather:
+            continue
+
+        # Usar color combinado (temperatura + viento) para el marcador principal
+        combined_color = get_combined_temp_wind_color(weather["temperature"], weather["wind_speed"])
+
+        # Crear marcador con flecha de viento
+        marker, wind_arrow = create_enhanced_wind_marker(
+            data["lat"],
+            data["lon"],
+            combined_color,
+            weather["wind_direction"],
+            weather["wind_speed"],
+            name,
+            build_weather_popup(name, weather, data["icon_type"])
+        )
+
+        marker.add_to(overlay)
+        wind_arrow.add_to(overlay)
+
+    return overlay
+
+def build_station_feature_collection(locations: dict) -> dict:
+    """
+    Convierte las estaciones en un único FeatureCollection GeoJSON con propiedades compactas
+
+    Propiedades: n (nombre), c (color combinado), t, ws, wd, p, h, v (datos meteorológicos)
+    """
+    # Colores de todas las estaciones en una sola llamada vectorizada
+    temperatures = [(data.get("weather") or {}).get("temperature", np.nan) for data in locations.values()]
+    wind_speeds = [(data.get("weather") or {}).get("wind_speed", np.nan) for data in locations.values()]
+    colors = COMBINED_TEMP_WIND_SCALE(temperatures, wind_speeds)
+
+    features = []
+    for (name, data), color in zip(locations.items(), colors):
+        weather = data.get("weather") or {}
+        properties = {"n": name}
+        if weather:
+            properties.update({
+                "c": color,
+                "t": weather["temperature"],
+                "ws": weather["wind_speed"],
+                "wd": weather["wind_direction"],
+                "p": weather["pressure"],
+                "h": weather["humidity"],
+                "v": weather["visibility"]
+            })
+        else:
+            properties["c"] = "#9CA3AF"
+
+        features.append({
+            "type": "Feature",
+            "geometry": {
+                "type": "Point",
+                "coordinates": [round(data["lon"], 5), round(data["lat"], 5)]
+            },
+            "properties": properties
+        })
+
+    return {"type": "FeatureCollection", "features": features}
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def get_geojson_overlay(data_version: str, _locations: dict) -> folium.FeatureGroup:
+    """
+    Capa meteorológica compacta: todas las estaciones en una sola capa GeoJson
+
+    El estilo se resuelve en el cliente a partir de la propiedad "c" y los popups se
+    arman con una plantilla (GeoJsonPopup) en lugar de HTML embebido por marcador
+    """
+    overlay = folium.FeatureGroup(name="Datos meteorológicos")
+
+    popup_fields = ["n", "t", "ws", "wd", "p", "h", "v"]
+    popup_aliases = [
+        "Ubicación", "Temp (°C)", "Viento (km/h)", "Dirección (°)",
+        "Presión (hPa)", "Humedad (%)", "Visibilidad (km)"
+    ]
+
+    folium.GeoJson(
+        build_station_feature_collection(_locations),
+        name="Estaciones",
+        marker=folium.CircleMarker(radius=8, color="black", weight=1, fill_opacity=0.8),
+        style_function=lambda feature: {"fillColor": feature["properties"]["c"]},
+        tooltip=folium.GeoJsonTooltip(fields=["n"], labels=False),
+        popup=folium.GeoJsonPopup(fields=popup_fields, aliases=popup_aliases)
+    ).add_to(overlay)
+
+    return overlay
+
+@st.cache_resource(show_spinner=False)
+def get_cluster_index(station_key: tuple) -> GridClusterIndex:
+    """
+    Índice de viewport/clustering, construido una vez por conjunto de estaciones
+    """
+    return GridClusterIndex(
+        [lat for _, lat, _, _, _ in station_key],
+        [lon for _, _, lon, _, _ in station_key]
+    )
+
+def build_cluster_layer(clusters: list) -> folium.FeatureGroup:
+    """
+    Capa con un marcador por cluster (tamaño según cantidad de estaciones)
+    """
+    layer = folium.FeatureGroup(name="Clusters")
+
+    for cluster in clusters:
+        count = cluster["count"]
+        radius = 12 + 4 * math.log10(count)
+
+        folium.CircleMarker(
+            [cluster["lat"], cluster["lon"]],
+            radius=radius,
+            tooltip=f"{count} estaciones - acercar para ver detalle",
+            color="#1E3A8A",
+            weight=2,
+            fillColor="#3B82F6",
+            fillOpacity=0.6
+        ).add_to(layer)
+
+        folium.Marker(
+            [cluster["lat"], cluster["lon"]],
+            icon=folium.DivIcon(
+                html=f'<div style="font: bold 12px Arial; color: white; text-align: center;">{count}</div>',
+                icon_size=(30, 16),
+                icon_anchor=(15, 8)
+            )
+        ).add_to(layer)
+
+    return layer
+
+def select_visible_locations(locations: dict, station_key: tuple, viewport: dict) -> tuple:
+    """
+    Recortar las estaciones al viewport actual y agrupar las cercanas al zoom actual
+
+    Args:
+        viewport: Último estado devuelto por st_folium (bounds y zoom)
+
+    Returns:
+        Tupla (estaciones sueltas visibles, lista de clusters)
+    """
+    zoom = viewport.get("zoom") or DEFAULT_MAP_ZOOM
+    bounds = parse_leaflet_bounds(viewport.get("bounds"))
+
+    singles, clusters = get_cluster_index(station_key).cluster(zoom, bounds)
+
+    names = list(locations)
+    visible = {names[i]: locations[names[i]] for i in singles}
+    return visible, clusters
+
+@st.cache_resource(show_spinner=False)
+def get_idw_interpolator(station_points: tuple) -> IDWInterpolator:
+    """
+    Interpolador IDW (vecinos y pesos de la grilla 512x512), uno por conjunto de estaciones
+    """
+    return IDWInterpolator(
+        [lat for lat, _ in station_points],
+        [lon for _, lon in station_points]
+    )
+
+@st.cache_resource(show_spinner=False, max_entries=16)
+def get_interpolation_overlay(data_version: str, layer_name: str, _locations: dict):
+    """
+    Capa raster interpolada (IDW) como PNG comprimido sobre Córdoba, cacheada por versión de datos
+
+    Returns:
+        FeatureGroup con un ImageOverlay, o None si no hay datos suficientes
+    """
+    variable, scale = INTERPOLATION_LAYERS[layer_name]
+    stations = [data for data in _locations.values() if data.get("weather")]
+    if not stations:
+        return None
+
+    interpolator = get_idw_interpolator(tuple((data["lat"], data["lon"]) for data in stations))
+    grid = interpolator.interpolate([data["weather"].get(variable, np.nan) for data in stations])
+
+    image_url = render_png_data_url(scale.rgba(grid, alpha=255))
+    if image_url is None:
+        return None
+
+    layer = folium.FeatureGroup(name=f"{layer_name} interpolada")
+    folium.raster_layers.ImageOverlay(
+        image=image_url,
+        bounds=interpolator.leaflet_bounds(),
+        opacity=0.5,
+        pixelated=False,
+        name=f"{layer_name} (IDW)"
+    ).add_to(layer)
+
+    return layer
+
+@timed(MAP_RENDER_SECONDS, stage="page")
 def main(selected_api: str = "OpenWeatherMap", selected_model: str = None) -> None:
     """Mostrar mapa interactivo con 4 ubicaciones estratégicas"""
 
@@ -639,95 +955,70 @@ def main(selected_api: str = "OpenWeatherMap", selected_model: str = None) -> No
             "Fuente": source
         })
 
-    # Crear mapa centrado dinámicamente
-    center_lat = sum(data["lat"] for data in locations.values()) / len(locations)
-    center_lon = sum(data["lon"] for data in locations.values()) / len(locations)
-
-    m = folium.Map(
-        location=[center_lat, center_lon],
-        zoom_start=8,
-        tiles='OpenStreetMap'
+    # Alimentar la detección de anomalías en streaming con las observaciones del mapa
+    feed_map_observations(locations)
+    record_map_observations(locations)
+
+    # Modo de capa: marcadores detallados o GeoJSON compacto (automático con muchas estaciones)
+    overlay_modes = ["Marcadores detallados", "GeoJSON compacto"]
+    overlay_mode = st.radio(
+        "Modo de capa meteorológica:",
+        overlay_modes,
+        index=1 if len(locations) > GEOJSON_STATION_THRESHOLD else 0,
+        horizontal=True,
+        help="El modo GeoJSON envía todas las estaciones en una sola capa liviana"
     )
+    use_geojson = overlay_mode == overlay_modes[1]
 
-    # Agregar marcadores con datos meteorológicos integrados
-    for name, data in locations.items():
-        if data["weather"]:
-            # Marcador con todas las capas meteorológicas integradas
-            temp = data["weather"]["temperature"]
-            wind_speed = data["weather"]["wind_speed"]
-            wind_direction = data["weather"]["wind_direction"]
-            pressure = data["weather"]["pressure"]
-            humidity = data["weather"]["humidity"]
-            visibility = data["weather"]["visibility"]
-
-            # Crear popup con todos los datos
-            wind_arrow = get_wind_direction_arrow(wind_direction)
-            icon_svg = get_location_icon_svg(data["icon_type"], 16, "#3B82F6")
-
-            # Popup completo con todos los datos meteorológicos
-            popup_content = f"""
-            <div style="font-family: Arial, sans-serif; min-width: 200px;">
-                <h3 style="margin: 0 0 10px 0; color: #2E86AB;">{icon_svg} {name}</h3>
-                <div style="display: grid; grid-template-columns: 1fr 1fr; gap: 8px; font-size: 12px;">
-                    <div style="background: #E3F2FD; padding: 5px; border-radius: 3px;">
-<strong><svg width = (
-                            '14' height='14' viewBox='0 0 24 24' fill='none' xmlns='http://www.w3.org/2000/svg' style='display: inline; vertical-align: middle; margin-right: 4px;'><path d='M14 4v10.54a4 4 0 1 1-4 0V4a2 2 0 0 1 4 0z' stroke='#EF4444' stroke-width='2' stroke-linecap='round' stroke-linejoin='round'/></svg>Temp:</strong><br>{temp}°C
-                        )
-                    </div>
-                    <div style="background: #E8F5E8; padding: 5px; border-radius: 3px;">
-<strong><svg width = (
-                            '14' height='14' viewBox='0 0 24 24' fill='none' xmlns='http://www.w3.org/2000/svg' style='display: inline; vertical-align: middle; margin-right: 4px;'><path d='M3 12h18m-9-9l9 9-9 9' stroke='#10B981' stroke-width='2' stroke-linecap='round' stroke-linejoin='round'/></svg>Viento:</strong><br>{wind_speed} km/h {wind_arrow}
-                        )
-                    </div>
-                    <div style="background: #FFF3E0; padding: 5px; border-radius: 3px;">
-<strong><svg width = (
-                            '14' height='14' viewBox='0 0 24 24' fill='none' xmlns='http://www.w3.org/2000/svg' style='display: inline; vertical-align: middle; margin-right: 4px;'><path d='M3 7v10a2 2 0 002 2h14a2 2 0 002-2V9a2 2 0 00-2-2H5a2 2 0 00-2-2z' stroke='#F59E0B' stroke-width='2' stroke-linecap='round' stroke-linejoin='round'/></svg>Presión:</strong><br>{pressure} hPa
-                        )
-                    </div>
-                    <div style="background: #F3E5F5; padding: 5px; border-radius: 3px;">
-<strong><svg width = (
-                            '14' height='14' viewBox='0 0 24 24' fill='none' xmlns='http://www.w3.org/2000/svg' style='display: inline; vertical-align: middle; margin-right: 4px;'><path d='M12 2l3.09 6.26L22 9.27l-5 4.87 1.18 6.88L12 17.77l-6.18 3.25L7 14.14 2 9.27l6.91-1.01L12 2z' stroke='#8B5CF6' stroke-width='2' stroke-linecap='round' stroke-linejoin='round'/></svg>Humedad:</strong><br>{humidity}%
-                        )
-                    </div>
-                    <div style="background: #E0F2F1; padding: 5px; border-radius: 3px; grid-column: 1 / -1;">
-<strong><svg width = (
-                            '14' height='14' viewBox='0 0 24 24' fill='none' xmlns='http://www.w3.org/2000/svg' style='display: inline; vertical-align: middle; margin-right: 4px;'><path d='M1 12s4-8 11-8 11 8 11 8-4 8-11 8-11-8-11-8z' stroke='#06B6D4' stroke-width='2' stroke-linecap='round' stroke-linejoin='round'/><circle cx='12' cy='12' r='3' stroke='#06B6D4' stroke-width='2' stroke-linecap='round' stroke-linejoin='round'/></svg>Visibilidad:</strong><br>{visibility} km
-                        )
-                    </div>
-                </div>
-            </div>
-            """
-
-            # Usar color combinado (temperatura + viento) para el marcador principal
-            combined_color = get_combined_temp_wind_color(temp, wind_speed)
-
-            # Crear marcador con flecha de viento
-            marker, wind_arrow = create_enhanced_wind_marker(
-                data["lat"],
-                data["lon"],
-                combined_color,
-                wind_direction,
-                wind_speed,
-                name,
-                popup_content
-            )
+    use_clustering = st.checkbox(
+        "Agrupar estaciones y mostrar solo el área visible",
+        value=len(locations) > CLUSTER_STATION_THRESHOLD,
+        help="Clustering en servidor: el costo depende del tamaño de pantalla, no de la red"
+    )
 
-            # Agregar elementos al mapa
-            marker.add_to(m)
-            wind_arrow.add_to(m)
+    interpolation_layer = st.selectbox(
+        "Capa interpolada (IDW):",
+        ["Ninguna"] + list(INTERPOLATION_LAYERS),
+        index=0,
+        help="Interpola las observaciones de las estaciones sobre una grilla regular de Córdoba"
+    )
 
-        else:
-            # Marcador normal
-            icon_svg = get_location_icon_svg(data["icon_type"], 16, "#3B82F6")
-            folium.Marker(
-                [data["lat"], data["lon"]],
-                popup=f"<b>{icon_svg} {name}</b>",
-                tooltip=f"{name}",
-                icon=folium.Icon(color=data["color"], icon="info-sign")
-            ).add_to(m)
-
-    # Mostrar mapa responsivo
-    st_folium(m, width=1200, height=600, returned_objects=[])
+    # Recorte al viewport y clustering con el último zoom/bounds reportado por el mapa
+    station_key = get_station_key(locations)
+    clusters = []
+    visible_locations = locations
+    if use_clustering:
+        viewport = st.session_state.get("mapa_interactivo") or {}
+        visible_locations, clusters = select_visible_locations(locations, station_key, viewport)
+
+    # Mapa base cacheado + capa meteorológica versionada por datos
+    base_map = get_base_map(station_key, with_station_markers=not (use_geojson or use_clustering))
+    data_version = get_data_version(visible_locations)
+    if use_geojson:
+        weather_overlay = get_geojson_overlay(data_version, visible_locations)
+    else:
+        weather_overlay = get_weather_overlay(data_version, visible_locations)
+
+    overlays = [weather_overlay]
+    if interpolation_layer != "Ninguna":
+        raster_overlay = get_interpolation_overlay(get_data_version(locations), interpolation_layer, locations)
+        if raster_overlay is not None:
+            overlays.insert(0, raster_overlay)
+    if clusters:
+        overlays.append(build_cluster_layer(clusters))
+
+    # Mostrar mapa responsivo (solo las capas superpuestas se actualizan entre reruns);
+    # st_folium recibe copias: los objetos cacheados no se modifican
+    # st_folium serializa el mapa a HTML: se mide aparte del resto de la página
+    with MAP_RENDER_SECONDS.time(stage="st_folium"):
+        st_folium(
+            session_copy(base_map),
+            feature_group_to_add=[session_copy(overlay) for overlay in overlays],
+            key="mapa_interactivo",
+            width=1200,
+            height=600,
+            returned_objects=["bounds", "zoom"] if use_clustering else []
+        )
 
     # Selector de capas
     st.markdown("---")
@@ -820,6 +1111,25 @@ def main(selected_api: str = "OpenWeatherMap", selected_model: str = None) -> No
     st.markdown("### 📍 Coordenadas de Ubicaciones")
     st.dataframe(coord_data, use_container_width=True)
 
+    # Ranking de riesgo de tormenta de todas las estaciones en una sola pasada
+    st.markdown("### ⛈️ Ranking de Riesgo de Tormenta")
+    show_storm_risk_ranking(locations)
+
+    # Búsqueda espacial en el catálogo de estaciones
+    with st.expander("🛬 Aeródromo más cercano"):
+        col1, col2 = st.columns(2)
+        with col1:
+            query_lat = st.number_input("Latitud", value=-31.42, format="%.4f")
+        with col2:
+            query_lon = st.number_input("Longitud", value=-64.19, format="%.4f")
+
+        station, distance = get_nearest_aerodrome(query_lat, query_lon)
+        if station:
+            codes = " / ".join(code for code in (station.get("icao"), station.get("iata")) if code)
+            st.success(f"**{station['name']}** ({codes}) a {distance:.1f} km")
+        else:
+            st.info("No hay aeródromos en el catálogo")
+
 # Ejecutar la página
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -6,6 +6,7 @@
 import streamlit as st
 import sys
 import os
+import threading
 import pandas as pd
 import numpy as np
 import plotly.express as px
@@ -19,29 +20,119 @@ def show_footer():
     st.markdown("---")
     st.markdown("© 2025 CorAlertMet Intelligence")
 
-def apply_corporate_styles():
-    pass
-
-def show_svg_icon(icon_name, width=24, height=24, animation="none", color="#3B82F6"):
-    st.markdown(f'<div style="font-size: {width}px; text-align: center;">❓</div>', unsafe_allow_html=True)
+# Estilos corporativos (no se reinyectan si app.py ya los emitió en esta ejecución)
+try:
+    from components.styles import apply_corporate_styles
+except ImportError:
+    def apply_corporate_styles():
+        pass
 
-# Importar módulos ML directamente
+# Iconos SVG desde el registro (los keyframes los emite app.py)
 try:
-    from ml_models.precision_metrics import show_precision_metrics
-    from ml_models.advanced_predictions import show_advanced_predictions
-    from ml_models.intelligent_alerts import show_intelligent_alerts
-    from ml_models.model_validation import show_model_validation
-except ImportError as e:
-    st.error(f"Error importando módulos ML: {e}")
-    # Definir funciones dummy
-    def show_precision_metrics(*args, **kwargs):
-        st.error("Módulo de precisión no disponible")
-    def show_advanced_predictions(*args, **kwargs):
-        st.error("Módulo de predicciones no disponible")
-    def show_intelligent_alerts(*args, **kwargs):
-        st.error("Módulo de alertas no disponible")
-    def show_model_validation(*args, **kwargs):
-        st.error("Módulo de validación no disponible")
+    from components.icon_registry import show_icon as show_svg_icon
+except ImportError:
+    def show_svg_icon(icon_name, width=24, height=24, animation="none", color="#3B82F6"):
+        st.markdown(f'<div style="font-size: {width}px; text-align: center;">❓</div>', unsafe_allow_html=True)
+
+from cache.observation_store import get_observation_store
+from components.downsampling import downsample_frame
+
+# Vistas ML con carga diferida: cada módulo (y sklearn/darts) se importa al usarse por primera vez
+from pages_modules.page_registry import timed_import
+
+def _lazy_ml_view(module_name, function_name, unavailable_message):
+    """Crear una vista que importa ml_models.<module_name> recién al mostrarse"""
+    def view(*args, **kwargs):
+        try:
+            function = timed_import(f"ml_models.{module_name}", function_name)
+        except ImportError as e:
+            st.error(f"{unavailable_message}: {e}")
+            return None
+        return function(*args, **kwargs)
+    return view
+
+show_precision_metrics = _lazy_ml_view(
+    "precision_metrics", "show_precision_metrics", "Módulo de precisión no disponible")
+show_advanced_predictions = _lazy_ml_view(
+    "advanced_predictions", "show_advanced_predictions", "Módulo de predicciones no disponible")
+show_intelligent_alerts = _lazy_ml_view(
+    "intelligent_alerts", "show_intelligent_alerts", "Módulo de alertas no disponible")
+show_model_validation = _lazy_ml_view(
+    "model_validation", "show_model_validation", "Módulo de validación no disponible")
+
+# El motor de pronóstico se comparte entre sesiones; el lock serializa sus ajustes
+_forecast_lock = threading.Lock()
+FORECAST_MODEL_LABEL = "AR incremental"
+
+@st.cache_resource(show_spinner=False)
+def get_forecast_engine():
+    """Motor de pronóstico compartido por todo el proceso (estado persistido en CacheManager)"""
+    load_forecast_engine = timed_import("ml_models.forecasting", "load_forecast_engine")
+    return load_forecast_engine()
+
+@st.cache_resource(show_spinner=False)
+def get_verification_engine():
+    """Motor de verificación compartido por todo el proceso (estadísticas en SQLite)"""
+    VerificationEngine = timed_import("ml_models.verification", "VerificationEngine")
+    return VerificationEngine()
+
+def get_station_forecasts():
+    """
+    Ajustar el motor con las observaciones nuevas y pronosticar todas las estaciones en lote
+
+    Returns:
+        Dict de ForecastEngine.forecast o None si el motor no está disponible
+    """
+    try:
+        engine = get_forecast_engine()
+        save_forecast_engine = timed_import("ml_models.forecasting", "save_forecast_engine")
+    except ImportError as e:
+        st.error(f"Motor de pronóstico no disponible: {e}")
+        return None
+
+    with _forecast_lock:
+        store = get_observation_store()
+        added = engine.update_from_store(store)
+        forecasts = engine.forecast()
+        if any(added.values()):
+            save_forecast_engine(engine)
+            # Verificar pronósticos vencidos con lo observado y registrar el nuevo lote
+            try:
+                verification = get_verification_engine()
+                verification.verify(store)
+                verification.record_forecasts(FORECAST_MODEL_LABEL, forecasts)
+            except ImportError as e:
+                st.warning(f"Verificación no disponible: {e}")
+        return forecasts
+
+def show_verification_summary():
+    """Mostrar métricas de verificación acumuladas de los pronósticos contra observaciones"""
+    st.markdown("### ✅ Verificación contra Observaciones")
+
+    try:
+        verification = get_verification_engine()
+    except ImportError as e:
+        st.error(f"Verificación no disponible: {e}")
+        return
+
+    by_lead = verification.summary(group_by=("variable", "lead"))
+    if by_lead.empty:
+        st.info(f"Sin pronósticos verificados todavía "
+                f"({verification.pending_count()} esperando observación)")
+        return
+
+    variable = st.selectbox("Variable verificada:", sorted(by_lead["variable"].unique()),
+                            key="verification_variable")
+    selected = by_lead[by_lead["variable"] == variable].drop(columns="variable")
+    fig = px.line(selected, x="lead", y=["mae", "rmse", "bias"],
+                  title=f"Error por plazo de pronóstico: {variable}",
+                  labels={"lead": "Plazo (pasos de 30 min)", "value": "Error", "variable": "Métrica"})
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.dataframe(
+        verification.summary(group_by=("model", "station", "variable")),
+        use_container_width=True
+    )
 
 # Configuración de la página
 st.set_page_config(
@@ -228,30 +319,45 @@ def show_forecast_tab():
 
     st.markdown("---")
 
-    # Generar datos de pronóstico cada 30 minutos (48 puntos en 24 horas)
-    dates = [datetime.now() + timedelta(minutes=30*i) for i in range(48)]
-    temperatures = 25 + 5 * np.sin(np.linspace(0, 4*np.pi, 48)) + np.random.normal(0, 1, 48)
-    humidity = 60 + 20 * np.sin(np.linspace(0, 2*np.pi, 48)) + np.random.normal(0, 5, 48)
-    wind_speed = 15 + 10 * np.sin(np.linspace(0, 3*np.pi, 48)) + np.random.normal(0, 2, 48)
-
-    # Convertir valores a enteros
-    temperatures = np.round(temperatures).astype(int)
-    humidity = np.round(humidity).astype(int)
-    wind_speed = np.round(wind_speed).astype(int)
-
-    # Crear horarios redondos cada 30 minutos
-    time_labels = []
-    for d in dates:
-        # Redondear a la media hora más cercana
-        minute = d.minute
-        if minute < 15:
-            minute = 0
-        elif minute < 45:
-            minute = 30
-        else:
-            minute = 0
-            d = d + timedelta(hours=1)
-        time_labels.append(d.replace(minute=minute, second=0, microsecond=0).strftime("%H:%M"))
+    # Pronóstico real del motor incremental cuando hay historial de observaciones
+    forecasts = get_station_forecasts()
+    if forecasts and forecasts["stations"]:
+        station = st.selectbox("Estación:", forecasts["stations"], key="forecast_station")
+        index = forecasts["stations"].index(station)
+        dates = [datetime.fromtimestamp(ts) for ts in forecasts["timestamp"][index]]
+        temperatures = np.round(forecasts["temperature"][index], 1)
+        humidity = np.round(forecasts["humidity"][index], 1)
+        wind_speed = np.round(forecasts["wind_speed"][index], 1)
+        time_labels = [d.strftime("%H:%M") for d in dates]
+        st.caption(f"📈 Pronóstico autorregresivo de {len(dates)} pasos de 30 min "
+                   f"para {len(forecasts['stations'])} estaciones")
+    else:
+        st.caption("ℹ️ Sin historial de observaciones: se muestra un pronóstico simulado")
+
+        # Generar datos de pronóstico cada 30 minutos (48 puntos en 24 horas)
+        dates = [datetime.now() + timedelta(minutes=30*i) for i in range(48)]
+        temperatures = 25 + 5 * np.sin(np.linspace(0, 4*np.pi, 48)) + np.random.normal(0, 1, 48)
+        humidity = 60 + 20 * np.sin(np.linspace(0, 2*np.pi, 48)) + np.random.normal(0, 5, 48)
+        wind_speed = 15 + 10 * np.sin(np.linspace(0, 3*np.pi, 48)) + np.random.normal(0, 2, 48)
+
+        # Convertir valores a enteros
+        temperatures = np.round(temperatures).astype(int)
+        humidity = np.round(humidity).astype(int)
+        wind_speed = np.round(wind_speed).astype(int)
+
+        # Crear horarios redondos cada 30 minutos
+        time_labels = []
+        for d in dates:
+            # Redondear a la media hora más cercana
+            minute = d.minute
+            if minute < 15:
+                minute = 0
+            elif minute < 45:
+                minute = 30
+            else:
+                minute = 0
+                d = d + timedelta(hours=1)
+            time_labels.append(d.replace(minute=minute, second=0, microsecond=0).strftime("%H:%M"))
 
     df_forecast = pd.DataFrame({
         "Hora": time_labels,
@@ -259,6 +365,8 @@ def show_forecast_tab():
         "Humedad (%)": humidity,
         "Viento (km/h)": wind_speed
     })
+    df_forecast = downsample_frame(df_forecast, ["Temperatura (°C)", "Humedad (%)"],
+                                   series_key="pronostico")
 
     # Gráficos de pronóstico
     col1, col2 = st.columns(2)
@@ -285,6 +393,11 @@ def show_training_tab():
     # Mostrar validación de modelos
     show_model_validation()
 
+    st.markdown("---")
+
+    # Verificación real de los pronósticos emitidos
+    show_verification_summary()
+
 # Ejecutar la página
 if __name__ == "__main__":
     main()
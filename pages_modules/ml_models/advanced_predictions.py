@@ -15,8 +15,12 @@
 # Agregar el directorio raíz al path para importar cache_manager
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 from cache.cache_manager import save_model, load_model, save_data, load_data
+from config.metrics import PREDICTION_SECONDS, timed
+from pages_modules.ml_models.ensemble import WINDY_ENSEMBLE
+from pages_modules.ml_models.storm_risk import TRAINING_STORM_ENGINE
 
 @st.cache_data(ttl=1800, show_spinner=False)  # Cache 30 minutos para predicciones ML
+@timed(PREDICTION_SECONDS, stage="get_prediction_data")  # Solo se mide cuando no hay cache
 def get_prediction_data():
     """Obtener datos para predicciones - Intenta usar datos reales de API, fallback a sintéticos"""
     import requests
@@ -75,14 +79,13 @@ def get_prediction_data():
         cloud_cover = np.random.uniform(0, 100, n_samples)
 
     # Crear variable objetivo (probabilidad de tormenta) basada en reglas meteorológicas
-    storm_probability = (
-        0.3 * (temperature > 30).astype(int) +  # Alta temperatura
-        0.4 * (humidity > 80).astype(int) +     # Alta humedad
-        0.2 * (pressure < 1000).astype(int) +   # Baja presión
-        0.3 * (wind_speed > 20).astype(int) +   # Viento fuerte
-        0.2 * (cloud_cover > 70).astype(int) +  # Mucha nubosidad
-        np.random.normal(0, 0.1, n_samples)     # Ruido
-    )
+    storm_probability = TRAINING_STORM_ENGINE.score({
+        'temperature': temperature,
+        'humidity': humidity,
+        'pressure': pressure,
+        'wind_speed': wind_speed,
+        'cloud_cover': cloud_cover
+    }, clip=False) + np.random.normal(0, 0.1, n_samples)  # Ruido
 
     # Normalizar probabilidad entre 0 y 1
     storm_probability = np.clip(storm_probability, 0, 1)
@@ -135,8 +138,9 @@ def get_prediction_data():
         rf_model = RandomForestRegressor(n_estimators=100, random_state=42)
         gb_model = GradientBoostingRegressor(n_estimators=100, random_state=42)
 
-        rf_model.fit(X_train_scaled, y_train)
-        gb_model.fit(X_train_scaled, y_train)
+        with PREDICTION_SECONDS.time(stage="training"):
+            rf_model.fit(X_train_scaled, y_train)
+            gb_model.fit(X_train_scaled, y_train)
 
         # Guardar en cache
         save_data(df, "weather_training_data")
@@ -185,27 +189,30 @@ def show_advanced_predictions():
             "GFS27": {"temp": 27.8, "humidity": 72, "pressure": 1005, "wind": 18, "cloud": 65}
         }
 
-        # Procesar cada modelo
-        model_predictions = {}
-
-        for model_name, conditions in windy_models.items():
-            # Preparar datos de entrada
-            input_data = np.array([[conditions["temp"], conditions["humidity"],
-                                   conditions["pressure"], conditions["wind"],
-                                   180, conditions["cloud"]]])  # wind_dir fijo en 180
-            input_scaled = scaler.transform(input_data)
-
-            # Predicciones
-            rf_pred = rf_model.predict(input_scaled)[0]
-            gb_pred = gb_model.predict(input_scaled)[0]
-            combined_prob = (rf_pred + gb_pred) / 2
-
-            model_predictions[model_name] = {
-                "conditions": conditions,
-                "rf_prediction": rf_pred,
-                "gb_prediction": gb_pred,
-                "combined_prob": combined_prob
+        # Procesar los 3 modelos en un solo lote (una fila por modelo)
+        model_names = list(windy_models)
+        input_data = np.array([
+            [conditions["temp"], conditions["humidity"], conditions["pressure"],
+             conditions["wind"], 180, conditions["cloud"]]  # wind_dir fijo en 180
+            for conditions in windy_models.values()
+        ])
+        input_scaled = scaler.transform(input_data)
+
+        # Predicciones
+        with PREDICTION_SECONDS.time(stage="inference"):
+            rf_preds = rf_model.predict(input_scaled)
+            gb_preds = gb_model.predict(input_scaled)
+        combined_probs = (rf_preds + gb_preds) / 2
+
+        model_predictions = {
+            model_name: {
+                "conditions": windy_models[model_name],
+                "rf_prediction": rf_preds[i],
+                "gb_prediction": gb_preds[i],
+                "combined_prob": combined_probs[i]
             }
+            for i, model_name in enumerate(model_names)
+        }
 
         # Mostrar resultados por modelo
         st.markdown("#### 📊 Resultados por Modelo de Windy")
@@ -236,10 +243,8 @@ def show_advanced_predictions():
         # Predicción combinada
         st.markdown("#### 🎯 Predicción Combinada")
 
-        # Calcular promedio ponderado (HRRR tiene más peso por ser más preciso)
-        weights = {"HRRR": 0.5, "ECMWF": 0.3, "GFS27": 0.2}
-        final_prob = sum(weights[model] * model_predictions[model]["combined_prob"]
-                        for model in weights.keys())
+        # Promedio ponderado con los pesos actuales del ensamble (HRRR parte con más peso)
+        final_prob = float(WINDY_ENSEMBLE.blend(combined_probs, models=model_names))
 
         col1, col2, col3 = st.columns(3)
 
@@ -0,0 +1,215 @@
+"""
+Ensamble de Modelos de Windy para CorAlertMet Intelligence
+Mezcla ponderada, por habilidad o apilada sobre arrays (modelo x estación x plazo)
+"""
+
+import logging
+import threading
+
+import numpy as np
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Metadatos de los modelos de Windy (ordenados por frecuencia de actualización - más updates = mejor)
+WINDY_MODELS = {
+    "HRRR": {
+        "name": "HRRR",
+        "resolution": "3 km",
+        "update_frequency": "18x/día",
+        "description": "Alta resolución para Estados Unidos",
+        "accuracy": 0.94
+    },
+    "ICON7": {
+        "name": "ICON7",
+        "resolution": "7 km",
+        "update_frequency": "4x/día",
+        "description": "Modelo alemán para Europa",
+        "accuracy": 0.90
+    },
+    "GFS27": {
+        "name": "GFS27",
+        "resolution": "27 km",
+        "update_frequency": "4x/día",
+        "description": "Sistema de pronóstico global de NOAA",
+        "accuracy": 0.88
+    },
+    "ECMWF": {
+        "name": "ECMWF",
+        "resolution": "14 km",
+        "update_frequency": "2x/día",
+        "description": "Modelo europeo de alta precisión",
+        "accuracy": 0.92
+    }
+}
+
+# Pesos iniciales de la predicción combinada (HRRR tiene más peso por ser más preciso)
+DEFAULT_BLEND_WEIGHTS = {"HRRR": 0.5, "ECMWF": 0.3, "GFS27": 0.2, "ICON7": 0.0}
+
+BLEND_METHODS = ("weighted", "skill", "stacked")
+
+
+def _normalize(weights, axis=0):
+    """Normalizar pesos no negativos para que sumen 1 (uniforme si todos son 0)"""
+    weights = np.clip(np.asarray(weights, dtype=np.float64), 0, None)
+    total = weights.sum(axis=axis, keepdims=True)
+    uniform = np.full_like(weights, 1.0 / weights.shape[axis])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(total > 0, weights / total, uniform)
+
+
+def skill_weights(scores, lower_is_better=True, power=1.0):
+    """
+    Pesos por habilidad a partir de puntajes de verificación
+
+    Args:
+        scores: Array (modelo,) o (modelo x plazo) con el puntaje de cada modelo
+        lower_is_better: True para errores (MAE, RMSE, Brier); False para habilidad (R², precisión)
+        power: Exponente; valores mayores concentran el peso en los mejores modelos
+
+    Returns:
+        Pesos normalizados sobre el eje de modelos
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    with np.errstate(divide="ignore"):
+        raw = 1.0 / np.maximum(scores, 1e-9) ** power if lower_is_better else np.maximum(scores, 0) ** power
+    raw = np.where(np.isfinite(raw), raw, 0.0)
+    return _normalize(raw, axis=0)
+
+
+class EnsembleBlender:
+    """Mezcla vectorizada de pronósticos de varios modelos para todas las estaciones y plazos"""
+
+    def __init__(self, models=WINDY_MODELS, weights=DEFAULT_BLEND_WEIGHTS):
+        """
+        Args:
+            models: Metadatos por modelo (nombre -> dict)
+            weights: Pesos iniciales por modelo
+        """
+        self.models = dict(models)
+        self.names = tuple(self.models)
+        self._index = {name: i for i, name in enumerate(self.names)}
+        self.weights = _normalize([weights.get(name, 0.0) for name in self.names])
+        self.stacked_weights = None
+        self._lock = threading.Lock()
+
+    def _select(self, models, weights):
+        """Pesos de los modelos pedidos, en su orden y renormalizados"""
+        if models is None:
+            return weights
+        index = [self._index[name] for name in models]
+        return _normalize(np.asarray(weights)[index], axis=0)
+
+    def model_weights(self, models=None):
+        """Pesos actuales por modelo (dict)"""
+        names = list(models) if models is not None else list(self.names)
+        return {name: float(w) for name, w in zip(names, self._select(names, self.weights))}
+
+    @staticmethod
+    def _combine(forecasts, weights):
+        """Suma ponderada sobre el eje de modelos ignorando faltantes (NaN)"""
+        forecasts = np.asarray(forecasts, dtype=np.float64)
+        weights = np.asarray(weights, dtype=np.float64)
+        # Pesos (modelo,) o (modelo x plazo) alineados con (modelo x ... x plazo)
+        shape = (weights.shape[0],) + (1,) * (forecasts.ndim - weights.ndim) + weights.shape[1:]
+        weights = np.broadcast_to(weights.reshape(shape), forecasts.shape)
+
+        available = np.isfinite(forecasts)
+        active = np.where(available, weights, 0.0)
+        total = active.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(total > 0, (active * np.where(available, forecasts, 0.0)).sum(axis=0) / total,
+                            np.nan)
+
+    def blend(self, forecasts, models=None, method="weighted", scores=None, lower_is_better=True):
+        """
+        Combinar pronósticos de varios modelos
+
+        Args:
+            forecasts: Array (modelo x ...), ej. (modelo x estación x plazo)
+            models: Nombres de los modelos en el orden del primer eje (None = todos)
+            method: "weighted" (pesos actuales), "skill" (pesos desde `scores`) o
+                    "stacked" (pesos ajustados con fit_stacking)
+            scores: Puntajes (modelo,) o (modelo x plazo) para method="skill"
+
+        Returns:
+            Array con la forma de forecasts sin el eje de modelos
+        """
+        if method == "skill":
+            if scores is None:
+                raise ValueError("method='skill' requiere scores")
+            weights = skill_weights(scores, lower_is_better)
+        elif method == "stacked":
+            if self.stacked_weights is None:
+                raise ValueError("method='stacked' requiere ajustar antes fit_stacking")
+            weights = self._select(models, self.stacked_weights)
+        else:
+            weights = self._select(models, self.weights)
+        return self._combine(forecasts, weights)
+
+    def fit_stacking(self, forecasts, observed, models=None, ridge=1e-3):
+        """
+        Ajustar pesos apilados (no negativos, suma 1) contra observaciones
+
+        Args:
+            forecasts: Array (modelo x muestras) o (modelo x muestras x plazo)
+            observed: Array (muestras,) o (muestras x plazo)
+
+        Returns:
+            Pesos (modelo,) o (modelo x plazo) ajustados por mínimos cuadrados
+        """
+        forecasts = np.asarray(forecasts, dtype=np.float64)
+        observed = np.asarray(observed, dtype=np.float64)
+        squeeze = forecasts.ndim == 2
+        if squeeze:
+            forecasts, observed = forecasts[..., None], observed[..., None]
+
+        valid = np.isfinite(forecasts).all(axis=0) & np.isfinite(observed)
+        F = np.where(valid, forecasts, 0.0)
+        y = np.where(valid, observed, 0.0)
+
+        # Ecuaciones normales por plazo: (plazo x modelo x modelo) y (plazo x modelo)
+        gram = np.einsum('mnl,knl->lmk', F, F) + ridge * np.eye(F.shape[0])
+        rhs = np.einsum('mnl,nl->lm', F, y)
+        weights = _normalize(np.linalg.solve(gram, rhs[..., None])[..., 0].T, axis=0)
+        weights = weights[:, 0] if squeeze else weights
+
+        with self._lock:
+            if models is None:
+                self.stacked_weights = weights
+            else:
+                full = np.zeros((len(self.names),) + weights.shape[1:])
+                full[[self._index[name] for name in models]] = weights
+                self.stacked_weights = full
+        return weights
+
+    def update_from_scores(self, scores, lower_is_better=True, smoothing=0.3):
+        """
+        Acercar los pesos actuales a los pesos por habilidad de la última verificación
+
+        Args:
+            scores: Dict modelo -> puntaje (MAE, RMSE, Brier...)
+            smoothing: Fracción del nuevo peso incorporada (suavizado exponencial)
+
+        Returns:
+            Dict con los pesos actualizados
+        """
+        names = [name for name in scores if name in self._index]
+        if not names:
+            return self.model_weights()
+
+        target = skill_weights([scores[name] for name in names], lower_is_better)
+        with self._lock:
+            index = [self._index[name] for name in names]
+            # Solo se redistribuye la masa de los modelos verificados
+            mass = self.weights[index].sum()
+            updated = self.weights.copy()
+            updated[index] = (1 - smoothing) * self.weights[index] + smoothing * target * mass
+            self.weights = _normalize(updated)
+
+        logger.info(f"Pesos del ensamble actualizados: {self.model_weights()}")
+        return self.model_weights()
+
+
+# Instancia compartida
+WINDY_ENSEMBLE = EnsembleBlender(WINDY_MODELS, DEFAULT_BLEND_WEIGHTS)
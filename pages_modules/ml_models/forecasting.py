@@ -0,0 +1,291 @@
+"""
+Motor de Pronóstico para CorAlertMet Intelligence
+Modelos autorregresivos por estación y variable, ajustados de forma incremental
+y pronosticados en lote (todas las estaciones y variables en una sola recursión)
+"""
+
+import logging
+import os
+import sys
+from datetime import datetime
+
+import numpy as np
+
+# Agregar el directorio raíz al path para importar cache_manager
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from cache.cache_manager import CacheManager
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+FORECAST_VARIABLES = ('temperature', 'humidity', 'pressure', 'wind_speed')
+FORECAST_MODEL_NAME = "station_forecast_engine"
+FORECAST_STEP_SECONDS = 1800    # Pasos de 30 minutos
+FORECAST_HORIZON = 48           # 24 horas
+FORECAST_HISTORY_DAYS = 14      # Historial usado en el primer ajuste de una estación
+
+DAY_SECONDS = 86400
+
+
+class ForecastEngine:
+    """
+    Pronóstico multi-horizonte por estación y variable
+
+    Cada serie es un AR(lags) con ciclo diario (seno/coseno de la hora) ajustado por
+    mínimos cuadrados con ridge. Solo se guardan las estadísticas suficientes
+    (XᵀX, Xᵀy), así que incorporar datos nuevos suma sus filas sin reajustar desde cero.
+    """
+
+    def __init__(self, variables=FORECAST_VARIABLES, lags=4,
+                 step_seconds=FORECAST_STEP_SECONDS, ridge=1e-2):
+        """
+        Args:
+            variables: Variables a pronosticar
+            lags: Pasos previos usados como predictores
+            step_seconds: Resolución de la serie (segundos)
+            ridge: Regularización para series cortas o colineales
+        """
+        self.variables = tuple(variables)
+        self.lags = int(lags)
+        self.step_seconds = float(step_seconds)
+        self.ridge = float(ridge)
+        self.n_features = 1 + self.lags + 2
+        self.stations = {}
+        self.updated_at = None
+
+    @property
+    def min_rows(self):
+        """Filas mínimas para usar el modelo ajustado (si no, persistencia)"""
+        return 2 * self.n_features
+
+    def _new_state(self):
+        n_vars, p = len(self.variables), self.n_features
+        return {
+            "last_ts": None,
+            "recent": np.full((n_vars, self.lags), np.nan),
+            "xtx": np.zeros((n_vars, p, p)),
+            "xty": np.zeros((n_vars, p)),
+            "n": np.zeros(n_vars, dtype=np.int64),
+        }
+
+    def _daily_terms(self, ts):
+        phase = 2 * np.pi * (np.asarray(ts, dtype=np.float64) % DAY_SECONDS) / DAY_SECONDS
+        return np.sin(phase), np.cos(phase)
+
+    def _regular_grid(self, timestamps, values):
+        """Ubicar las lecturas en una grilla regular (NaN en los pasos faltantes)"""
+        steps = np.round((timestamps - timestamps[0]) / self.step_seconds).astype(np.int64)
+        grid_ts = timestamps[0] + np.arange(steps[-1] + 1) * self.step_seconds
+        grid = np.full((len(self.variables), len(grid_ts)), np.nan)
+        for i, variable in enumerate(self.variables):
+            if variable in values:
+                grid[i, steps] = np.asarray(values[variable], dtype=np.float64)
+        return grid_ts, grid
+
+    def partial_fit(self, station, timestamps, values):
+        """
+        Incorporar nuevas observaciones de una estación
+
+        Args:
+            station: Identificador de la estación
+            timestamps: Inicio de cada paso (epoch, crecientes; formato de ObservationStore.downsample)
+            values: Dict variable -> array alineado con timestamps
+
+        Returns:
+            Cantidad de pasos nuevos incorporados
+        """
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        if len(timestamps) == 0:
+            return 0
+
+        state = self.stations.setdefault(station, self._new_state())
+        grid_ts, grid = self._regular_grid(timestamps, values)
+
+        # Anteponer los últimos valores conocidos (y los pasos faltantes) para armar
+        # los lags de las primeras filas nuevas
+        if state["last_ts"] is not None:
+            gap = int(round((grid_ts[0] - state["last_ts"]) / self.step_seconds))
+            if 1 <= gap <= self.lags:
+                prefix = np.concatenate(
+                    [state["recent"], np.full((len(self.variables), gap - 1), np.nan)], axis=1
+                )
+                grid = np.concatenate([prefix, grid], axis=1)
+                grid_ts = np.concatenate([
+                    grid_ts[0] - np.arange(prefix.shape[1], 0, -1) * self.step_seconds, grid_ts
+                ])
+
+        new_rows = 0
+        if grid.shape[1] > self.lags:
+            # Ventanas [y_{t-lags}, ..., y_{t-1}, y_t] para todas las variables a la vez
+            windows = np.lib.stride_tricks.sliding_window_view(grid, self.lags + 1, axis=1)
+            target_ts = grid_ts[self.lags:]
+            fresh = target_ts > (state["last_ts"] if state["last_ts"] is not None else -np.inf)
+            sin_t, cos_t = self._daily_terms(target_ts[fresh])
+
+            for i in range(len(self.variables)):
+                rows = windows[i][fresh]
+                lagged = rows[:, -2::-1]          # y_{t-1}, ..., y_{t-lags}
+                target = rows[:, -1]
+                X = np.column_stack([np.ones(len(rows)), lagged, sin_t, cos_t])
+                valid = np.isfinite(X).all(axis=1) & np.isfinite(target)
+                X, target = X[valid], target[valid]
+                state["xtx"][i] += X.T @ X
+                state["xty"][i] += X.T @ target
+                state["n"][i] += len(target)
+                new_rows = max(new_rows, int(valid.sum()))
+
+        # Últimos valores para los lags del pronóstico y del próximo ajuste
+        tail = grid[:, -self.lags:]
+        recent = np.full((len(self.variables), self.lags), np.nan)
+        recent[:, self.lags - tail.shape[1]:] = tail
+        if state["last_ts"] is None or grid_ts[-1] >= state["last_ts"]:
+            state["recent"] = recent
+            state["last_ts"] = float(grid_ts[-1])
+
+        self.updated_at = datetime.now().isoformat()
+        return new_rows
+
+    def update_from_store(self, store, stations=None, now=None):
+        """
+        Ajustar incrementalmente con lo registrado en el almacén de observaciones
+
+        Returns:
+            Dict estación -> pasos nuevos incorporados
+        """
+        now = datetime.now().timestamp() if now is None else now
+        # Solo buckets completos: el actual todavía recibe lecturas y quedaría fijado
+        # (los pasos ya ajustados no se vuelven a incorporar)
+        until = np.floor(now / self.step_seconds) * self.step_seconds
+        stations = store.stations() if stations is None else stations
+        added = {}
+
+        for station in stations:
+            state = self.stations.get(station)
+            if state is not None and state["last_ts"] is not None:
+                since = state["last_ts"] - self.lags * self.step_seconds
+            else:
+                since = now - FORECAST_HISTORY_DAYS * DAY_SECONDS
+
+            history = store.downsample(station, int(self.step_seconds), since=since, until=until,
+                                       variables=self.variables)
+            # El rango es inclusivo: descartar el bucket que empieza justo en `until`
+            complete = history["timestamp"] < until
+            if complete.any():
+                added[station] = self.partial_fit(
+                    station, history["timestamp"][complete],
+                    {name: history[name][complete] for name in self.variables}
+                )
+
+        return added
+
+    def coefficients(self, station_names):
+        """Coeficientes (estaciones x variables x features); persistencia si hay pocos datos"""
+        xtx = np.stack([self.stations[s]["xtx"] for s in station_names])
+        xty = np.stack([self.stations[s]["xty"] for s in station_names])
+        n = np.stack([self.stations[s]["n"] for s in station_names])
+
+        # El ridge también mantiene invertibles las series todavía sin filas completas
+        penalty = self.ridge * np.eye(self.n_features)
+        coef = np.linalg.solve(xtx + penalty, xty[..., None])[..., 0]
+
+        persistence = np.zeros(self.n_features)
+        persistence[1] = 1.0
+        return np.where((n >= self.min_rows)[..., None], coef, persistence)
+
+    def forecast(self, horizon=FORECAST_HORIZON, stations=None):
+        """
+        Pronosticar todas las estaciones y variables en una sola recursión vectorizada
+
+        Returns:
+            Dict con "stations", "timestamp" (estaciones x horizonte) y un array
+            (estaciones x horizonte) por variable
+        """
+        station_names = [s for s in (stations or sorted(self.stations))
+                         if s in self.stations and self.stations[s]["last_ts"] is not None]
+        result = {"stations": station_names}
+        if not station_names:
+            result["timestamp"] = np.empty((0, horizon))
+            for variable in self.variables:
+                result[variable] = np.empty((0, horizon))
+            return result
+
+        coef = self.coefficients(station_names)                                  # (S, V, p)
+        recent = np.stack([self.stations[s]["recent"] for s in station_names])   # (S, V, lags)
+        last_ts = np.array([self.stations[s]["last_ts"] for s in station_names])
+
+        # Completar lags faltantes con el último valor conocido de cada serie
+        recent = self._fill_missing(recent)
+
+        steps = np.arange(1, horizon + 1)
+        target_ts = last_ts[:, None] + steps[None, :] * self.step_seconds       # (S, H)
+        sin_t, cos_t = self._daily_terms(target_ts)
+
+        lags = recent[..., ::-1].copy()     # y_{t-1}, ..., y_{t-lags}
+        predictions = np.empty(recent.shape[:2] + (horizon,))
+        for h in range(horizon):
+            value = (coef[..., 0]
+                     + np.einsum('svk,svk->sv', coef[..., 1:1 + self.lags], lags)
+                     + coef[..., -2] * sin_t[:, h, None]
+                     + coef[..., -1] * cos_t[:, h, None])
+            predictions[..., h] = value
+            lags = np.concatenate([value[..., None], lags[..., :-1]], axis=-1)
+
+        result["timestamp"] = target_ts
+        for i, variable in enumerate(self.variables):
+            result[variable] = predictions[:, i, :]
+        return result
+
+    @staticmethod
+    def _fill_missing(recent):
+        """Reemplazar NaN por el último valor válido anterior (o la media de los lags)"""
+        filled = recent.copy()
+        valid = np.isfinite(filled)
+        counts = valid.sum(axis=-1)
+        means = np.where(valid, filled, 0.0).sum(axis=-1) / np.maximum(counts, 1)
+        means = np.where(counts > 0, means, np.nan)  # Variable nunca observada: sin pronóstico
+        for k in range(filled.shape[-1]):
+            previous = filled[..., k - 1] if k else means
+            filled[..., k] = np.where(np.isfinite(filled[..., k]), filled[..., k], previous)
+        return filled
+
+    def get_state(self):
+        """Estado serializable (para CacheManager)"""
+        return {
+            "variables": self.variables,
+            "lags": self.lags,
+            "step_seconds": self.step_seconds,
+            "ridge": self.ridge,
+            "stations": self.stations,
+            "updated_at": self.updated_at,
+        }
+
+    @classmethod
+    def from_state(cls, state):
+        engine = cls(state["variables"], state["lags"], state["step_seconds"], state["ridge"])
+        engine.stations = state["stations"]
+        engine.updated_at = state.get("updated_at")
+        return engine
+
+
+def load_forecast_engine(cache_manager=None):
+    """Cargar el motor de pronóstico desde el cache (o crear uno nuevo)"""
+    cache_manager = cache_manager or CacheManager()
+    state = cache_manager.load_model(FORECAST_MODEL_NAME)
+    if state is not None:
+        try:
+            return ForecastEngine.from_state(state)
+        except Exception as e:
+            logger.warning(f"Estado de pronóstico inválido, se reinicia: {e}")
+    return ForecastEngine()
+
+
+def save_forecast_engine(engine, cache_manager=None):
+    """Guardar el estado del motor de pronóstico en el cache"""
+    cache_manager = cache_manager or CacheManager()
+    return cache_manager.save_model(engine.get_state(), FORECAST_MODEL_NAME, {
+        "type": "ForecastEngine",
+        "stations": len(engine.stations),
+        "variables": list(engine.variables),
+        "lags": engine.lags,
+        "step_seconds": engine.step_seconds,
+    })
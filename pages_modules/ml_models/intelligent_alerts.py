@@ -3,8 +3,14 @@
 Sistema de notificaciones automáticas basadas en ML
 """
 
+import copy
 import json
+import logging
 import os
+import queue
+import sys
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
 
 import numpy as np
@@ -15,13 +21,57 @@
 from sklearn.ensemble import IsolationForest
 from sklearn.preprocessing import StandardScaler
 
+# Agregar el directorio raíz al path para importar cache_manager
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from cache.alert_store import AlertStore
+from cache.cache_manager import CacheManager
+from config.metrics import ALERT_EVALUATION_SECONDS, ALERTS_TOTAL, timed
+from components.downsampling import downsample_frame
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Modelo de anomalías compartido entre sesiones y procesos
+ANOMALY_FEATURES = ['temperature', 'humidity', 'pressure', 'wind_speed', 'precipitation']
+ANOMALY_MODEL_NAME = "isolation_forest_anomaly_detector"
+ANOMALY_SCALER_NAME = "anomaly_data_scaler"
+ANOMALY_REFRESH_HOURS = 24  # Reentrenar el modelo compartido una vez por día
+MAX_TRACKED_STATIONS = 10_000  # Estaciones con última lectura recordada (se olvidan las menos recientes)
+
+# Valores por defecto para observaciones incompletas (ej. OpenWeatherMap sin precipitación)
+STREAMING_FEATURE_DEFAULTS = {
+    'temperature': 25.0,
+    'humidity': 65.0,
+    'pressure': 1013.0,
+    'wind_speed': 0.0,
+    'precipitation': 0.0
+}
+
+# Umbrales de severidad sobre |anomaly_score| (de mayor a menor)
+SEVERITY_LEVELS = (
+    (0.8, "CRITICAL"),
+    (0.5, "HIGH"),
+    (0.3, "MEDIUM")
+)
+DEFAULT_SEVERITY = "LOW"
+
+# Reglas de recomendación: (variable, operador, umbral, texto); el código es el bit i-ésimo
+RECOMMENDATION_RULES = (
+    ('temperature', '>', 40, "⚠️ Temperatura extrema - Evitar exposición prolongada"),
+    ('wind_speed', '>', 30, "🌪️ Viento fuerte - Evitar actividades al aire libre"),
+    ('pressure', '<', 1000, "🌧️ Baja presión - Posible cambio meteorológico"),
+    ('humidity', '>', 90, "💧 Humedad extrema - Condiciones de niebla")
+)
+DEFAULT_RECOMMENDATION = "✅ Condiciones dentro de rangos normales"
+
 class IntelligentAlertSystem:
     """Sistema de alertas inteligentes basado en ML"""
 
-    def __init__(self):
-        self.alert_history = []
-        self.anomaly_model = None
-        self.scaler = StandardScaler()
+    def __init__(self, anomaly_model=None, scaler=None, alert_store=None):
+        # Historial acotado en memoria; persistente solo si se pasa un AlertStore con base
+        self.alert_store = alert_store if alert_store is not None else AlertStore(db_path=None)
+        self.anomaly_model = anomaly_model
+        self.scaler = scaler if scaler is not None else StandardScaler()
         self.alert_thresholds = {
             'temperature': {'min': -5, 'max': 45, 'critical': 50},
             'humidity': {'min': 0, 'max': 100, 'critical': 95},
@@ -62,13 +112,15 @@ def generate_synthetic_data(self, n_samples=500):
 
         return df
 
+    @timed(ALERT_EVALUATION_SECONDS, stage="train_anomaly_detection")
     def train_anomaly_detection(self, df):
         """Entrenar modelo de detección de anomalías"""
         # Preparar datos
-        features = ['temperature', 'humidity', 'pressure', 'wind_speed', 'precipitation']
+        features = ANOMALY_FEATURES
         X = df[features]
 
-        # Escalar datos
+        # Escalar datos (scaler nuevo para no modificar uno compartido)
+        self.scaler = StandardScaler()
         X_scaled = self.scaler.fit_transform(X)
 
         # Entrenar Isolation Forest
@@ -80,13 +132,13 @@ def train_anomaly_detection(self, df):
 
         return features
 
+    @timed(ALERT_EVALUATION_SECONDS, stage="detect_anomalies")
     def detect_anomalies(self, df):
         """Detectar anomalías en nuevos datos"""
         if self.anomaly_model is None:
             return df
 
-        features = ['temperature', 'humidity', 'pressure', 'wind_speed', 'precipitation']
-        X = df[features]
+        X = df[ANOMALY_FEATURES]
         X_scaled = self.scaler.transform(X)
 
         # Predecir anomalías
@@ -102,10 +154,16 @@ def detect_anomalies(self, df):
 
         return df
 
+    @property
+    def alert_history(self):
+        """Alertas recientes retenidas en memoria (orden cronológico)"""
+        return self.alert_store.recent_alerts()
+
     def generate_alert(self, row, alert_type="ANOMALY"):
         """Generar alerta basada en anomalía detectada"""
         alert = {
             'timestamp': row['timestamp'],
+            'station': row.get('station'),
             'type': alert_type,
             'severity': self._calculate_severity(row),
             'message': self._generate_message(row),
@@ -113,21 +171,18 @@ def generate_alert(self, row, alert_type="ANOMALY"):
             'recommendations': self._get_recommendations(row)
         }
 
-        self.alert_history.append(alert)
+        self.alert_store.append(alert)
+        ALERTS_TOTAL.inc(severity=alert['severity'])
         return alert
 
     def _calculate_severity(self, row):
         """Calcular severidad de la alerta"""
         score = abs(row['anomaly_score'])
 
-        if score > 0.8:
-            return "CRITICAL"
-        elif score > 0.5:
-            return "HIGH"
-        elif score > 0.3:
-            return "MEDIUM"
-        else:
-            return "LOW"
+        for threshold, severity in SEVERITY_LEVELS:
+            if score > threshold:
+                return severity
+        return DEFAULT_SEVERITY
 
     def _generate_message(self, row):
         """Generar mensaje de alerta personalizado"""
@@ -157,32 +212,379 @@ def _get_recommendations(self, row):
         """Generar recomendaciones basadas en anomalías detectadas"""
         recommendations = []
 
-        if row['temperature'] > 40:
-            recommendations.append("⚠️ Temperatura extrema - Evitar exposición prolongada")
+        for var, operator, threshold, text in RECOMMENDATION_RULES:
+            value = row[var]
+            if (value > threshold) if operator == '>' else (value < threshold):
+                recommendations.append(text)
 
-        if row['wind_speed'] > 30:
-            recommendations.append("🌪️ Viento fuerte - Evitar actividades al aire libre")
+        if not recommendations:
+            recommendations.append(DEFAULT_RECOMMENDATION)
 
-        if row['pressure'] < 1000:
-            recommendations.append("🌧️ Baja presión - Posible cambio meteorológico")
+        return recommendations
 
-        if row['humidity'] > 90:
-            recommendations.append("💧 Humedad extrema - Condiciones de niebla")
+    # ===== Ruta vectorizada (DataFrames completos) =====
+
+    def severity_vectorized(self, df):
+        """Severidad de cada fila calculada con operaciones de columna"""
+        scores = np.abs(df['anomaly_score'].to_numpy(dtype=float))
+        conditions = [scores > threshold for threshold, _ in SEVERITY_LEVELS]
+        choices = [severity for _, severity in SEVERITY_LEVELS]
+        return np.select(conditions, choices, default=DEFAULT_SEVERITY)
+
+    def anomalous_variables_mask(self, df):
+        """
+        Máscara booleana (filas x variables) de valores fuera de umbrales
+
+        Returns:
+            Tupla (lista de variables evaluadas, matriz booleana)
+        """
+        variables = [var for var in self.alert_thresholds if var in df.columns]
+        mask = np.zeros((len(df), len(variables)), dtype=bool)
+
+        for j, var in enumerate(variables):
+            thresholds = self.alert_thresholds[var]
+            values = df[var].to_numpy(dtype=float)
+            mask[:, j] = ((values < thresholds['min']) |
+                          (values > thresholds['max']) |
+                          (values > thresholds.get('critical', np.inf)))
+
+        return variables, mask
+
+    def recommendation_codes(self, df):
+        """Códigos de recomendación por fila (bit i = regla i de RECOMMENDATION_RULES)"""
+        codes = np.zeros(len(df), dtype=np.int64)
+
+        for bit, (var, operator, threshold, _) in enumerate(RECOMMENDATION_RULES):
+            values = df[var].to_numpy(dtype=float)
+            hits = values > threshold if operator == '>' else values < threshold
+            codes |= hits.astype(np.int64) << bit
+
+        return codes
+
+    @staticmethod
+    def _recommendations_for_code(code):
+        """Traducir un código de recomendación a la lista de textos"""
+        texts = [rule[3] for bit, rule in enumerate(RECOMMENDATION_RULES) if code >> bit & 1]
+        return texts or [DEFAULT_RECOMMENDATION]
+
+    @timed(ALERT_EVALUATION_SECONDS, stage="generate_alerts")
+    def generate_alerts_vectorized(self, df, alert_type="ANOMALY", rows=None):
+        """
+        Generar alertas para un DataFrame completo con operaciones vectorizadas
+
+        Produce las mismas alertas que llamar a generate_alert() fila por fila.
+
+        Args:
+            df: DataFrame con timestamp, anomaly_score y variables meteorológicas
+            alert_type: Tipo de alerta
+            rows: Máscara booleana de filas a alertar (por defecto is_anomaly_predicted)
+
+        Returns:
+            Lista de alertas (dicts), registradas también en el historial
+        """
+        if rows is None:
+            rows = df['is_anomaly_predicted'] if 'is_anomaly_predicted' in df.columns else None
+        if rows is not None:
+            df = df[np.asarray(rows, dtype=bool)]
+        if df.empty:
+            return []
+
+        severities = self.severity_vectorized(df)
+        variables, mask = self.anomalous_variables_mask(df)
+        recommendation_codes = self.recommendation_codes(df)
+
+        # Codificar la máscara de variables como entero para reutilizar listas y mensajes
+        weights = 1 << np.arange(len(variables), dtype=np.int64)
+        variable_codes = mask.astype(np.int64) @ weights if variables else np.zeros(len(df), np.int64)
+        variable_counts = mask.sum(axis=1)
+        single_index = mask.argmax(axis=1) if variables else variable_counts
+
+        variables_by_code = {}
+        recommendations_by_code = {}
+        values = {var: df[var].to_numpy() for var in variables}
+        timestamps = df['timestamp'].tolist()
+        stations = df['station'].tolist() if 'station' in df.columns else [None] * len(df)
+
+        alerts = []
+        for i in range(len(df)):
+            variable_code = int(variable_codes[i])
+            if variable_code not in variables_by_code:
+                variables_by_code[variable_code] = [
+                    var for bit, var in enumerate(variables) if variable_code >> bit & 1
+                ]
+            anomalous = variables_by_code[variable_code]
+
+            if variable_counts[i] == 1:
+                var = variables[single_index[i]]
+                message = f"Anomalía detectada en {var}: {values[var][i]:.1f}"
+            else:
+                message = f"Anomalías múltiples detectadas en: {', '.join(anomalous)}"
+
+            recommendation_code = int(recommendation_codes[i])
+            if recommendation_code not in recommendations_by_code:
+                recommendations_by_code[recommendation_code] = (
+                    self._recommendations_for_code(recommendation_code)
+                )
+
+            alerts.append({
+                'timestamp': timestamps[i],
+                'station': stations[i],
+                'type': alert_type,
+                'severity': str(severities[i]),
+                'message': message,
+                'variables': list(anomalous),
+                'recommendations': list(recommendations_by_code[recommendation_code])
+            })
+
+        self.alert_store.extend(alerts)
+        for severity, count in zip(*np.unique(severities, return_counts=True)):
+            ALERTS_TOTAL.inc(int(count), severity=str(severity))
+        return alerts
+
+class StreamingAnomalyDetector:
+    """
+    Detección de anomalías incremental sobre observaciones entrantes
+
+    Consume observaciones de a una o en micro-lotes, mantiene estadísticas de
+    escalado acumuladas (media/varianza) y puntúa solo los puntos nuevos contra
+    el modelo compartido. Las alertas se emiten por callback y por una cola.
+    """
+
+    def __init__(self, anomaly_model, scaler, on_alert=None, alert_queue=None,
+                 max_queue_size=1000, alert_store=None, max_tracked_stations=MAX_TRACKED_STATIONS):
+        """
+        Args:
+            anomaly_model: IsolationForest ya entrenado (solo lectura)
+            scaler: StandardScaler de referencia; se copia para acumular estadísticas
+            on_alert: Callback opcional invocado con cada alerta
+            alert_queue: Cola donde publicar alertas (se crea una si no se indica)
+            max_queue_size: Tamaño máximo de la cola creada por defecto
+            alert_store: AlertStore donde registrar las alertas emitidas
+            max_tracked_stations: Estaciones cuya última lectura se recuerda para descartar repetidas
+        """
+        self.anomaly_model = anomaly_model
+        # Copia propia: partial_fit no debe modificar el scaler compartido
+        self.scaler = copy.deepcopy(scaler)
+        self.alert_system = IntelligentAlertSystem(anomaly_model, self.scaler, alert_store)
+        self.on_alert = on_alert
+        self.alert_queue = alert_queue if alert_queue is not None else queue.Queue(max_queue_size)
+        self.processed_count = 0
+        self.skipped_count = 0
+        self.max_tracked_stations = max_tracked_stations
+        self._last_seen = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _to_frame(self, observations, station=None):
+        """Normalizar observaciones (dict, lista de dicts o DataFrame) a DataFrame"""
+        if isinstance(observations, pd.DataFrame):
+            df = observations.copy()
+        elif isinstance(observations, dict):
+            df = pd.DataFrame([observations])
+        else:
+            df = pd.DataFrame(list(observations))
 
-        if not recommendations:
-            recommendations.append("✅ Condiciones dentro de rangos normales")
+        for feature, default in STREAMING_FEATURE_DEFAULTS.items():
+            if feature not in df.columns:
+                df[feature] = default
+            else:
+                df[feature] = pd.to_numeric(df[feature], errors='coerce').fillna(default)
+
+        if 'timestamp' not in df.columns:
+            df['timestamp'] = datetime.now()
+        if 'station' not in df.columns:
+            df['station'] = station
+
+        return df.reset_index(drop=True)
+
+    def _drop_unchanged(self, df):
+        """Descartar lecturas repetidas de una estación (re-polling sin datos nuevos)"""
+        keep = []
+        for idx, (station, values) in enumerate(zip(df['station'],
+                                                    df[ANOMALY_FEATURES].itertuples(index=False))):
+            values = tuple(values)
+            if station is not None and self._last_seen.get(station) == values:
+                continue
+            if station is not None:
+                self._last_seen[station] = values
+                self._last_seen.move_to_end(station)
+                if len(self._last_seen) > self.max_tracked_stations:
+                    self._last_seen.popitem(last=False)
+            keep.append(idx)
+
+        self.skipped_count += len(df) - len(keep)
+        return df.iloc[keep].reset_index(drop=True)
+
+    def _emit(self, alert):
+        """Publicar alerta en callback y cola (descartando la más antigua si está llena)"""
+        if self.on_alert is not None:
+            try:
+                self.on_alert(alert)
+            except Exception as e:
+                logger.warning(f"Error en callback de alertas: {e}")
 
-        return recommendations
+        try:
+            self.alert_queue.put_nowait(alert)
+        except queue.Full:
+            try:
+                self.alert_queue.get_nowait()
+            except queue.Empty:
+                pass
+            self.alert_queue.put_nowait(alert)
+
+    def process(self, observation, station=None):
+        """Procesar una única observación"""
+        return self.process_batch([observation], station=station)
+
+    def process_batch(self, observations, station=None):
+        """
+        Procesar un micro-lote de observaciones
+
+        Args:
+            observations: dict, lista de dicts o DataFrame con variables meteorológicas
+            station: Estación por defecto si las observaciones no la incluyen
+
+        Returns:
+            Lista de alertas generadas para las observaciones anómalas
+        """
+        df = self._to_frame(observations, station)
+
+        with self._lock:
+            df = self._drop_unchanged(df)
+            if df.empty:
+                return []
+
+            # DataFrame: el scaler compartido se ajustó con nombres de columnas y los verifica
+            X = df[ANOMALY_FEATURES].astype(float)
+
+            # Actualizar estadísticas acumuladas y escalar solo los puntos nuevos
+            self.scaler.partial_fit(X)
+            X_scaled = self.scaler.transform(X)
+
+            try:
+                anomaly_scores = self.anomaly_model.decision_function(X_scaled)
+                is_anomaly = anomaly_scores < 0
+            except AttributeError:
+                # Fallback para versiones sin offset_
+                anomaly_scores = self.anomaly_model.score_samples(X_scaled)
+                is_anomaly = self.anomaly_model.predict(X_scaled) == -1
+
+            df['anomaly_score'] = anomaly_scores
+            df['is_anomaly_predicted'] = is_anomaly
+            self.processed_count += len(df)
+
+            alerts = self.alert_system.generate_alerts_vectorized(df, alert_type="STREAMING")
+
+        for alert in alerts:
+            self._emit(alert)
+
+        return alerts
+
+    def drain_alerts(self, max_items=None):
+        """Extraer alertas pendientes de la cola"""
+        alerts = []
+        while max_items is None or len(alerts) < max_items:
+            try:
+                alerts.append(self.alert_queue.get_nowait())
+            except queue.Empty:
+                break
+        return alerts
+
+def _is_stale(metadata, refresh_hours):
+    """Verificar si el modelo persistido superó su ventana de refresco"""
+    if not metadata or "created_at" not in metadata:
+        return True
+
+    try:
+        created_at = datetime.fromisoformat(metadata["created_at"])
+    except (TypeError, ValueError):
+        return True
+
+    return datetime.now() - created_at > timedelta(hours=refresh_hours)
+
+def train_shared_anomaly_detector(cache_manager=None):
+    """
+    Entrenar el modelo de anomalías compartido y persistirlo en cache
+
+    Returns:
+        Tupla (modelo, scaler) recién entrenados
+    """
+    cache_manager = cache_manager or CacheManager()
+
+    trainer = IntelligentAlertSystem()
+    df = trainer.generate_synthetic_data(500)
+    trainer.train_anomaly_detection(df)
+
+    metadata = {
+        "model_type": "IsolationForest",
+        "features": ANOMALY_FEATURES,
+        "training_samples": len(df),
+        "refresh_hours": ANOMALY_REFRESH_HOURS
+    }
+    cache_manager.save_model(trainer.anomaly_model, ANOMALY_MODEL_NAME, dict(metadata))
+    cache_manager.save_model(trainer.scaler, ANOMALY_SCALER_NAME, dict(metadata))
+
+    return trainer.anomaly_model, trainer.scaler
+
+@st.cache_resource(ttl=ANOMALY_REFRESH_HOURS * 3600, show_spinner=False)
+def get_shared_anomaly_detector():
+    """
+    Obtener el modelo de anomalías compartido (solo lectura)
+
+    Se entrena una única vez, se persiste con CacheManager y se comparte entre
+    todas las sesiones del proceso. Otros procesos lo reutilizan desde disco
+    mientras no supere ANOMALY_REFRESH_HOURS.
+
+    Returns:
+        Tupla (modelo, scaler)
+    """
+    cache_manager = CacheManager()
+    metadata = cache_manager.get_model_metadata(ANOMALY_MODEL_NAME)
+
+    if not _is_stale(metadata, ANOMALY_REFRESH_HOURS):
+        anomaly_model = cache_manager.load_model(ANOMALY_MODEL_NAME)
+        scaler = cache_manager.load_model(ANOMALY_SCALER_NAME)
+        if anomaly_model is not None and scaler is not None:
+            return anomaly_model, scaler
+
+    return train_shared_anomaly_detector(cache_manager)
+
+@st.cache_resource(show_spinner=False)
+def get_alert_store():
+    """Obtener el almacén persistente de alertas compartido por todo el proceso"""
+    return AlertStore()
+
+@st.cache_resource(ttl=ANOMALY_REFRESH_HOURS * 3600, show_spinner=False)
+def get_streaming_detector():
+    """Obtener el detector en streaming compartido por todo el proceso"""
+    anomaly_model, scaler = get_shared_anomaly_detector()
+    return StreamingAnomalyDetector(anomaly_model, scaler, alert_store=get_alert_store())
+
+def feed_streaming_observations(observations, station=None):
+    """
+    Alimentar el detector en streaming desde los fetchers meteorológicos
+
+    Returns:
+        Lista de alertas generadas (vacía si el detector no está disponible)
+    """
+    try:
+        return get_streaming_detector().process_batch(observations, station=station)
+    except Exception as e:
+        logger.warning(f"Detección en streaming no disponible: {e}")
+        return []
 
 def show_intelligent_alerts():
     """Mostrar sistema de alertas inteligentes"""
 
+    # Modelo compartido entre sesiones; el historial de alertas es por sesión
+    with st.spinner("Cargando modelo de detección de anomalías..."):
+        anomaly_model, scaler = get_shared_anomaly_detector()
 
-    # Inicializar sistema de alertas
     if 'alert_system' not in st.session_state:
         st.session_state.alert_system = IntelligentAlertSystem()
 
     alert_system = st.session_state.alert_system
+    alert_system.anomaly_model = anomaly_model
+    alert_system.scaler = scaler
 
     # Generar y mostrar datos
     st.markdown("### 📊 Datos Meteorológicos en Tiempo Real")
@@ -190,12 +592,6 @@ def show_intelligent_alerts():
     # Generar datos sintéticos
     df = alert_system.generate_synthetic_data(100)
 
-    # Entrenar modelo si no está entrenado
-    if alert_system.anomaly_model is None:
-        with st.spinner("Entrenando modelo de detección de anomalías..."):
-            features = alert_system.train_anomaly_detection(df)
-            st.success("✅ Modelo entrenado exitosamente")
-
     # Detectar anomalías
     df_with_anomalies = alert_system.detect_anomalies(df)
 
@@ -216,6 +612,15 @@ def show_intelligent_alerts():
     with col4:
         st.metric("Modelo Activo", "Isolation Forest")
 
+    # Alertas para todas las anomalías en una sola pasada vectorizada
+    generated_alerts = alert_system.generate_alerts_vectorized(df_with_anomalies)
+    if generated_alerts:
+        with st.expander(f"🚨 Alertas Generadas ({len(generated_alerts)})"):
+            st.dataframe(
+                pd.DataFrame(generated_alerts)[['timestamp', 'severity', 'message']],
+                use_container_width=True
+            )
+
     # Visualización de anomalías
 
     # Gráfico de dispersión con anomalías
@@ -243,8 +648,11 @@ def show_intelligent_alerts():
 
     fig_time = go.Figure()
 
-    # Datos normales
-    normal_data = df_with_anomalies[~df_with_anomalies['is_anomaly_predicted']]
+    # Datos normales (reducidos con LTTB; las anomalías se grafican todas)
+    normal_data = downsample_frame(
+        df_with_anomalies[~df_with_anomalies['is_anomaly_predicted']], [variable],
+        x_column='timestamp', series_key=("anomalias_normales", variable)
+    )
     fig_time.add_trace(go.Scatter(
         x=normal_data['timestamp'],
         y=normal_data[variable],
@@ -273,3 +681,48 @@ def show_intelligent_alerts():
 
     st.plotly_chart(fig_time, use_container_width=True)
 
+
+    # Alertas generadas por el detector en streaming (alimentado por el mapa)
+    st.markdown("### 🛰️ Detección en Streaming")
+
+    detector = get_streaming_detector()
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.metric("Observaciones Procesadas", detector.processed_count)
+
+    with col2:
+        st.metric("Lecturas Repetidas Omitidas", detector.skipped_count)
+
+    with col3:
+        st.metric("Alertas en Cola", detector.alert_queue.qsize())
+
+    # Consulta indexada sobre el historial persistente
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        severity_filter = st.selectbox(
+            "Severidad:", ["Todas", "CRITICAL", "HIGH", "MEDIUM", "LOW"], key="alert_severity_filter"
+        )
+
+    with col2:
+        station_filter = st.text_input("Estación:", value="", key="alert_station_filter")
+
+    with col3:
+        hours_filter = st.selectbox("Últimas horas:", [1, 6, 24, 168], index=1,
+                                    key="alert_hours_filter")
+
+    stored_alerts = get_alert_store().query(
+        station=station_filter or None,
+        severity=None if severity_filter == "Todas" else severity_filter,
+        since=datetime.now() - timedelta(hours=hours_filter),
+        limit=50
+    )
+    if stored_alerts:
+        st.dataframe(
+            pd.DataFrame(stored_alerts)[['timestamp', 'station', 'severity', 'message']],
+            use_container_width=True
+        )
+    else:
+        st.info("Sin alertas en streaming. Las observaciones del mapa se procesan automáticamente.")
@@ -3,6 +3,9 @@
 Implementa validación robusta usando Darts + Scikit-learn
 """
 
+import importlib.util
+import os
+import sys
 import warnings
 from datetime import datetime, timedelta
 
@@ -15,17 +18,16 @@
 from sklearn.model_selection import TimeSeriesSplit, cross_val_score
 from sklearn.preprocessing import StandardScaler
 
+# Agregar el directorio raíz al path para importar el motor de riesgo
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+from pages_modules.ml_models.storm_risk import TRAINING_STORM_ENGINE
+
 warnings.filterwarnings('ignore')
 
-# Importar Darts (con manejo de errores)
-try:
-    from darts import TimeSeries
-    from darts.models import ARIMA, ExponentialSmoothing, LinearRegressionModel
-    from darts.metrics import mae, mse, mape, r2_score as darts_r2
-    from darts.utils.callbacks import TFMProgressBar
-    DARTS_AVAILABLE = True
-except ImportError:
-    DARTS_AVAILABLE = False
+# Detectar Darts sin importarlo: la validación solo usa el flag y la importación
+# completa (torch, statsmodels...) agrega varios segundos al arranque
+DARTS_AVAILABLE = importlib.util.find_spec("darts") is not None
+if not DARTS_AVAILABLE:
     st.warning("⚠️ Darts no está instalado. Instalando validación básica con Scikit-learn.")
 
 @st.cache_data(ttl=3600, show_spinner=False)  # Cache 1 hora para validación de modelos
@@ -86,14 +88,13 @@ def show_model_validation():
     cloud_cover = np.random.uniform(0, 100, n_samples)
 
     # Crear variable objetivo (probabilidad de tormenta)
-    storm_probability = (
-        0.3 * (temperature > 30).astype(int) +
-        0.4 * (humidity > 80).astype(int) +
-        0.2 * (pressure < 1000).astype(int) +
-        0.3 * (wind_speed > 20).astype(int) +
-        0.2 * (cloud_cover > 70).astype(int) +
-        np.random.normal(0, 0.1, n_samples)
-    )
+    storm_probability = TRAINING_STORM_ENGINE.score({
+        'temperature': temperature,
+        'humidity': humidity,
+        'pressure': pressure,
+        'wind_speed': wind_speed,
+        'cloud_cover': cloud_cover
+    }, clip=False) + np.random.normal(0, 0.1, n_samples)
     storm_probability = np.clip(storm_probability, 0, 1)
 
     # Crear DataFrame
@@ -0,0 +1,177 @@
+"""
+Motor de Riesgo de Tormenta para CorAlertMet Intelligence
+Evalúa las reglas meteorológicas sobre arrays (estaciones x pasos de tiempo) en una sola pasada
+"""
+
+import numpy as np
+
+# Reglas: (variable, operador, umbral, peso)
+# Reglas del dashboard principal (nivel de alerta para pilotos)
+DASHBOARD_STORM_RULES = (
+    ('temperature', '>', 30, 0.2),    # Alta temperatura
+    ('humidity', '>', 80, 0.3),       # Alta humedad
+    ('pressure', '<', 1000, 0.25),    # Baja presión
+    ('wind_speed', '>', 20, 0.15),    # Viento fuerte
+    ('cloud_cover', '>', 70, 0.1)     # Mucha nubosidad
+)
+
+# Reglas usadas para construir la variable objetivo de entrenamiento de los modelos ML
+TRAINING_STORM_RULES = (
+    ('temperature', '>', 30, 0.3),
+    ('humidity', '>', 80, 0.4),
+    ('pressure', '<', 1000, 0.2),
+    ('wind_speed', '>', 20, 0.3),
+    ('cloud_cover', '>', 70, 0.2)
+)
+
+# Condiciones por defecto cuando una variable no está disponible
+DEFAULT_CONDITIONS = {
+    'temperature': 25,
+    'humidity': 50,
+    'pressure': 1013,
+    'wind_speed': 10,
+    'cloud_cover': 50
+}
+
+# Niveles de alerta (el índice coincide con np.searchsorted sobre ALERT_LEVEL_EDGES)
+ALERT_LEVEL_EDGES = np.array([40, 60, 80])  # Porcentaje de probabilidad
+ALERT_LEVELS = (
+    {
+        "name": "BAJO RIESGO",
+        "emoji": "🟢",
+        "color": "#10B981",
+        "text": "Condiciones normales - Vuelo seguro",
+        "recommendations": [
+            "✅ Condiciones ideales para vuelo",
+            "✅ Monitoreo estándar recomendado",
+            "✅ Sin restricciones especiales"
+        ]
+    },
+    {
+        "name": "RIESGO MODERADO",
+        "emoji": "🟡",
+        "color": "#F59E0B",
+        "text": "Monitorear condiciones - Precaución recomendada",
+        "recommendations": [
+            "⚠️ Monitorear condiciones meteorológicas",
+            "⚠️ Considerar ruta alternativa",
+        ]
+    },
+    {
+        "name": "ALTO RIESGO",
+        "emoji": "🟠",
+        "color": "#F97316",
+        "text": "Precaución recomendada - Evitar vuelo nocturno",
+        "recommendations": [
+            "🚨 Evitar vuelo nocturno",
+            "🚨 Planificar ruta de escape",
+            "🚨 Mantener combustible extra",
+            "🚨 Comunicación constante con control"
+        ]
+    },
+    {
+        "name": "ALERTA CRÍTICA",
+        "emoji": "🔴",
+        "color": "#EF4444",
+        "text": "Tormenta inminente - Evitar vuelo",
+        "recommendations": [
+            "🚫 NO VOLAR - Condiciones peligrosas",
+            "🚫 Buscar refugio inmediatamente",
+            "🚫 Mantener aeronave en hangar",
+            "🚫 Contactar autoridades meteorológicas"
+        ]
+    }
+)
+
+class StormRiskEngine:
+    """Motor vectorizado de probabilidad de tormenta basado en reglas"""
+
+    def __init__(self, rules=DASHBOARD_STORM_RULES, defaults=None):
+        """
+        Args:
+            rules: Tupla de reglas (variable, operador, umbral, peso)
+            defaults: Valores por defecto para variables faltantes
+        """
+        self.rules = tuple(rules)
+        self.defaults = dict(DEFAULT_CONDITIONS, **(defaults or {}))
+
+    def _values(self, data, variable):
+        """Obtener una variable como array (o el valor por defecto si falta)"""
+        if variable in data:
+            return np.asarray(data[variable], dtype=float)
+        return np.asarray(self.defaults[variable], dtype=float)
+
+    def score(self, data, clip=True):
+        """
+        Calcular la probabilidad de tormenta
+
+        Args:
+            data: Mapeo variable -> escalar o array (dict o DataFrame); los arrays
+                  se combinan por broadcasting (ej. estaciones x pasos de tiempo)
+            clip: Limitar el resultado a [0, 1]
+
+        Returns:
+            np.ndarray con la probabilidad (0-1) para cada punto
+        """
+        values = np.broadcast_arrays(*[self._values(data, rule[0]) for rule in self.rules])
+        probability = np.zeros(values[0].shape)
+
+        # Acumulación en el mismo orden que las reglas escalares originales
+        for (_, operator, threshold, weight), value in zip(self.rules, values):
+            hits = value > threshold if operator == '>' else value < threshold
+            probability = probability + weight * hits
+
+        return np.clip(probability, 0, 1) if clip else probability
+
+    @staticmethod
+    def level_indices(probability):
+        """Índice de nivel de alerta (0-3) para cada probabilidad"""
+        percentage = np.asarray(probability, dtype=float) * 100
+        return np.searchsorted(ALERT_LEVEL_EDGES, percentage, side='right')
+
+    def evaluate(self, data):
+        """
+        Evaluar probabilidad y nivel de alerta en una sola pasada
+
+        Returns:
+            Dict con arrays: probability, percentage, level_index, level
+        """
+        probability = self.score(data)
+        level_index = self.level_indices(probability)
+        level_names = np.array([level["name"] for level in ALERT_LEVELS])
+
+        return {
+            "probability": probability,
+            "percentage": probability * 100,
+            "level_index": level_index,
+            "level": level_names[level_index]
+        }
+
+    def rank(self, frame, id_column="station"):
+        """
+        Ordenar estaciones (u observaciones) por riesgo de tormenta descendente
+
+        Args:
+            frame: DataFrame con una fila por estación/paso de tiempo
+            id_column: Columna identificadora a conservar
+
+        Returns:
+            DataFrame con id, probabilidad (%) y nivel de alerta
+        """
+        import pandas as pd
+
+        result = self.evaluate(frame)
+        ranking = pd.DataFrame({
+            id_column: frame[id_column].to_numpy() if id_column in frame else frame.index,
+            "probability": result["percentage"],
+            "level": result["level"]
+        })
+        return ranking.sort_values("probability", ascending=False, kind="stable").reset_index(drop=True)
+
+# Instancias compartidas
+DASHBOARD_STORM_ENGINE = StormRiskEngine(DASHBOARD_STORM_RULES)
+TRAINING_STORM_ENGINE = StormRiskEngine(TRAINING_STORM_RULES)
+
+def get_alert_level(probability):
+    """Obtener metadatos del nivel de alerta para una probabilidad escalar (0-1)"""
+    return ALERT_LEVELS[int(StormRiskEngine.level_indices(probability))]
@@ -0,0 +1,307 @@
+"""
+Motor de Verificación para CorAlertMet Intelligence
+Empareja pronósticos guardados con las observaciones posteriores y mantiene
+estadísticas de error acumuladas (MAE, RMSE, sesgo, Brier) en SQLite
+"""
+
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+VERIFICATION_STEP_SECONDS = 1800       # Resolución de los buckets de observación
+PENDING_MAX_AGE_SECONDS = 3 * 86400    # Pronósticos sin observación se descartan tras 3 días
+
+# Dimensiones por las que se puede agrupar el resumen
+SCORE_DIMENSIONS = ("model", "station", "variable", "lead")
+
+
+class VerificationEngine:
+    """
+    Verificación incremental de pronósticos
+
+    - forecasts: pronósticos pendientes (uno por modelo, estación, variable, emisión y plazo)
+    - scores: sumas acumuladas por (modelo, estación, variable, plazo, tipo); las métricas se
+      derivan de las sumas, sin recorrer nunca el historial completo
+    """
+
+    def __init__(self, db_path="cache/verification/verification.db",
+                 step_seconds=VERIFICATION_STEP_SECONDS):
+        """
+        Args:
+            db_path: Ruta de la base SQLite (":memory:" para pruebas)
+            step_seconds: Resolución usada para emparejar pronóstico y observación
+        """
+        self.db_path = db_path
+        self.step_seconds = float(step_seconds)
+        self._lock = threading.Lock()
+        self._conn = None
+        self._open_database()
+
+    def _open_database(self):
+        """Abrir la base SQLite y crear tablas e índices si no existen"""
+        try:
+            if self.db_path != ":memory:":
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS forecasts (
+                    model TEXT NOT NULL,
+                    station TEXT NOT NULL,
+                    variable TEXT NOT NULL,
+                    issued_at REAL NOT NULL,
+                    lead INTEGER NOT NULL,
+                    valid_ts REAL NOT NULL,
+                    value REAL NOT NULL,
+                    kind TEXT NOT NULL DEFAULT 'value',
+                    PRIMARY KEY (model, station, variable, issued_at, lead)
+                );
+                CREATE INDEX IF NOT EXISTS idx_forecasts_valid ON forecasts (valid_ts);
+                CREATE TABLE IF NOT EXISTS scores (
+                    model TEXT NOT NULL,
+                    station TEXT NOT NULL,
+                    variable TEXT NOT NULL,
+                    lead INTEGER NOT NULL,
+                    kind TEXT NOT NULL DEFAULT 'value',
+                    n INTEGER NOT NULL,
+                    sum_error REAL NOT NULL,
+                    sum_abs_error REAL NOT NULL,
+                    sum_sq_error REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (model, station, variable, lead, kind)
+                );
+            """)
+            self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Error abriendo base de verificación {self.db_path}: {e}")
+            self._conn = None
+
+    def record_forecasts(self, model, forecasts, variables=None, kind="value"):
+        """
+        Guardar un lote de pronósticos para verificarlos cuando llegue la observación
+
+        Args:
+            model: Nombre del modelo
+            forecasts: Dict con "stations", "timestamp" (estaciones x plazo) y un array
+                       (estaciones x plazo) por variable (formato de ForecastEngine.forecast)
+            variables: Variables a registrar (None = todas las presentes)
+            kind: "value" o "probability" (probabilidades 0-1; habilita el puntaje de Brier)
+
+        Returns:
+            Cantidad de pronósticos nuevos guardados
+        """
+        if self._conn is None or not forecasts.get("stations"):
+            return 0
+
+        valid_ts = np.asarray(forecasts["timestamp"], dtype=np.float64)
+        # La emisión es el paso anterior al primer plazo; re-registrar el mismo lote no duplica
+        issued_at = valid_ts[:, 0] - self.step_seconds
+        leads = np.arange(1, valid_ts.shape[1] + 1)
+        variables = variables or [k for k in forecasts if k not in ("stations", "timestamp")]
+
+        rows = []
+        for variable in variables:
+            values = np.asarray(forecasts[variable], dtype=np.float64)
+            station_idx, lead_idx = np.nonzero(np.isfinite(values))
+            rows.extend(zip(
+                [model] * len(station_idx),
+                [forecasts["stations"][i] for i in station_idx],
+                [variable] * len(station_idx),
+                issued_at[station_idx].tolist(),
+                leads[lead_idx].tolist(),
+                valid_ts[station_idx, lead_idx].tolist(),
+                values[station_idx, lead_idx].tolist(),
+                [kind] * len(station_idx)
+            ))
+
+        try:
+            with self._lock:
+                before = self._conn.total_changes
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO forecasts "
+                    "(model, station, variable, issued_at, lead, valid_ts, value, kind) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+                )
+                self._conn.commit()
+                return self._conn.total_changes - before
+        except sqlite3.Error as e:
+            logger.error(f"Error guardando pronósticos de {model}: {e}")
+            return 0
+
+    def update(self, matched):
+        """
+        Sumar errores ya emparejados a las estadísticas acumuladas
+
+        Args:
+            matched: DataFrame con model, station, variable, lead, kind, forecast y observed
+        """
+        if self._conn is None or matched.empty:
+            return 0
+
+        matched = matched.assign(error=matched["forecast"] - matched["observed"])
+        grouped = matched.groupby(["model", "station", "variable", "lead", "kind"], sort=False).agg(
+            n=("error", "size"),
+            sum_error=("error", "sum"),
+            sum_abs_error=("error", lambda e: np.abs(e).sum()),
+            sum_sq_error=("error", lambda e: np.square(e).sum())
+        ).reset_index()
+        now = datetime.now().timestamp()
+
+        rows = [
+            (r.model, r.station, r.variable, int(r.lead), r.kind, int(r.n), float(r.sum_error),
+             float(r.sum_abs_error), float(r.sum_sq_error), now)
+            for r in grouped.itertuples(index=False)
+        ]
+        try:
+            with self._lock:
+                self._conn.executemany("""
+                    INSERT INTO scores (model, station, variable, lead, kind, n, sum_error,
+                                        sum_abs_error, sum_sq_error, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (model, station, variable, lead, kind) DO UPDATE SET
+                        n = n + excluded.n,
+                        sum_error = sum_error + excluded.sum_error,
+                        sum_abs_error = sum_abs_error + excluded.sum_abs_error,
+                        sum_sq_error = sum_sq_error + excluded.sum_sq_error,
+                        updated_at = excluded.updated_at
+                """, rows)
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Error actualizando estadísticas de verificación: {e}")
+            return 0
+        return len(matched)
+
+    def verify(self, store, now=None):
+        """
+        Emparejar los pronósticos vencidos con las observaciones del almacén
+
+        Args:
+            store: ObservationStore con el historial observado
+            now: Instante de referencia (epoch)
+
+        Returns:
+            Cantidad de pares pronóstico/observación incorporados
+        """
+        if self._conn is None:
+            return 0
+
+        now = datetime.now().timestamp() if now is None else now
+        # Solo pronósticos cuyo bucket de observación ya está completo
+        cutoff = now - self.step_seconds
+        try:
+            with self._lock:
+                pending = pd.read_sql_query(
+                    "SELECT rowid, model, station, variable, lead, valid_ts, value, kind "
+                    "FROM forecasts WHERE valid_ts <= ?", self._conn, params=(cutoff,)
+                )
+        except (sqlite3.Error, pd.errors.DatabaseError) as e:
+            logger.error(f"Error leyendo pronósticos pendientes: {e}")
+            return 0
+
+        if pending.empty:
+            return 0
+
+        pending["observed"] = np.nan
+        bucket = np.floor(pending["valid_ts"].to_numpy() / self.step_seconds) * self.step_seconds
+        for station, group in pending.groupby("station", sort=False):
+            variables = tuple(group["variable"].unique())
+            history = store.downsample(station, int(self.step_seconds),
+                                       since=float(bucket[group.index].min()),
+                                       until=float(bucket[group.index].max()) + self.step_seconds,
+                                       variables=variables)
+            if len(history["timestamp"]) == 0:
+                continue
+            position = np.searchsorted(history["timestamp"], bucket[group.index])
+            position = np.minimum(position, len(history["timestamp"]) - 1)
+            found = history["timestamp"][position] == bucket[group.index]
+            for variable in variables:
+                mask = (group["variable"] == variable).to_numpy() & found
+                pending.loc[group.index[mask], "observed"] = history[variable][position[mask]]
+
+        matched = pending[np.isfinite(pending["observed"])]
+        expired = pending["valid_ts"] < now - PENDING_MAX_AGE_SECONDS
+        done = pending.loc[np.isfinite(pending["observed"]) | expired, "rowid"]
+
+        added = self.update(matched.rename(columns={"value": "forecast"}))
+        try:
+            with self._lock:
+                self._conn.executemany("DELETE FROM forecasts WHERE rowid = ?",
+                                       [(int(r),) for r in done])
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Error depurando pronósticos verificados: {e}")
+        return added
+
+    def summary(self, group_by=("model", "lead"), model=None, station=None, variable=None):
+        """
+        Métricas de verificación agregadas desde las sumas acumuladas
+
+        Args:
+            group_by: Dimensiones del resumen (de SCORE_DIMENSIONS)
+            model, station, variable: Filtros opcionales
+
+        Returns:
+            DataFrame con n, mae, rmse, bias y brier (solo pronósticos de probabilidad)
+        """
+        columns = [c for c in group_by if c in SCORE_DIMENSIONS]
+        clauses, params = [], []
+        for name, value in (("model", model), ("station", station), ("variable", variable)):
+            if value is not None:
+                clauses.append(f"{name} = ?")
+                params.append(value)
+
+        select = ", ".join(columns + [
+            "SUM(n) AS n",
+            "SUM(sum_abs_error) / SUM(n) AS mae",
+            "SUM(sum_sq_error) / SUM(n) AS mse",
+            "SUM(sum_error) / SUM(n) AS bias",
+            "SUM(CASE WHEN kind = 'probability' THEN sum_sq_error END) / "
+            "SUM(CASE WHEN kind = 'probability' THEN n END) AS brier",
+        ])
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        group = f"GROUP BY {', '.join(columns)} ORDER BY {', '.join(columns)}" if columns else ""
+        sql = f"SELECT {select} FROM scores {where} {group}"  # nosec B608
+
+        if self._conn is None:
+            return pd.DataFrame(columns=columns + ["n", "mae", "rmse", "bias", "brier"])
+        try:
+            with self._lock:
+                result = pd.read_sql_query(sql, self._conn, params=params)
+        except (sqlite3.Error, pd.errors.DatabaseError) as e:
+            logger.error(f"Error consultando verificación: {e}")
+            return pd.DataFrame(columns=columns + ["n", "mae", "rmse", "bias", "brier"])
+
+        result["mse"] = np.sqrt(result["mse"])
+        return result.rename(columns={"mse": "rmse"})
+
+    def model_scores(self, metric="mae", variable=None):
+        """Puntaje por modelo (dict), ej. para EnsembleBlender.update_from_scores"""
+        summary = self.summary(group_by=("model",), variable=variable)
+        return dict(zip(summary["model"], summary[metric]))
+
+    def pending_count(self):
+        """Cantidad de pronósticos esperando observación"""
+        if self._conn is None:
+            return 0
+        try:
+            with self._lock:
+                return int(self._conn.execute("SELECT COUNT(*) FROM forecasts").fetchone()[0])
+        except sqlite3.Error as e:
+            logger.error(f"Error contando pronósticos pendientes: {e}")
+            return 0
+
+    def close(self):
+        """Cerrar la conexión a la base"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
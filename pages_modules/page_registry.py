@@ -0,0 +1,126 @@
+"""
+Registro de páginas con carga diferida para CorAlertMet Intelligence
+Cada página (y sus dependencias pesadas) se importa recién la primera vez que se navega a ella
+"""
+import importlib
+import logging
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import streamlit as st
+
+# Configurar logging
+logger = logging.getLogger(__name__)
+
+# Dependencias pesadas que se informan en el reporte cuando las trae una página
+HEAVY_DEPENDENCIES = (
+    "darts", "sklearn", "plotly", "folium", "streamlit_folium", "scipy", "torch", "pandas"
+)
+
+# Reporte de importaciones del proceso (las importaciones ocurren una sola vez por proceso)
+_import_report: List[Dict[str, Any]] = []
+_report_lock = threading.Lock()
+
+
+def timed_import(module_name: str, attribute: Optional[str] = None) -> Any:
+    """
+    Importar un módulo midiendo el tiempo y las dependencias pesadas que agrega
+
+    Args:
+        module_name: Módulo a importar (ej. "pages_modules.map_live")
+        attribute: Atributo a devolver del módulo (ej. "main"); None devuelve el módulo
+
+    Returns:
+        Módulo o atributo importado
+
+    Raises:
+        ImportError: Si el módulo o el atributo no existen
+    """
+    already_loaded = module_name in sys.modules
+    modules_before = set(sys.modules)
+    start = time.perf_counter()
+
+    module = importlib.import_module(module_name)
+
+    if not already_loaded:
+        elapsed = time.perf_counter() - start
+        new_packages = {name.split(".")[0] for name in set(sys.modules) - modules_before}
+        entry = {
+            "module": module_name,
+            "seconds": round(elapsed, 3),
+            "new_modules": len(set(sys.modules) - modules_before),
+            "heavy_dependencies": sorted(new_packages.intersection(HEAVY_DEPENDENCIES)),
+            "loaded_at": time.strftime("%Y-%m-%d %H:%M:%S")
+        }
+        with _report_lock:
+            _import_report.append(entry)
+        logger.info(f"Importado {module_name} en {elapsed:.3f}s "
+                    f"(dependencias pesadas: {entry['heavy_dependencies'] or 'ninguna'})")
+
+    if attribute is None:
+        return module
+    try:
+        return getattr(module, attribute)
+    except AttributeError as e:
+        raise ImportError(f"{module_name} no define {attribute}") from e
+
+
+def get_import_report() -> List[Dict[str, Any]]:
+    """Copia del reporte de importaciones (en orden de carga)"""
+    with _report_lock:
+        return [dict(entry) for entry in _import_report]
+
+
+class PageRegistry:
+    """Registro nombre de página -> (módulo, función de entrada) con importación diferida"""
+
+    def __init__(self):
+        self._pages: Dict[str, Dict[str, Any]] = {}
+
+    def register(self, name: str, module_name: str, entry_point: str = "main") -> None:
+        """Registrar una página sin importarla"""
+        self._pages[name] = {"module": module_name, "entry_point": entry_point, "loaded": None}
+
+    def names(self) -> List[str]:
+        """Nombres de las páginas registradas"""
+        return list(self._pages)
+
+    def is_loaded(self, name: str) -> bool:
+        """Indica si la página ya fue importada"""
+        return self._pages.get(name, {}).get("loaded") is not None
+
+    def load(self, name: str) -> Callable:
+        """
+        Obtener la función de entrada de una página, importándola la primera vez
+
+        Raises:
+            KeyError: Si la página no está registrada
+            ImportError: Si falla la importación
+        """
+        page = self._pages[name]
+        if page["loaded"] is None:
+            page["loaded"] = timed_import(page["module"], page["entry_point"])
+        return page["loaded"]
+
+
+def show_import_report() -> None:
+    """Mostrar el reporte de tiempos de importación de páginas y módulos"""
+    report = get_import_report()
+    if not report:
+        st.caption("Todavía no se importó ninguna página")
+        return
+
+    import pandas as pd
+
+    st.dataframe(
+        pd.DataFrame(report).rename(columns={
+            "module": "Módulo",
+            "seconds": "Segundos",
+            "new_modules": "Módulos nuevos",
+            "heavy_dependencies": "Dependencias pesadas",
+            "loaded_at": "Cargado"
+        }),
+        use_container_width=True
+    )